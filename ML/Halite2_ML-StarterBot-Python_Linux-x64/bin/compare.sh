@@ -2,27 +2,12 @@
 
 GAMES=100
 
-echo "Running $GAMES games between $1 and $2, it may take some time..."
-
-PLAYER1_WINS=0
-PLAYER2_WINS=0
-
-echo "Replays will be saved in ./comparison directory"
-mkdir -p comparison/
-cd comparison
-
-# We point here to the halite binary. If you are not doing this on OS X, please go to Halite website to download
-# a build
-HALITE_BINARY=../bin/halite
-
-for x in $(seq 1 $GAMES); do
-# run a game
-game_output=$($HALITE_BINARY -d "240 160" -t "python3 ../$1" "python3 ../$2" | grep "rank #1")
-if [[ $game_output == *"Player #0"* ]]; then
-    PLAYER1_WINS=$((PLAYER1_WINS + 1))
-fi
-if [[ $game_output == *"Player #1"* ]]; then
-    PLAYER2_WINS=$((PLAYER2_WINS + 1))
-fi;
-echo "Win ratio [$1 (P1) to $2 (P2)] = $PLAYER1_WINS:$PLAYER2_WINS"
-done
+echo "Running up to $GAMES games between $1 and $2, it may take some time..."
+
+# Games are played on the local engine (halite_sim), as many at a time as there are cores, and the comparison stops
+# as soon as one bot is significantly better. Further options are passed on, e.g. "-p 4" for 4 player games; see
+# python3 -m halite_sim.tournament --help
+# Every game starts the bots in a directory of its own, so they are given by absolute path
+BOT1="$(cd "$(dirname "$1")" && pwd)/$(basename "$1")"
+BOT2="$(cd "$(dirname "$2")" && pwd)/$(basename "$2")"
+python3 -m halite_sim.tournament -n $GAMES "python3 '$BOT1'" "python3 '$BOT2'" "${@:3}"
@@ -0,0 +1,21 @@
+"""
+Local stand-in for the Halite II engine (the halite binary), for playing offline games between bots that use the hlt
+starter kit. The rules follow hlt/constants.py; see engine.Engine for the turn order.
+
+Run a game like the halite binary does:
+
+    python3 -m halite_sim -d "240 160" "python3 MyBot.py" "python3 MyBotShortTraining.py"
+
+or play many games in one process, with bots that are loaded once (see inprocess.InProcessBot):
+
+    bot = Bot("model_long_training.ckpt", "Bot")
+    results = [play_in_process([bot.play, bot.play], 240, 160, seed) for seed in range(100)]
+
+Compare bots over many games with halite_sim.tournament.run_tournament, or python3 -m halite_sim.tournament.
+"""
+
+from . import bots, engine, game, inprocess, mapgen, state
+
+from .bots import SubprocessBot
+from .game import GameResult, PlayerResult, play_game
+from .inprocess import InProcessBot, QueueTransport, play_in_process
@@ -0,0 +1,39 @@
+import argparse
+import json
+import random
+import sys
+
+from .bots import SubprocessBot
+from .game import play_game
+from .mapgen import random_map_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Halite II local game engine")
+    parser.add_argument("bots", nargs="+", help="shell commands starting the bots, 2 or 4")
+    parser.add_argument("-d", "--dimensions", help='map width and height, e.g. "240 160" (defaults to a random size)')
+    parser.add_argument("-s", "--seed", type=int, help="map seed (defaults to a random one)")
+    parser.add_argument("-t", "--no-timeout", action="store_true", help="let the bots take as long as they want")
+    parser.add_argument("--turns", type=int, help="turn limit (defaults to the one of the map size)")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args()
+
+    if len(args.bots) not in (2, 4):
+        parser.error("a game needs 2 or 4 bots")
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 31)
+    if args.dimensions is not None:
+        width, height = [int(size) for size in args.dimensions.split()]
+    else:
+        width, height = random_map_size(len(args.bots), random.Random(seed))
+
+    result = play_game([SubprocessBot(command) for command in args.bots], width, height, seed, args.turns,
+                       timeouts=not args.no_timeout)
+    if args.json:
+        json.dump(result.as_dict(), sys.stdout)
+        print()
+    else:
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
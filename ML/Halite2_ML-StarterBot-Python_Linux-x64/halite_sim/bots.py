@@ -0,0 +1,93 @@
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+
+
+class SubprocessBot:
+    """
+    Connection to a bot started as a separate process from a shell command, as the halite binary runs them, e.g.
+    "python3 MyBot.py". Lines from the bot are read by a background thread, so that reads can time out and the time
+    each line arrived is known even if the engine reads it later.
+    """
+
+    def __init__(self, command, cwd=None, stderr=None):
+        """
+        :param str command: The shell command starting the bot
+        :param str cwd: The directory to start the bot in (defaults to the current directory)
+        :param stderr: Where the bot's standard error goes, e.g. subprocess.DEVNULL (defaults to ours)
+        """
+        self.command = command
+        # In a session of its own, the shell and the bot it starts can be killed together
+        self._process = subprocess.Popen(command, shell=True, cwd=cwd, stdin=subprocess.PIPE,
+                                         stdout=subprocess.PIPE, stderr=stderr, start_new_session=os.name == 'posix')
+        self._lines = queue.Queue()
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def send_line(self, line):
+        """
+        Send one line to the bot.
+
+        :param str line: The line, without line terminator
+        :return: nothing
+        :raises EOFError: If the bot has exited
+        """
+        try:
+            self._process.stdin.write(line.encode() + b'\n')
+            self._process.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            raise EOFError("{!r} has exited".format(self.command))
+
+    def read_line(self, timeout=None):
+        """
+        Wait for the next line from the bot.
+
+        :param float timeout: Seconds to wait at most (defaults to no limit)
+        :return: The line without its line terminator, and the time.perf_counter() at which it arrived
+        :rtype: (str, float)
+        :raises TimeoutError: If no line arrives in time
+        :raises EOFError: If the bot exits before sending a line
+        """
+        try:
+            line, arrived = self._lines.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("{!r} did not answer within {:.1f} s".format(self.command, timeout))
+        if line is None:
+            self._lines.put((None, arrived))  # Later reads fail the same way
+            raise EOFError("{!r} has exited".format(self.command))
+        return line, arrived
+
+    def close(self):
+        """
+        Stop the bot, like the halite binary does at the end of a game.
+
+        :return: nothing
+        """
+        if os.name == 'posix':
+            try:
+                os.killpg(self._process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        elif self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        self._reader.join()
+        for stream in (self._process.stdin, self._process.stdout):
+            try:
+                stream.close()
+            except (BrokenPipeError, ValueError):
+                pass
+
+    def _read(self):
+        for line in self._process.stdout:
+            self._lines.put((line.rstrip(b'\r\n').decode(errors='replace'), time.perf_counter()))
+        self._lines.put((None, time.perf_counter()))
+
+    def __str__(self):
+        return "SubprocessBot {!r}".format(self.command)
+
+    def __repr__(self):
+        return self.__str__()
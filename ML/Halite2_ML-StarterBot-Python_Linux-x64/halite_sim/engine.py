@@ -0,0 +1,406 @@
+import math
+import re
+
+import numpy as np
+
+from hlt import constants
+
+from .state import DOCKED, DOCKING, PRECISION, UNDOCKED, UNDOCKING
+
+_TOKENS = re.compile(r'[a-z]|-?\d+')
+_ARITY = {'t': 3, 'd': 2, 'u': 1}
+_SPAWN_STEP = math.radians(10)
+
+
+def default_max_turns(width, height):
+    """
+    :return: The turn limit of a game on a map of the given size, as on the Halite II ladder
+    :rtype: int
+    """
+    return 100 + int(math.sqrt(width * height))
+
+
+def parse_commands(line):
+    """
+    Split a line of commands as sent by hlt.networking.Game.send_command_queue, which does not separate them, e.g.
+    "t 1 7 270d 2 5".
+
+    :param str line: The line
+    :return: The commands as (letter, ship id, arguments)
+    :rtype: list[(str, int, tuple[int])]
+    :raises ValueError: If the line is not a sequence of well-formed commands
+    """
+    tokens = _TOKENS.findall(line)
+    if "".join(tokens) != "".join(line.split()):
+        raise ValueError("Unexpected characters in commands {!r}".format(line))
+    commands = []
+    index = 0
+    while index < len(tokens):
+        letter = tokens[index]
+        arity = _ARITY.get(letter)
+        arguments = tokens[index + 1:index + 1 + (arity or 0)]
+        if arity is None or len(arguments) != arity or any(argument.isalpha() for argument in arguments):
+            raise ValueError("Malformed command at {!r} in {!r}".format(" ".join(tokens[index:index + 4]), line))
+        commands.append((letter, int(arguments[0]), tuple(int(argument) for argument in arguments[1:])))
+        index += 1 + arity
+    return commands
+
+
+class PlayerStats:
+    """
+    :ivar last_frame: The last turn on which the player still had ships
+    :ivar ships_produced: The ships spawned by the player's planets
+    :ivar damage_dealt: The weapon damage dealt by the player's ships
+    :ivar ejected: Why the player was removed from the game (e.g. a timeout), else None
+    """
+
+    def __init__(self):
+        self.last_frame = 0
+        self.ships_produced = 0
+        self.damage_dealt = 0
+        self.ejected = None
+
+
+class Engine:
+    """
+    The Halite II turn rules applied to a GameState. Each turn, in order:
+
+    1. Weapon cooldowns count down, and docking and undocking ships make progress.
+    2. The commands are applied: undocking, docking (several players docking to the same free planet in the same
+       turn all fail) and thrusts. Invalid commands are ignored.
+    3. All ships move along straight lines at the same time. Ships that touch collide and deal their health as
+       damage to each other, ships that touch a planet are destroyed and damage it by their health, and ships that
+       leave the map are destroyed. Collisions are found exactly, in the order they happen during the move.
+    4. Every undocked ship which is not cooling down splits constants.WEAPON_DAMAGE between the enemy ships within
+       constants.WEAPON_RADIUS of its edge, all ships at once.
+    5. Destroyed ships are removed. A destroyed planet takes its docked ships with it and damages the ships within
+       constants.EXPLOSION_RADIUS, the most at its surface and none at the edge of the blast.
+    6. Planets produce for their docked ships and spawn a ship next to them, on the side of the map center, for every
+       constants.PRODUCTION_PER_SHIP. As on the ladder, planets do not run out of resources.
+
+    A player without ships is out. The game ends when at most one player is left or after max_turns turns. The
+    pairwise parts (collisions, weapons) use NumPy.
+
+    :ivar state: The game state (state.GameState)
+    :ivar turn: The number of turns played
+    :ivar max_turns: The turn limit
+    :ivar stats: Dict of player id to PlayerStats
+    """
+
+    def __init__(self, state, max_turns=None):
+        """
+        :param state.GameState state: The starting state, e.g. from mapgen.generate_map
+        :param int max_turns: The turn limit (defaults to default_max_turns for the map size)
+        """
+        self.state = state
+        self.turn = 0
+        self.max_turns = max_turns if max_turns is not None else default_max_turns(state.width, state.height)
+        self.stats = {player_id: PlayerStats() for player_id in range(state.num_players)}
+
+    def finished(self):
+        """
+        :return: Whether the game is over
+        :rtype: bool
+        """
+        return len(self.state.alive) <= 1 or self.turn >= self.max_turns
+
+    def eject(self, player_id, reason):
+        """
+        Remove a player from the game, e.g. because its bot timed out or sent malformed commands. Its ships disappear
+        without exploding.
+
+        :param int player_id: The player
+        :param str reason: Why, reported in the results
+        :return: nothing
+        """
+        if player_id not in self.state.alive:
+            return
+        self.stats[player_id].ejected = reason
+        self.stats[player_id].last_frame = self.turn
+        self.state.alive.discard(player_id)
+        for ship in self.state.player_ships(player_id):
+            self._remove_ship(ship)
+
+    def step(self, commands):
+        """
+        Play one turn.
+
+        :param dict commands: Player id to the line of commands the player sent (players without commands idle)
+        :return: nothing
+        """
+        state = self.state
+        self._progress_docking()
+        thrusts = {}
+        docks = {}
+        for player_id in sorted(commands):
+            if player_id not in state.alive:
+                continue
+            try:
+                parsed = parse_commands(commands[player_id])
+            except ValueError as error:
+                self.eject(player_id, str(error))
+                continue
+            self._apply_commands(player_id, parsed, thrusts, docks)
+        self._dock(docks)
+        self._move(thrusts)
+        self._fire()
+        self._remove_destroyed()
+        self._produce()
+        self.turn += 1
+        for player_id in sorted(state.alive):
+            if any(ship.owner == player_id for ship in state.ships.values()):
+                self.stats[player_id].last_frame = self.turn
+            else:
+                state.alive.discard(player_id)
+
+    def ranking(self):
+        """
+        Rank the players: the ones still in the game by their number of ships and then total ship health, ahead of
+        the others in the reverse order they went out.
+
+        :return: The player ids, best first
+        :rtype: list[int]
+        """
+        state = self.state
+
+        def key(player_id):
+            ships = state.player_ships(player_id) if player_id in state.alive else ()
+            return (player_id in state.alive, self.stats[player_id].last_frame, len(ships),
+                    sum(ship.health for ship in ships), -player_id)
+        return sorted(range(state.num_players), key=key, reverse=True)
+
+    def _progress_docking(self):
+        for ship in self.state.ships.values():
+            if ship.cooldown > 0:
+                ship.cooldown -= 1
+            if ship.docking_status in (DOCKING, UNDOCKING):
+                ship.progress -= 1
+                if ship.progress > 0:
+                    continue
+                if ship.docking_status == DOCKING:
+                    ship.docking_status = DOCKED
+                else:
+                    self._leave_planet(ship)
+                    ship.docking_status = UNDOCKED
+
+    def _apply_commands(self, player_id, parsed, thrusts, docks):
+        ships = self.state.ships
+        planets = self.state.planets
+        commanded = set()
+        for letter, ship_id, arguments in parsed:
+            ship = ships.get(ship_id)
+            if ship is None or ship.owner != player_id or ship_id in commanded:
+                continue
+            commanded.add(ship_id)
+            if letter == 't':
+                magnitude, angle = arguments
+                if ship.docking_status == UNDOCKED and 0 <= magnitude <= constants.MAX_SPEED:
+                    thrusts[ship_id] = (magnitude * math.cos(math.radians(angle)),
+                                        magnitude * math.sin(math.radians(angle)))
+            elif letter == 'd':
+                planet = planets.get(arguments[0])
+                if ship.docking_status == UNDOCKED and planet is not None and \
+                        math.hypot(ship.x - planet.x, ship.y - planet.y) <= \
+                        planet.radius + constants.DOCK_RADIUS + constants.SHIP_RADIUS:
+                    docks.setdefault(planet.id, []).append(ship)
+            elif ship.docking_status == DOCKED:
+                ship.docking_status = UNDOCKING
+                ship.progress = constants.DOCK_TURNS
+
+    def _dock(self, docks):
+        for planet_id, ships in docks.items():
+            planet = self.state.planets[planet_id]
+            owners = {ship.owner for ship in ships}
+            if planet.owner is None and len(owners) > 1:
+                continue  # Contested
+            for ship in ships:
+                if planet.owner not in (None, ship.owner) or len(planet.docked_ships) >= planet.docking_spots:
+                    continue
+                planet.owner = ship.owner
+                planet.docked_ships.append(ship.id)
+                ship.docking_status = DOCKING
+                ship.planet = planet.id
+                ship.progress = constants.DOCK_TURNS
+
+    def _move(self, thrusts):
+        state = self.state
+        ships = list(state.ships.values())
+        for ship in ships:
+            ship.vel_x, ship.vel_y = thrusts.get(ship.id, (0.0, 0.0))
+        if not ships:
+            return
+        x = np.array([ship.x for ship in ships])
+        y = np.array([ship.y for ship in ships])
+        vel_x = np.array([ship.vel_x for ship in ships])
+        vel_y = np.array([ship.vel_y for ship in ships])
+        planets = list(state.planets.values())
+        events = []
+
+        # Ship against ship: the first time the centers are two radii apart, for pairs where anything moves
+        times = _contact_times(x, y, vel_x, vel_y, x, y, vel_x, vel_y, 2 * constants.SHIP_RADIUS)
+        first, second = np.nonzero(np.triu(np.isfinite(times), 1))
+        events.extend((time, 0, ships[i], ships[j]) for time, i, j in
+                      zip(times[first, second].tolist(), first.tolist(), second.tolist()))
+
+        # Ship against planet
+        if planets:
+            planet_x = np.array([planet.x for planet in planets])
+            planet_y = np.array([planet.y for planet in planets])
+            zero = np.zeros(len(planets))
+            radius = np.array([planet.radius for planet in planets])[np.newaxis, :] + constants.SHIP_RADIUS
+            times = _contact_times(x, y, vel_x, vel_y, planet_x, planet_y, zero, zero, radius)
+            rows, columns = np.nonzero(np.isfinite(times))
+            events.extend((time, 1, ships[i], planets[j]) for time, i, j in
+                          zip(times[rows, columns].tolist(), rows.tolist(), columns.tolist()))
+
+        # Ship against the edges of the map
+        with np.errstate(divide='ignore', invalid='ignore'):
+            exit_x = np.where(vel_x > 0, (state.width - x) / vel_x, np.where(vel_x < 0, -x / vel_x, np.inf))
+            exit_y = np.where(vel_y > 0, (state.height - y) / vel_y, np.where(vel_y < 0, -y / vel_y, np.inf))
+        exits = np.minimum(exit_x, exit_y)
+        for i in np.flatnonzero(exits < 1.0).tolist():
+            events.append((max(float(exits[i]), 0.0), 2, ships[i], None))
+
+        events.sort(key=lambda event: (event[0], event[1], event[2].id))
+        for time, kind, ship, other in events:
+            if ship.health <= 0:
+                continue
+            if kind == 0:
+                if other.health <= 0:
+                    continue
+                ship.health, other.health = ship.health - other.health, other.health - ship.health
+            elif kind == 1:
+                if other.health <= 0:
+                    continue
+                other.health -= ship.health
+                ship.health = 0
+            else:
+                ship.health = 0
+
+        for ship in ships:
+            ship.x = round(ship.x + ship.vel_x, PRECISION)
+            ship.y = round(ship.y + ship.vel_y, PRECISION)
+
+    def _fire(self):
+        ships = [ship for ship in self.state.ships.values() if ship.health > 0]
+        if len(ships) < 2:
+            return
+        x = np.array([ship.x for ship in ships])
+        y = np.array([ship.y for ship in ships])
+        owner = np.array([ship.owner for ship in ships])
+        reach = constants.WEAPON_RADIUS + 2 * constants.SHIP_RADIUS
+        in_range = ((x[:, np.newaxis] - x) ** 2 + (y[:, np.newaxis] - y) ** 2 <= reach * reach) & \
+            (owner[:, np.newaxis] != owner)
+        ready = np.array([ship.docking_status == UNDOCKED and ship.cooldown == 0 for ship in ships])
+        targets = in_range.sum(axis=1)
+        attackers = ready & (targets > 0)
+        if not attackers.any():
+            return
+        damage = np.where(attackers, constants.WEAPON_DAMAGE // np.maximum(targets, 1), 0)
+        received = in_range[attackers].T.astype(np.int64) @ damage[attackers]
+        for ship, fired, dealt in zip(ships, attackers.tolist(), (damage * targets).tolist()):
+            if fired:
+                ship.cooldown = constants.WEAPON_COOLDOWN
+                self.stats[ship.owner].damage_dealt += dealt
+        for ship, taken in zip(ships, received.tolist()):
+            ship.health -= taken
+
+    def _remove_destroyed(self):
+        state = self.state
+        destroyed = [planet for planet in state.planets.values() if planet.health <= 0]
+        for planet in destroyed:
+            for ship_id in planet.docked_ships:
+                state.ships[ship_id].health = 0
+            for ship in state.ships.values():
+                surface = math.hypot(ship.x - planet.x, ship.y - planet.y) - planet.radius - ship.radius
+                if surface <= constants.EXPLOSION_RADIUS:
+                    ship.health -= int(constants.MAX_SHIP_HEALTH * (1 - max(surface, 0.0) / constants.EXPLOSION_RADIUS))
+            del state.planets[planet.id]
+        for ship in [ship for ship in state.ships.values() if ship.health <= 0]:
+            self._remove_ship(ship)
+
+    def _produce(self):
+        state = self.state
+        for planet in state.planets.values():
+            if planet.owner is None:
+                continue
+            docked = sum(1 for ship_id in planet.docked_ships if state.ships[ship_id].docking_status == DOCKED)
+            if docked == 0:
+                continue
+            planet.current_production += constants.BASE_PRODUCTIVITY + constants.ADDITIONAL_PRODUCTIVITY * (docked - 1)
+            while planet.current_production >= constants.PRODUCTION_PER_SHIP:
+                position = self._spawn_position(planet)
+                if position is None:
+                    break
+                state.add_ship(planet.owner, *position)
+                planet.current_production -= constants.PRODUCTION_PER_SHIP
+                self.stats[planet.owner].ships_produced += 1
+
+    def _spawn_position(self, planet):
+        """
+        :return: The free position closest to the map center at SPAWN_RADIUS from the planet's surface (or a bit
+            farther out if that ring is full), or None
+        :rtype: (float, float)
+        """
+        state = self.state
+        toward_center = math.atan2(state.height / 2 - planet.y, state.width / 2 - planet.x)
+        for extra in range(3):
+            distance = planet.radius + constants.SPAWN_RADIUS + extra
+            for step in range(37):
+                angle = toward_center + (step + 1) // 2 * _SPAWN_STEP * (1 if step % 2 else -1)
+                x = planet.x + distance * math.cos(angle)
+                y = planet.y + distance * math.sin(angle)
+                if self._free(x, y):
+                    return x, y
+        return None
+
+    def _free(self, x, y):
+        radius = constants.SHIP_RADIUS
+        if not (radius <= x <= self.state.width - radius and radius <= y <= self.state.height - radius):
+            return False
+        if any((ship.x - x) ** 2 + (ship.y - y) ** 2 <= (2 * radius) ** 2 for ship in self.state.ships.values()):
+            return False
+        return all(math.hypot(planet.x - x, planet.y - y) > planet.radius + radius
+                   for planet in self.state.planets.values())
+
+    def _leave_planet(self, ship):
+        planet = self.state.planets.get(ship.planet)
+        ship.planet = None
+        if planet is None:
+            return
+        planet.docked_ships.remove(ship.id)
+        if not planet.docked_ships:
+            planet.owner = None
+            planet.current_production = 0
+
+    def _remove_ship(self, ship):
+        if ship.planet is not None:
+            self._leave_planet(ship)
+        del self.state.ships[ship.id]
+
+    def __str__(self):
+        return "Engine on turn {} of {}: {}".format(self.turn, self.max_turns, self.state)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def _contact_times(x, y, vel_x, vel_y, other_x, other_y, other_vel_x, other_vel_y, distance):
+    """
+    For every pair of moving circles, find the first time in [0, 1] at which their centers are distance apart.
+
+    :return: The times, inf for pairs which do not touch during the turn, shape (N, M)
+    :rtype: numpy.ndarray
+    """
+    dx = other_x[np.newaxis, :] - x[:, np.newaxis]
+    dy = other_y[np.newaxis, :] - y[:, np.newaxis]
+    dvx = other_vel_x[np.newaxis, :] - vel_x[:, np.newaxis]
+    dvy = other_vel_y[np.newaxis, :] - vel_y[:, np.newaxis]
+    a = dvx * dvx + dvy * dvy
+    b = 2 * (dx * dvx + dy * dvy)
+    c = dx * dx + dy * dy - distance * distance
+    discriminant = b * b - 4 * a * c
+    with np.errstate(divide='ignore', invalid='ignore'):
+        time = (-b - np.sqrt(discriminant)) / (2 * a)
+    touching = (a > 0) & (discriminant >= 0) & (time <= 1.0) & ((time >= 0) | (c <= 0))
+    return np.where(touching, np.maximum(time, 0.0), np.inf)
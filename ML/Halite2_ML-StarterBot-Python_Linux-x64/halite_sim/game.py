@@ -0,0 +1,165 @@
+import time
+
+from .engine import Engine
+from .mapgen import generate_map
+
+INITIALIZATION_TIMEOUT = 60.0
+TURN_TIMEOUT = 2.0
+
+
+class PlayerResult:
+    """
+    How one player did in a game.
+
+    :ivar player_id: The player's id (seat) in the game
+    :ivar name: The name the bot sent
+    :ivar rank: 1 for the winner
+    :ivar last_frame: The last turn on which the player still had ships
+    :ivar ships: The player's ships at the end of the game
+    :ivar ships_produced: The ships spawned by the player's planets
+    :ivar damage_dealt: The weapon damage dealt by the player's ships
+    :ivar latencies: Seconds from sending each frame until the bot's commands arrived, the initialization first
+    :ivar error: Why the player was removed from the game (e.g. a timeout), else None
+    """
+
+    def __init__(self, player_id, name, rank, last_frame, ships, ships_produced, damage_dealt, latencies, error):
+        self.player_id = player_id
+        self.name = name
+        self.rank = rank
+        self.last_frame = last_frame
+        self.ships = ships
+        self.ships_produced = ships_produced
+        self.damage_dealt = damage_dealt
+        self.latencies = latencies
+        self.error = error
+
+    def as_dict(self):
+        """
+        :return: The result as plain data, e.g. for JSON
+        :rtype: dict
+        """
+        return dict(self.__dict__)
+
+    def __str__(self):
+        """
+        :return: The line the halite binary prints for the player
+        :rtype: str
+        """
+        return "Player #{}, {}, came in rank #{} and was last alive on frame #{}, producing {} ships and dealing " \
+               "{} damage!".format(self.player_id, self.name, self.rank, self.last_frame, self.ships_produced,
+                                   self.damage_dealt)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class GameResult:
+    """
+    The outcome of a game.
+
+    :ivar width: Map width
+    :ivar height: Map height
+    :ivar seed: The map seed
+    :ivar turns: The number of turns played
+    :ivar players: PlayerResult of every player, by player id
+    """
+
+    def __init__(self, width, height, seed, turns, players):
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.turns = turns
+        self.players = players
+
+    def ranking(self):
+        """
+        :return: The players, best first
+        :rtype: list[PlayerResult]
+        """
+        return sorted(self.players, key=lambda player: player.rank)
+
+    def as_dict(self):
+        """
+        :return: The result as plain data, e.g. for JSON
+        :rtype: dict
+        """
+        return dict(self.__dict__, players=[player.as_dict() for player in self.players])
+
+    def __str__(self):
+        return "\n".join(["Map seed was {}".format(self.seed)] + [str(player) for player in self.players])
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def play_game(bots, width, height, seed, max_turns=None, timeouts=True):
+    """
+    Play one game between bots which speak the protocol of hlt.networking.Game: each gets its player id, the map
+    size and the initial frame, answers with its name, and then gets a frame and answers with its commands every turn.
+    All bots get their frame before any answer is read, so that separate processes think at the same time. A bot
+    which times out, exits or sends malformed commands is out of the game. The bots are closed at the end.
+
+    :param list bots: The connections to the bots, one per player (e.g. bots.SubprocessBot), with send_line,
+        read_line and close
+    :param int width: Map width
+    :param int height: Map height
+    :param int seed: The map seed
+    :param int max_turns: The turn limit (defaults to engine.default_max_turns for the map size)
+    :param bool timeouts: Whether to enforce INITIALIZATION_TIMEOUT and TURN_TIMEOUT
+    :return: The result
+    :rtype: GameResult
+    """
+    engine = Engine(generate_map(width, height, len(bots), seed), max_turns)
+    names = ["Player {}".format(player_id) for player_id in range(len(bots))]
+    latencies = [[] for _ in bots]
+    try:
+        frame = engine.state.frame()
+        answers = _exchange(engine, bots, lambda player_id: [str(player_id), "{} {}".format(width, height), frame],
+                            INITIALIZATION_TIMEOUT if timeouts else None, latencies)
+        for player_id, name in answers.items():
+            names[player_id] = name.strip() or names[player_id]
+        while not engine.finished():
+            frame = engine.state.frame()
+            engine.step(_exchange(engine, bots, lambda player_id: [frame], TURN_TIMEOUT if timeouts else None,
+                                  latencies))
+    finally:
+        for bot in bots:
+            bot.close()
+
+    ranks = {player_id: rank for rank, player_id in enumerate(engine.ranking(), 1)}
+    players = []
+    for player_id in range(len(bots)):
+        stats = engine.stats[player_id]
+        players.append(PlayerResult(player_id, names[player_id], ranks[player_id], stats.last_frame,
+                                    len(engine.state.player_ships(player_id)), stats.ships_produced,
+                                    stats.damage_dealt, latencies[player_id], stats.ejected))
+    return GameResult(width, height, seed, engine.turn, players)
+
+
+def _exchange(engine, bots, lines, timeout, latencies):
+    """
+    Send every player still in the game its lines, then collect one answer from each, ejecting the players which do
+    not answer in time.
+
+    :return: Dict of player id to answer
+    :rtype: dict
+    """
+    sent = {}
+    for player_id in sorted(engine.state.alive):
+        start = time.perf_counter()  # A bot may answer before send_line returns
+        try:
+            for line in lines(player_id):
+                bots[player_id].send_line(line)
+            sent[player_id] = start
+        except EOFError as error:
+            engine.eject(player_id, str(error))
+    answers = {}
+    for player_id, start in sent.items():
+        remaining = None if timeout is None else max(start + timeout - time.perf_counter(), 0.0)
+        try:
+            answers[player_id], arrived = bots[player_id].read_line(remaining)
+        except (TimeoutError, EOFError) as error:
+            engine.eject(player_id, str(error))
+            continue
+        latencies[player_id].append(arrived - start)
+    return answers
@@ -0,0 +1,137 @@
+import queue
+import threading
+import time
+import traceback
+
+from hlt.networking import Transport
+
+from .game import play_game
+
+
+class QueueTransport(Transport):
+    """
+    The bot's side of an in-process connection: hlt.Game reads the engine's lines from one queue and writes its own
+    to another. A None on the incoming queue ends the game, and read_line raises EOFError to get the bot out of its
+    turn loop.
+    """
+
+    def __init__(self, incoming, outgoing):
+        """
+        :param queue.Queue incoming: The lines from the engine
+        :param queue.Queue outgoing: Gets (line, time.perf_counter()) for every line the bot sends
+        """
+        self._incoming = incoming
+        self._outgoing = outgoing
+
+    def read_line(self):
+        line = self._incoming.get()
+        if line is None:
+            self._incoming.put(None)  # Later reads fail the same way
+            raise EOFError("The game is over")
+        return line
+
+    def write_line(self, line):
+        self._outgoing.put((line, time.perf_counter()))
+
+
+class InProcessBot:
+    """
+    Connection to a bot which plays in a thread of this process, for play_game. Nothing is started, imported or
+    loaded per game, so a bot object which loads a model in its constructor (e.g. tsmlstarterbot.bot.Bot) can play
+    any number of games back-to-back.
+
+    The bot is a callable which plays one game and accepts the transport and log_level keywords of hlt.Game, such as
+    the play method of the bots in this repository. It is called with log_level=None, because the logging module is
+    configured once per process. As all bots share the interpreter, they also share the CPU time of the turn: their
+    latencies are comparable with each other rather than with those of separate processes.
+    """
+
+    def __init__(self, play):
+        """
+        :param play: Plays a game, e.g. Bot(...).play
+        """
+        self.play = play
+        self.error = None
+        self._to_bot = queue.Queue()
+        self._from_bot = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def send_line(self, line):
+        """
+        Send one line to the bot.
+
+        :param str line: The line, without line terminator
+        :return: nothing
+        :raises EOFError: If the bot has returned or raised
+        """
+        if not self._thread.is_alive():
+            raise EOFError(self._exit_message())
+        self._to_bot.put(line)
+
+    def read_line(self, timeout=None):
+        """
+        Wait for the next line from the bot.
+
+        :param float timeout: Seconds to wait at most (defaults to no limit)
+        :return: The line, and the time.perf_counter() at which it was sent
+        :rtype: (str, float)
+        :raises TimeoutError: If no line arrives in time
+        :raises EOFError: If the bot returns or raises before sending a line
+        """
+        try:
+            line, sent = self._from_bot.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("{!r} did not answer within {:.1f} s".format(self.play, timeout))
+        if line is None:
+            self._from_bot.put((None, sent))
+            raise EOFError(self._exit_message())
+        return line, sent
+
+    def close(self):
+        """
+        End the game for the bot and wait for its thread. A thread cannot be killed, so a bot which is still thinking
+        (e.g. after timing out) finishes its turn first.
+
+        :return: nothing
+        """
+        self._to_bot.put(None)
+        self._thread.join()
+
+    def _run(self):
+        try:
+            self.play(transport=QueueTransport(self._to_bot, self._from_bot), log_level=None)
+        except EOFError:
+            pass  # The game is over
+        except Exception as error:
+            traceback.print_exc()
+            self.error = error
+        finally:
+            self._from_bot.put((None, time.perf_counter()))
+
+    def _exit_message(self):
+        if self.error is not None:
+            return "{!r} raised {!r}".format(self.play, self.error)
+        return "{!r} has exited".format(self.play)
+
+    def __str__(self):
+        return "InProcessBot {!r}".format(self.play)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def play_in_process(players, width, height, seed, max_turns=None, timeouts=False):
+    """
+    Play one game between bots in this process (see InProcessBot).
+
+    :param list players: The callables playing a game, one per player, e.g. [bot.play, bot.play] for self-play
+    :param int width: Map width
+    :param int height: Map height
+    :param int seed: The map seed
+    :param int max_turns: The turn limit (defaults to engine.default_max_turns for the map size)
+    :param bool timeouts: Whether to enforce the turn timeouts, which are meant for bots with a CPU of their own
+    :return: The result
+    :rtype: game.GameResult
+    """
+    return play_game([InProcessBot(play) for play in players], width, height, seed, max_turns, timeouts)
@@ -0,0 +1,110 @@
+import math
+import random
+
+from hlt import constants
+
+from .state import GameState, Planet
+
+INITIAL_SHIPS = 3
+MIN_PLANET_RADIUS = 3.0
+MAX_PLANET_RADIUS = 8.0
+PLANET_GAP = 5.0
+START_CLEARANCE = 12.0
+EDGE_CLEARANCE = 5.0
+
+# Map sizes of the Halite II ladder, by number of players
+MAP_SIZES = {
+    2: ((240, 160), (264, 176), (288, 192), (312, 208), (336, 224), (360, 240), (384, 256)),
+    4: ((288, 192), (312, 208), (336, 224), (360, 240), (384, 256)),
+}
+
+
+def random_map_size(num_players, rng):
+    """
+    Pick a map size the way the ladder does.
+
+    :param int num_players: 2 or 4
+    :param random.Random rng: The random generator
+    :return: The width and height
+    :rtype: (int, int)
+    """
+    return rng.choice(MAP_SIZES[num_players])
+
+
+def generate_map(width, height, num_players, seed):
+    """
+    Generate the starting state of a game: every player gets INITIAL_SHIPS ships around its start, and the planets
+    are placed so that the map looks the same from every start. With 2 players the map is point symmetric about its
+    center; with 4 players it is mirrored in both axes. Besides constants.PLANETS_PER_PLAYER planets per player,
+    constants.EXTRA_PLANETS planets lie around the center.
+
+    :param int width: Map width
+    :param int height: Map height
+    :param int num_players: The number of players, 2 or 4
+    :param int seed: The seed of the map layout
+    :return: The starting state
+    :rtype: state.GameState
+    """
+    if num_players not in (2, 4):
+        raise ValueError("Maps are generated for 2 or 4 players, not {}".format(num_players))
+    rng = random.Random(seed)
+    state = GameState(width, height, num_players)
+    images = _images(width, height, num_players)
+    starts = [image(width / 4, height / 4 if num_players == 4 else height / 2) for image in images]
+
+    # Central planets first, as one symmetric group
+    radius = rng.uniform(MIN_PLANET_RADIUS + 1, MAX_PLANET_RADIUS)
+    offset = radius + PLANET_GAP
+    central = [(width / 2 + offset * math.cos(angle), height / 2 + offset * math.sin(angle))
+               for angle in (math.pi / 4 + k * math.pi / 2 for k in range(constants.EXTRA_PLANETS))]
+    for x, y in central:
+        _add_planet(state, x, y, radius)
+
+    # Then one planet per sector for every player, mirrored into the other sectors
+    placed = 0
+    for _ in range(1000 * constants.PLANETS_PER_PLAYER):
+        if placed == constants.PLANETS_PER_PLAYER:
+            break
+        radius = rng.uniform(MIN_PLANET_RADIUS, MAX_PLANET_RADIUS)
+        x = rng.uniform(radius + EDGE_CLEARANCE, width / 2 - PLANET_GAP / 2 - radius)
+        y = rng.uniform(radius + EDGE_CLEARANCE, height - radius - EDGE_CLEARANCE if num_players == 2
+                        else height / 2 - PLANET_GAP / 2 - radius)
+        positions = [image(x, y) for image in images]
+        if _fits(state, starts, positions, radius):
+            for position in positions:
+                _add_planet(state, position[0], position[1], radius)
+            placed += 1
+
+    for player_id, (x, y) in enumerate(starts):
+        for index in range(INITIAL_SHIPS):
+            state.add_ship(player_id, x, y + (index - (INITIAL_SHIPS - 1) / 2) * 2 * constants.SPAWN_RADIUS)
+    return state
+
+
+def _images(width, height, num_players):
+    """
+    :return: Functions mapping a position in the first player's sector to the same position in every sector
+    :rtype: list
+    """
+    if num_players == 2:
+        return [lambda x, y: (x, y), lambda x, y: (width - x, height - y)]
+    return [lambda x, y: (x, y), lambda x, y: (width - x, y),
+            lambda x, y: (width - x, height - y), lambda x, y: (x, height - y)]
+
+
+def _fits(state, starts, positions, radius):
+    for x, y in positions:
+        for planet in state.planets.values():
+            if math.hypot(planet.x - x, planet.y - y) < planet.radius + radius + PLANET_GAP:
+                return False
+        for start_x, start_y in starts:
+            if math.hypot(start_x - x, start_y - y) < radius + START_CLEARANCE:
+                return False
+    # Images of the same planet must not overlap either, e.g. next to the center
+    return all(math.hypot(x - other_x, y - other_y) >= 2 * radius + PLANET_GAP
+               for index, (x, y) in enumerate(positions) for other_x, other_y in positions[index + 1:])
+
+
+def _add_planet(state, x, y, radius):
+    planet_id = len(state.planets)
+    state.planets[planet_id] = Planet(planet_id, x, y, radius)
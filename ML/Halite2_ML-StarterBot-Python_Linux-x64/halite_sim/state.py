@@ -0,0 +1,178 @@
+import math
+
+from hlt import constants
+
+# Docking status values, as in hlt.entity.Ship.DockingStatus
+UNDOCKED = 0
+DOCKING = 1
+DOCKED = 2
+UNDOCKING = 3
+
+# Decimal places of the coordinates, as sent to the bots, so that they see exactly what the engine computes with
+PRECISION = 4
+
+
+class Ship:
+    """
+    A ship as the engine keeps it. Unlike hlt.entity.Ship, the owner and planet are ids.
+
+    :ivar id: The ship id, unique over all players
+    :ivar owner: The id of the player controlling the ship
+    :ivar x: The x-coordinate
+    :ivar y: The y-coordinate
+    :ivar health: The health, the ship is destroyed at 0
+    :ivar docking_status: UNDOCKED, DOCKING, DOCKED or UNDOCKING
+    :ivar planet: The id of the planet the ship is docking to, docked to or undocking from, else None
+    :ivar progress: The turns left until docking or undocking completes
+    :ivar cooldown: The turns left until the ship can fire again
+    """
+    __slots__ = ('id', 'owner', 'x', 'y', 'health', 'vel_x', 'vel_y', 'docking_status', 'planet', 'progress',
+                 'cooldown')
+    radius = constants.SHIP_RADIUS
+
+    def __init__(self, ship_id, owner, x, y, health=constants.BASE_SHIP_HEALTH):
+        self.id = ship_id
+        self.owner = owner
+        self.x = x
+        self.y = y
+        self.health = health
+        self.vel_x = 0.0
+        self.vel_y = 0.0
+        self.docking_status = UNDOCKED
+        self.planet = None
+        self.progress = 0
+        self.cooldown = 0
+
+    def serialize(self):
+        """
+        :return: The ship's tokens in a frame, as parsed by hlt.entity.Ship
+        :rtype: str
+        """
+        return "{} {:.4f} {:.4f} {} {:.4f} {:.4f} {} {} {} {}".format(
+            self.id, self.x, self.y, self.health, self.vel_x, self.vel_y, self.docking_status,
+            0 if self.planet is None else self.planet, self.progress, self.cooldown)
+
+    def __str__(self):
+        return "Ship {} of player {} at ({:.2f}, {:.2f}) with {} health".format(
+            self.id, self.owner, self.x, self.y, self.health)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class Planet:
+    """
+    A planet as the engine keeps it, with the ids of its owner and docked ships.
+
+    :ivar id: The planet id
+    :ivar x: The x-coordinate
+    :ivar y: The y-coordinate
+    :ivar radius: The radius
+    :ivar health: The health, the planet is destroyed at 0
+    :ivar docking_spots: How many ships can dock at once
+    :ivar current_production: Production accumulated towards the next ship
+    :ivar remaining_resources: Production left to mine
+    :ivar owner: The id of the owning player, or None
+    :ivar docked_ships: The ids of the ships docking to, docked to or undocking from the planet
+    """
+    __slots__ = ('id', 'x', 'y', 'radius', 'health', 'docking_spots', 'current_production', 'remaining_resources',
+                 'owner', 'docked_ships')
+
+    def __init__(self, planet_id, x, y, radius):
+        self.id = planet_id
+        self.x = round(x, PRECISION)
+        self.y = round(y, PRECISION)
+        self.radius = round(radius, PRECISION)
+        self.health = int(round(self.radius * constants.MAX_SHIP_HEALTH))
+        self.docking_spots = max(2, int(math.ceil(self.radius / 2)))
+        self.current_production = 0
+        self.remaining_resources = int(round(self.radius * constants.RESOURCES_PER_RADIUS))
+        self.owner = None
+        self.docked_ships = []
+
+    def serialize(self):
+        """
+        :return: The planet's tokens in a frame, as parsed by hlt.entity.Planet
+        :rtype: str
+        """
+        return "{} {:.4f} {:.4f} {} {:.4f} {} {} {} {} {} {}{}".format(
+            self.id, self.x, self.y, self.health, self.radius, self.docking_spots, self.current_production,
+            self.remaining_resources, int(self.owner is not None), 0 if self.owner is None else self.owner,
+            len(self.docked_ships), "".join(" {}".format(ship_id) for ship_id in self.docked_ships))
+
+    def __str__(self):
+        return "Planet {} at ({:.2f}, {:.2f}) with radius {:.2f}, owned by {}".format(
+            self.id, self.x, self.y, self.radius, self.owner)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class GameState:
+    """
+    Everything the engine knows about a game: the map size, the players still in it and all ships and planets.
+
+    :ivar width: Map width
+    :ivar height: Map height
+    :ivar num_players: The number of players the game started with
+    :ivar ships: Dict of ship id to Ship, in order of creation
+    :ivar planets: Dict of planet id to Planet
+    :ivar alive: The ids of the players still in the game
+    """
+
+    def __init__(self, width, height, num_players):
+        self.width = width
+        self.height = height
+        self.num_players = num_players
+        self.ships = {}
+        self.planets = {}
+        self.alive = set(range(num_players))
+        self._next_ship_id = 0
+
+    def add_ship(self, owner, x, y):
+        """
+        Create a ship with the next free id.
+
+        :param int owner: The id of the owning player
+        :param float x: The x-coordinate
+        :param float y: The y-coordinate
+        :return: The new ship
+        :rtype: Ship
+        """
+        ship = self.ships[self._next_ship_id] = Ship(self._next_ship_id, owner, round(x, PRECISION),
+                                                     round(y, PRECISION))
+        self._next_ship_id += 1
+        return ship
+
+    def player_ships(self, player_id):
+        """
+        :param int player_id: The player
+        :return: The player's ships
+        :rtype: list[Ship]
+        """
+        return [ship for ship in self.ships.values() if ship.owner == player_id]
+
+    def frame(self):
+        """
+        Describe the state in the format the bots parse every turn (see hlt.game_map.Map._parse).
+
+        :return: The frame, without line terminator
+        :rtype: str
+        """
+        by_owner = {player_id: [] for player_id in range(self.num_players)}
+        for ship in self.ships.values():
+            by_owner[ship.owner].append(ship.serialize())
+        parts = [str(self.num_players)]
+        for player_id, ships in by_owner.items():
+            parts.append("{} {}".format(player_id, len(ships)))
+            parts.extend(ships)
+        parts.append(str(len(self.planets)))
+        parts.extend(planet.serialize() for planet in self.planets.values())
+        return " ".join(parts)
+
+    def __str__(self):
+        return "GameState of {}x{} with {} ships and {} planets, players {} alive".format(
+            self.width, self.height, len(self.ships), len(self.planets), sorted(self.alive))
+
+    def __repr__(self):
+        return self.__str__()
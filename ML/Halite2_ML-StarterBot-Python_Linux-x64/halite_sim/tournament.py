@@ -0,0 +1,352 @@
+"""
+Many games between a few bots, played on a pool of processes, with a running win rate that stops the tournament as
+soon as one bot is significantly better than the others:
+
+    python3 -m halite_sim.tournament -n 200 "python3 $PWD/MyBot.py" "python3 $PWD/MyBotShortTraining.py"
+
+Every game starts its bots in a directory of its own, so that the logs of games played at the same time do not
+overwrite each other; give the bot commands with absolute paths. The directories are removed after the game unless
+the logs are kept (--logs).
+
+The players of a tournament take turns on every seat: with as many bots as seats or more, every ordering of them
+plays on each map, and with fewer bots (e.g. two bots on a 4 player map) their seats are rotated.
+"""
+
+import argparse
+import concurrent.futures
+import itertools
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+
+from .bots import SubprocessBot
+from .game import play_game
+from .inprocess import InProcessBot
+from .mapgen import random_map_size
+
+
+class ScheduledGame:
+    """
+    A game of a tournament, before it is played.
+
+    :ivar index: The number of the game in the tournament, from 0
+    :ivar lineup: The index of the tournament player in every seat (player id) of the game
+    :ivar width: Map width
+    :ivar height: Map height
+    :ivar seed: The map seed
+    """
+
+    def __init__(self, index, lineup, width, height, seed):
+        self.index = index
+        self.lineup = lineup
+        self.width = width
+        self.height = height
+        self.seed = seed
+
+    def as_dict(self):
+        """
+        :return: The game as plain data, e.g. for JSON
+        :rtype: dict
+        """
+        return dict(self.__dict__)
+
+    def __str__(self):
+        return "Game {} on {}x{} with seed {}, seats {}".format(self.index, self.width, self.height, self.seed,
+                                                                self.lineup)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def lineups(num_bots, num_players):
+    """
+    The seatings which a tournament cycles through, so that no bot keeps the advantage of a seat.
+
+    :param int num_bots: The number of different bots
+    :param int num_players: The seats of a game, 2 or 4
+    :return: Per seating the bot index in every seat
+    :rtype: list[tuple[int]]
+    """
+    if num_bots >= num_players:
+        return list(itertools.permutations(range(num_bots), num_players))
+    return [tuple((seat + shift) % num_bots for seat in range(num_players)) for shift in range(num_bots)]
+
+
+def schedule(num_bots, games, num_players=2, seed=None, dimensions=None):
+    """
+    Plan the games of a tournament. Every seating plays on the same map before the next map is drawn, which cancels
+    out most of the luck of the map.
+
+    :param int num_bots: The number of different bots
+    :param int games: The number of games
+    :param int num_players: The seats of every game, 2 or 4
+    :param int seed: Seed for the maps (defaults to a random one)
+    :param (int, int) dimensions: Width and height of every map (defaults to random ladder sizes)
+    :return: The games
+    :rtype: list[ScheduledGame]
+    """
+    rng = random.Random(seed)
+    seatings = lineups(num_bots, num_players)
+    scheduled = []
+    for index in range(games):
+        if index % len(seatings) == 0:
+            width, height = dimensions if dimensions is not None else random_map_size(num_players, rng)
+            map_seed = rng.randrange(2 ** 31)
+        scheduled.append(ScheduledGame(index, seatings[index % len(seatings)], width, height, map_seed))
+    return scheduled
+
+
+def wilson_interval(wins, games, confidence=0.95):
+    """
+    Confidence interval of a win rate, which unlike the normal approximation stays within [0, 1] and is usable for
+    few games.
+
+    :param int wins: The games won
+    :param int games: The games played
+    :param float confidence: The probability that the interval holds the true win rate
+    :return: The lower and upper bound
+    :rtype: (float, float)
+    """
+    if games == 0:
+        return 0.0, 1.0
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    rate = wins / games
+    center = (rate + z * z / (2 * games)) / (1 + z * z / games)
+    spread = z / (1 + z * z / games) * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games))
+    return max(0.0, center - spread), min(1.0, center + spread)
+
+
+class Standings:
+    """
+    Running totals of a tournament, per bot.
+
+    :ivar names: The name of every bot
+    :ivar games: The games every bot played
+    :ivar wins: The games every bot won (one of its seats ranked first)
+    :ivar ranks: The sum of the ranks of every bot's seats
+    :ivar seats: The seats every bot played
+    :ivar latencies: The per-turn latencies of every bot's seats
+    """
+
+    def __init__(self, names):
+        self.names = names
+        self.games = [0] * len(names)
+        self.wins = [0] * len(names)
+        self.ranks = [0] * len(names)
+        self.seats = [0] * len(names)
+        self.latencies = [[] for _ in names]
+
+    def add(self, game, result):
+        """
+        Count a played game.
+
+        :param ScheduledGame game: The game
+        :param game.GameResult result: Its result
+        :return: nothing
+        """
+        for bot in set(game.lineup):
+            self.games[bot] += 1
+        for player in result.players:
+            bot = game.lineup[player.player_id]
+            self.seats[bot] += 1
+            self.ranks[bot] += player.rank
+            self.latencies[bot].extend(player.latencies[1:])  # Without the initialization
+            if player.rank == 1:
+                self.wins[bot] += 1
+
+    def win_rate(self, bot, confidence=0.95):
+        """
+        :param int bot: The bot index
+        :param float confidence: See wilson_interval
+        :return: The share of games the bot won, and its confidence interval
+        :rtype: (float, float, float)
+        """
+        low, high = wilson_interval(self.wins[bot], self.games[bot], confidence)
+        return (self.wins[bot] / self.games[bot] if self.games[bot] else 0.0), low, high
+
+    def leader(self, confidence=0.95):
+        """
+        The bot which is better than all others with the given confidence: the lower bound of its win rate is above
+        the upper bounds of all other bots.
+
+        :param float confidence: See wilson_interval
+        :return: The index of that bot, or None while the tournament is undecided
+        :rtype: int
+        """
+        intervals = [self.win_rate(bot, confidence)[1:] for bot in range(len(self.names))]
+        for bot, (low, _) in enumerate(intervals):
+            if all(low > high for other, (_, high) in enumerate(intervals) if other != bot):
+                return bot
+        return None
+
+    def as_dict(self):
+        """
+        :return: The standings as plain data, e.g. for JSON
+        :rtype: dict
+        """
+        return {'names': self.names, 'games': self.games, 'wins': self.wins, 'ranks': self.ranks, 'seats': self.seats}
+
+    def summary(self, confidence=0.95):
+        """
+        :param float confidence: See wilson_interval
+        :return: One line per bot with its win rate and confidence interval, mean rank and turn latency
+        :rtype: str
+        """
+        lines = []
+        for bot, name in enumerate(self.names):
+            rate, low, high = self.win_rate(bot, confidence)
+            latencies = self.latencies[bot]
+            lines.append("{}: won {}/{} = {:.1%} [{:.1%}, {:.1%}], mean rank {:.2f}, turn latency mean {:.1f} ms, "
+                         "max {:.1f} ms".format(name, self.wins[bot], self.games[bot], rate, low, high,
+                                                self.ranks[bot] / max(self.seats[bot], 1),
+                                                1000 * statistics.mean(latencies) if latencies else 0.0,
+                                                1000 * max(latencies, default=0.0)))
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.summary()
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def play_scheduled(players, game, timeouts=False, max_turns=None, log_dir=None):
+    """
+    Play a game of a tournament. The bot commands start in a directory of the game's own, in which they write their
+    logs.
+
+    :param list players: Per bot either the shell command starting it (see bots.SubprocessBot), or a callable playing
+        a game in this process (see inprocess.InProcessBot)
+    :param ScheduledGame game: The game
+    :param bool timeouts: Whether to enforce the timeouts of the halite binary
+    :param int max_turns: The turn limit (defaults to the one of the map size)
+    :param str log_dir: The directory to keep the logs in, in a game_INDEX directory per game (defaults to a
+        temporary directory, removed after the game)
+    :return: The game and its result
+    :rtype: (ScheduledGame, game.GameResult)
+    """
+    if log_dir is None:
+        with tempfile.TemporaryDirectory() as directory:
+            return play_scheduled(players, game, timeouts, max_turns, directory)
+    directory = os.path.join(log_dir, "game_{}".format(game.index))
+    os.makedirs(directory, exist_ok=True)
+    bots = [SubprocessBot(players[bot], cwd=directory) if isinstance(players[bot], str)
+            else InProcessBot(players[bot]) for bot in game.lineup]
+    return game, play_game(bots, game.width, game.height, game.seed, max_turns, timeouts)
+
+
+def run_tournament(players, games, names=None, num_players=2, seed=None, dimensions=None, workers=None,
+                   confidence=0.95, min_games=20, early_stop=True, timeouts=False, max_turns=None,
+                   log_dir=None, on_result=None):
+    """
+    Play up to the given number of games between the players, as many at a time as there are workers.
+
+    The win rates are checked after every game, which makes an early stop more likely than the confidence suggests:
+    ask for a high confidence (and enough min_games) when the decision matters. Games which are still running when
+    the tournament stops are played to the end and counted; games which have not started are not played.
+
+    :param list players: Per bot the shell command starting it, with absolute paths as it starts in a directory of
+        the game's own, or a callable playing one game (see play_scheduled), which has to be picklable unless workers
+        is 1
+    :param int games: The most games to play
+    :param list[str] names: The name of every bot in the standings (defaults to the commands)
+    :param int num_players: The seats of every game, 2 or 4
+    :param int seed: Seed for the maps (defaults to a random one)
+    :param (int, int) dimensions: Width and height of every map (defaults to random ladder sizes)
+    :param int workers: The games to play at a time (defaults to the number of cores), 1 to play them in this
+        process
+    :param float confidence: See Standings.leader
+    :param int min_games: The games to play before stopping early
+    :param bool early_stop: Whether to stop once a bot is better than all others with the given confidence
+    :param bool timeouts: Whether to enforce the timeouts of the halite binary
+    :param int max_turns: The turn limit (defaults to the one of the map size)
+    :param str log_dir: The directory to keep the bots' logs in, in a directory per game (see play_scheduled)
+    :param on_result: Called with the ScheduledGame, its GameResult and the Standings after every game
+    :return: The standings, and every game with its result in the order they finished
+    :rtype: (Standings, list[(ScheduledGame, game.GameResult)])
+    """
+    if len(players) < 2:
+        raise ValueError("A tournament needs at least 2 bots, not {}".format(len(players)))
+    standings = Standings(names if names is not None else [str(player) for player in players])
+    scheduled = schedule(len(players), games, num_players, seed, dimensions)
+    results = []
+
+    def record(game, result):
+        standings.add(game, result)
+        results.append((game, result))
+        if on_result is not None:
+            on_result(game, result, standings)
+        return early_stop and len(results) >= min_games and standings.leader(confidence) is not None
+
+    workers = workers if workers is not None else os.cpu_count() or 1
+    if workers == 1:
+        for game in scheduled:
+            if record(*play_scheduled(players, game, timeouts, max_turns, log_dir)):
+                break
+        return standings, results
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(play_scheduled, players, game, timeouts, max_turns, log_dir)
+                   for game in scheduled]
+        for future in concurrent.futures.as_completed(futures):
+            if future.cancelled():
+                continue
+            if record(*future.result()):
+                for pending in futures:
+                    pending.cancel()
+    return standings, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Halite II tournament on the local game engine")
+    parser.add_argument("bots", nargs="+", help="shell commands starting the bots with absolute paths, at least 2")
+    parser.add_argument("-n", "--games", type=int, default=100, help="the most games to play")
+    parser.add_argument("-p", "--players", type=int, choices=(2, 4), default=2, help="seats of every game")
+    parser.add_argument("-d", "--dimensions", help='map width and height, e.g. "240 160" (defaults to random sizes)')
+    parser.add_argument("-s", "--seed", type=int, help="seed for the maps (defaults to a random one)")
+    parser.add_argument("-j", "--workers", type=int, help="games to play at a time (defaults to the cores)")
+    parser.add_argument("-c", "--confidence", type=float, default=0.95, help="confidence of the win rate intervals")
+    parser.add_argument("--min-games", type=int, default=20, help="games to play before stopping early")
+    parser.add_argument("--no-early-stop", action="store_true", help="play all games")
+    parser.add_argument("--timeouts", action="store_true", help="enforce the timeouts of the halite binary")
+    parser.add_argument("--turns", type=int, help="turn limit (defaults to the one of the map size)")
+    parser.add_argument("--json", help="file to write every game's result to, one JSON object per line")
+    parser.add_argument("--logs", help="directory to keep the bots' logs in, in a game_INDEX directory per game")
+    args = parser.parse_args()
+
+    if len(args.bots) < 2:
+        parser.error("a tournament needs at least 2 bots")
+    dimensions = [int(size) for size in args.dimensions.split()] if args.dimensions is not None else None
+    log = open(args.json, 'w') if args.json is not None else None
+
+    def report(game, result, standings):
+        winner = standings.names[game.lineup[result.ranking()[0].player_id]]
+        print("Game {} on {}x{} (seed {}, {} turns) won by {}".format(game.index, game.width, game.height, game.seed,
+                                                                      result.turns, winner))
+        print(standings.summary(args.confidence))
+        sys.stdout.flush()
+        if log is not None:
+            log.write(json.dumps(dict(result.as_dict(), game=game.as_dict(),
+                                      bots=[standings.names[bot] for bot in game.lineup])) + "\n")
+            log.flush()
+
+    try:
+        standings, results = run_tournament(
+            args.bots, args.games, num_players=args.players, seed=args.seed, dimensions=dimensions,
+            workers=args.workers, confidence=args.confidence, min_games=args.min_games,
+            early_stop=not args.no_early_stop, timeouts=args.timeouts, max_turns=args.turns, log_dir=args.logs,
+            on_result=report)
+    finally:
+        if log is not None:
+            log.close()
+    leader = standings.leader(args.confidence)
+    print("After {} games: {}".format(len(results), "undecided" if leader is None else "{} is better with {:.0%} "
+                                      "confidence".format(standings.names[leader], args.confidence)))
+
+
+if __name__ == "__main__":
+    main()
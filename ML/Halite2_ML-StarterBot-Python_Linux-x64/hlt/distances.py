@@ -0,0 +1,137 @@
+import numpy as np
+
+from . import constants, entity
+
+
+class DistanceMatrices:
+    """
+    Dense distances and angles between all ships and planets of one frame, each matrix computed on first use from
+    the columnar view and kept until the next frame is parsed. Rows and columns follow the view's ship and planet rows:
+    element [i, j] of ship_planet is the distance from view.ships[i] to view.planets[j]. Distances and angles (in
+    degrees in [0, 360)) agree with Entity.calculate_distance_between and Entity.calculate_angle_between up to the
+    last bit. Build it through Map.distances(). Requires NumPy.
+
+    :ivar view: The columnar view of the frame (columnar.ColumnarView)
+    """
+
+    def __init__(self, view):
+        """
+        :param columnar.ColumnarView view: The columnar view of the frame
+        """
+        self.view = view
+        self._matrices = {}
+
+    @property
+    def ship_planet_squared(self):
+        """
+        :return: Squared distances from every ship (rows) to every planet (columns), shape (S, P)
+        :rtype: numpy.ndarray
+        """
+        return self._matrix('ship_planet_squared', lambda: _squared_distances(
+            self.view.ship_x, self.view.ship_y, self.view.planet_x, self.view.planet_y))
+
+    @property
+    def ship_planet(self):
+        """
+        :return: Distances from every ship (rows) to every planet (columns), shape (S, P)
+        :rtype: numpy.ndarray
+        """
+        return self._matrix('ship_planet', lambda: np.sqrt(self.ship_planet_squared))
+
+    @property
+    def ship_planet_angle(self):
+        """
+        :return: Angles from every ship (rows) to every planet (columns) in degrees, shape (S, P)
+        :rtype: numpy.ndarray
+        """
+        return self._matrix('ship_planet_angle', lambda: _angles(
+            self.view.ship_x, self.view.ship_y, self.view.planet_x, self.view.planet_y))
+
+    @property
+    def ship_ship_squared(self):
+        """
+        :return: Squared distances from every ship (rows) to every ship (columns), shape (S, S)
+        :rtype: numpy.ndarray
+        """
+        return self._matrix('ship_ship_squared', lambda: _squared_distances(
+            self.view.ship_x, self.view.ship_y, self.view.ship_x, self.view.ship_y))
+
+    @property
+    def ship_ship(self):
+        """
+        :return: Distances from every ship (rows) to every ship (columns), shape (S, S)
+        :rtype: numpy.ndarray
+        """
+        return self._matrix('ship_ship', lambda: np.sqrt(self.ship_ship_squared))
+
+    @property
+    def ship_ship_angle(self):
+        """
+        :return: Angles from every ship (rows) to every ship (columns) in degrees, shape (S, S)
+        :rtype: numpy.ndarray
+        """
+        return self._matrix('ship_ship_angle', lambda: _angles(
+            self.view.ship_x, self.view.ship_y, self.view.ship_x, self.view.ship_y))
+
+    @property
+    def docking_range(self):
+        """
+        :return: Whether every ship (rows) is close enough to every planet (columns) to dock (see Ship.can_dock),
+            shape (S, P)
+        :rtype: numpy.ndarray
+        """
+        return self._matrix('docking_range', lambda: self.ship_planet <= (
+            self.view.planet_radius + constants.DOCK_RADIUS + constants.SHIP_RADIUS))
+
+    def distance(self, source, target):
+        """
+        Look up the distance between two ships or a ship and a planet of the frame.
+
+        :param entity.Entity source: A ship or planet
+        :param entity.Entity target: A ship or planet, not both planets
+        :return: The distance between them
+        :rtype: float
+        """
+        if isinstance(source, entity.Planet):
+            source, target = target, source
+        row = self.view.ship_rows[source.id]
+        if isinstance(target, entity.Planet):
+            return float(self.ship_planet[row, self.view.planet_rows[target.id]])
+        return float(self.ship_ship[row, self.view.ship_rows[target.id]])
+
+    def angle(self, ship, target):
+        """
+        Look up the angle from a ship to another ship or a planet of the frame.
+
+        :param entity.Ship ship: The ship
+        :param entity.Entity target: A ship or planet
+        :return: The angle in degrees
+        :rtype: float
+        """
+        row = self.view.ship_rows[ship.id]
+        if isinstance(target, entity.Planet):
+            return float(self.ship_planet_angle[row, self.view.planet_rows[target.id]])
+        return float(self.ship_ship_angle[row, self.view.ship_rows[target.id]])
+
+    def _matrix(self, name, compute):
+        matrix = self._matrices.get(name)
+        if matrix is None:
+            matrix = self._matrices[name] = compute()
+        return matrix
+
+    def __str__(self):
+        return "DistanceMatrices of {} ships and {} planets with {} computed"\
+            .format(len(self.view.ships), len(self.view.planets), sorted(self._matrices) or "none")
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def _squared_distances(source_x, source_y, target_x, target_y):
+    dx = target_x - source_x[:, np.newaxis]
+    dy = target_y - source_y[:, np.newaxis]
+    return dx ** 2 + dy ** 2
+
+
+def _angles(source_x, source_y, target_x, target_y):
+    return np.degrees(np.arctan2(target_y - source_y[:, np.newaxis], target_x - source_x[:, np.newaxis])) % 360
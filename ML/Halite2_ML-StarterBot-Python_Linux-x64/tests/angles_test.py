@@ -0,0 +1,33 @@
+from hlt import angles
+
+import math
+import unittest
+
+
+class TestAngles(unittest.TestCase):
+    def test_tables_match_math(self):
+        for degree in range(360):
+            expected = (math.cos(math.radians(degree)), math.sin(math.radians(degree)))
+            self.assertEqual(angles.to_cartesian(1, degree), expected)
+            self.assertEqual(angles.to_cartesian(1.0, float(degree)), expected)
+            for turn in (-720, -360, 360):
+                x, y = angles.to_cartesian(1, degree + turn)
+                self.assertAlmostEqual(x, expected[0])
+                self.assertAlmostEqual(y, expected[1])
+
+    def test_polar_round_trip(self):
+        magnitude, angle = angles.to_polar(*angles.to_cartesian(2.5, 123.4))
+        self.assertAlmostEqual(magnitude, 2.5)
+        self.assertAlmostEqual(angle, 123.4)
+        self.assertAlmostEqual(angles.to_polar(-1.0, -1.0)[1], -135.0)
+
+    def test_thrust_angle_and_difference(self):
+        self.assertEqual(angles.to_thrust_angle(359.6), 0)
+        self.assertEqual(angles.to_thrust_angle(-1.2), 359)
+        self.assertEqual(angles.difference(10, 350), 20)
+        self.assertEqual(angles.difference(350, 10), -20)
+        self.assertEqual(angles.difference(180, 0), -180)
+
+
+if __name__ == "__main__":
+    unittest.main()
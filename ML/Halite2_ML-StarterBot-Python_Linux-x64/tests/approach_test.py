@@ -0,0 +1,63 @@
+from hlt import collision, constants
+from hlt.game_map import Map
+
+import math
+import unittest
+
+# One player with a ship at (80, 50). Planet 1 sits on the ring of approach points of planet 0, and planet 2 is close
+# to the left border of the map.
+FRAME = ("1 "
+         "0 1 0 80.0 50.0 255 0.0 0.0 0 0 0 0 "
+         "3 "
+         "0 50.0 50.0 1000 5.0 3 0 800 0 0 0 "
+         "1 61.0 50.0 1000 3.0 2 0 800 0 0 0 "
+         "2 6.0 80.0 1000 5.0 3 0 800 0 0 0")
+
+
+class TestPlanetApproaches(unittest.TestCase):
+    def setUp(self):
+        self.game_map = Map(0, 240, 160)
+        self.game_map._parse(FRAME)
+        self.approaches = self.game_map.approaches()
+        self.ship = self.game_map.get_me().get_ship(0)
+
+    def test_kept_for_the_game(self):
+        self.assertIs(self.game_map.snapshot().approaches(), self.approaches)
+        self.game_map._parse(FRAME)
+        self.assertIs(self.game_map.approaches(), self.approaches)
+
+    def test_approach_points(self):
+        planet = self.game_map.get_planet(0)
+        points = self.approaches.approach_points(planet)
+        self.assertEqual(len(points), 360)
+        self.assertIsNone(points[0])  # inside planet 1
+        self.assertIsNone(self.approaches.approach_points(self.game_map.get_planet(2))[180])  # off the map
+        self.assertAlmostEqual(points[90].x, 50.0)
+        self.assertAlmostEqual(points[90].y, 58.0)
+        self.assertEqual(self.approaches.dock_distance(planet), 5.0 + constants.DOCK_RADIUS + constants.SHIP_RADIUS)
+
+    def test_closest_approach(self):
+        planet = self.game_map.get_planet(2)
+        for ship in self.game_map.get_me().all_ships() + self.game_map.all_planets()[:2]:
+            point = self.approaches.closest_approach(ship, planet)
+            expected = ship.closest_point_to(planet)
+            self.assertLess(point.calculate_distance_between(expected), math.radians(0.5) * 8 + 1e-9)
+        # The point facing the ship is blocked by planet 1, so the nearest free one is taken
+        point = self.approaches.closest_approach(self.ship, self.game_map.get_planet(0))
+        self.assertGreater(point.calculate_distance_between(self.game_map.get_planet(1)), 3.5)
+        self.assertAlmostEqual(point.calculate_distance_between(self.game_map.get_planet(0)), 8.0)
+
+    def test_tangent_approaches(self):
+        planet = self.game_map.get_planet(2)
+        counterclockwise, clockwise = self.approaches.tangent_approaches(self.ship, planet)
+        for point in (counterclockwise, clockwise):
+            self.assertFalse(collision.intersect_segment_circle(self.ship, point, planet, fudge=self.ship.radius))
+        # Seen from the ship, the point counterclockwise around the planet is to the right of it
+        to_planet = self.ship.calculate_angle_between(planet)
+        self.assertTrue(0 < (to_planet - self.ship.calculate_angle_between(counterclockwise)) % 360 < 90)
+        self.assertTrue(0 < (self.ship.calculate_angle_between(clockwise) - to_planet) % 360 < 90)
+        self.assertIsNone(self.approaches.tangent_approaches(planet, planet))
+
+
+if __name__ == "__main__":
+    unittest.main()
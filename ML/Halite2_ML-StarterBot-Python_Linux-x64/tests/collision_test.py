@@ -0,0 +1,87 @@
+from hlt.collision import blocked_headings, first_segment_circle_hits, intersect_segment_circle, \
+    intersect_segments_circles, segment_circle_entry
+from hlt.entity import Position
+
+import math
+import numpy as np
+import unittest
+
+
+class Circle:
+    def __init__(self, x, y, radius):
+        self.x = x
+        self.y = y
+        self.radius = radius
+
+
+class TestBatchCollision(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.start = rng.uniform(0, 60, size=(300, 2))
+        self.end = self.start + rng.uniform(-10, 10, size=(300, 2))
+        self.end[:10] = self.start[:10]  # segments of length zero
+        self.circles = np.column_stack([rng.uniform(0, 60, size=40), rng.uniform(0, 60, size=40),
+                                        rng.uniform(0.5, 8, size=40)])
+        self.fudge = rng.uniform(0, 1, size=(300, 40))
+
+    def scalar_hits(self, fudge):
+        return np.array([[intersect_segment_circle(Position(*start), Position(*end), Circle(*circle),
+                                                   fudge=fudge[i][j] if np.ndim(fudge) else fudge)
+                          for j, circle in enumerate(self.circles)]
+                         for i, (start, end) in enumerate(zip(self.start, self.end))])
+
+    def batch(self, function, fudge):
+        return function(self.start[:, 0], self.start[:, 1], self.end[:, 0], self.end[:, 1],
+                        self.circles[:, 0], self.circles[:, 1], self.circles[:, 2], fudge=fudge)
+
+    def test_matches_scalar_function(self):
+        for fudge in (0.5, self.fudge):
+            expected = self.scalar_hits(fudge)
+            self.assertTrue(expected.any() and not expected.all())
+            np.testing.assert_array_equal(self.batch(intersect_segments_circles, fudge), expected)
+
+    def test_first_hits(self):
+        hits = self.batch(intersect_segments_circles, self.fudge)
+        first = self.batch(first_segment_circle_hits, self.fudge)
+        self.assertTrue(np.array_equal(first == -1, ~hits.any(axis=1)))
+        hit_rows = np.flatnonzero(first >= 0)
+        self.assertTrue(hits[hit_rows, first[hit_rows]].all())
+
+    def test_first_hit_is_nearest_along_segment(self):
+        first = first_segment_circle_hits([0, 0, 0], [0, 0, 0], [30, 0, 30], [0, 0, 30],
+                                          [20, 8, 0], [0, 0, 5], [2, 3, 1], fudge=0.5)
+        self.assertEqual(list(first), [1, -1, -1])
+        self.assertEqual(list(first_segment_circle_hits([0], [0], [1], [1], [], [], [])), [-1])
+
+    def test_segment_entry(self):
+        start = Position(0.0, 0.0)
+        self.assertAlmostEqual(segment_circle_entry(start, Position(30.0, 0.0), Circle(20, 0, 2)), 17.5 / 30)
+        self.assertEqual(segment_circle_entry(start, Position(30.0, 0.0), Circle(1, 1, 2)), 0.0)
+        self.assertIsNone(segment_circle_entry(start, Position(30.0, 0.0), Circle(20, 5, 2)))
+        for (start, end), circle, fudge in zip(zip(self.start, self.end), self.circles, self.fudge[:, 0]):
+            entry = segment_circle_entry(Position(*start), Position(*end), Circle(*circle), fudge=fudge)
+            self.assertEqual(entry is not None,
+                             intersect_segment_circle(Position(*start), Position(*end), Circle(*circle), fudge=fudge))
+
+
+class TestBlockedHeadings(unittest.TestCase):
+    def test_matches_scalar_function(self):
+        rng = np.random.RandomState(1)
+        start = Position(0.0, 0.0)
+        for _ in range(200):
+            circle = Circle(rng.uniform(-30, 30), rng.uniform(-30, 30), rng.uniform(0.5, 10))
+            distance = rng.uniform(0, 40)
+            blocked = blocked_headings(start, [circle], distance, fudge=0.6)
+            for heading in np.arange(0, 360, 0.5):
+                end = Position(distance * math.cos(math.radians(heading)), distance * math.sin(math.radians(heading)))
+                offsets = [abs((heading - direction + 180) % 360 - 180) - half_width
+                           for direction, half_width in blocked]
+                if any(abs(offset) < 1e-6 for offset in offsets):
+                    continue  # on the edge of an interval
+                self.assertEqual(any(offset < 0 for offset in offsets),
+                                 intersect_segment_circle(start, end, circle, fudge=0.6),
+                                 (circle.x, circle.y, circle.radius, distance, heading))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+from hlt.deadline import TurnDeadline
+
+import time
+import unittest
+
+
+class TestTurnDeadline(unittest.TestCase):
+    def test_remaining_time(self):
+        deadline = TurnDeadline(10.0)
+        self.assertFalse(deadline.expired())
+        self.assertTrue(0 < deadline.remaining() <= 10.0)
+        self.assertTrue(TurnDeadline(1.0, time.perf_counter() - 2.0).expired())
+
+    def test_tasks_run_best_first(self):
+        deadline = TurnDeadline(10.0)
+        ran = []
+
+        def task(item):
+            ran.append(item)
+            return None if item == 3 else "task {}".format(item)
+
+        results = deadline.run_best_first([1, 3, 2], task, "fallback {}".format, key=lambda item: -item)
+        self.assertEqual(ran, [3, 2, 1])
+        self.assertEqual(results, ["task 1", "fallback 3", "task 2"])
+
+    def test_falls_back_after_deadline(self):
+        deadline = TurnDeadline(0.05)
+
+        def task(item):
+            time.sleep(0.03)
+            return "task {}".format(item)
+
+        results = deadline.run_best_first([0, 1, 2, 3], task, "fallback {}".format)
+        self.assertEqual(results, ["task 0", "fallback 1", "fallback 2", "fallback 3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
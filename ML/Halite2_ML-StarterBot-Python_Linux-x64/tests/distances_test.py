@@ -0,0 +1,61 @@
+from hlt.game_map import Map
+
+import random
+import unittest
+
+
+def random_frame(seed, num_ships=40, num_planets=8):
+    rng = random.Random(seed)
+    ships = ["{} {} {} 255 0.0 0.0 0 0 0 0".format(i, rng.uniform(0, 240), rng.uniform(0, 160))
+             for i in range(num_ships)]
+    planets = ["{} {} {} 1000 {} 3 0 800 0 0 0".format(i, rng.uniform(0, 240), rng.uniform(0, 160),
+                                                       rng.uniform(3, 8))
+               for i in range(num_planets)]
+    half = num_ships // 2
+    return "2 0 {} {} 1 {} {} {} {}".format(half, " ".join(ships[:half]), num_ships - half,
+                                            " ".join(ships[half:]), num_planets, " ".join(planets))
+
+
+class TestDistanceMatrices(unittest.TestCase):
+    def setUp(self):
+        self.game_map = Map(0, 240, 160)
+        self.game_map._parse(random_frame(0))
+        self.matrices = self.game_map.distances()
+        self.ships = self.game_map._all_ships()
+
+    def test_match_entity_helpers(self):
+        for ship in self.ships:
+            for target in self.ships + self.game_map.all_planets():
+                self.assertAlmostEqual(self.matrices.distance(ship, target), ship.calculate_distance_between(target))
+                self.assertAlmostEqual(self.matrices.distance(target, ship), ship.calculate_distance_between(target))
+                if target is not ship:
+                    self.assertAlmostEqual(self.matrices.angle(ship, target), ship.calculate_angle_between(target))
+        view = self.matrices.view
+        for ship in self.ships:
+            for planet in self.game_map.all_planets():
+                self.assertEqual(self.matrices.docking_range[view.ship_row(ship), view.planet_row(planet)],
+                                 ship.can_dock(planet))
+
+    def test_nearby_entities_read_from_matrices(self):
+        ship = self.ships[3]
+        other_map = Map(0, 240, 160)
+        other_map._parse(random_frame(0))
+        other_ship = other_map._all_ships()[3]
+        for max_distance in (None, 50.0):
+            with_matrices = self.game_map.nearby_entities_by_distance(ship, max_distance)
+            without = other_map.nearby_entities_by_distance(other_ship, max_distance)
+            self.assertEqual(len(with_matrices), len(without))
+            for (distance, entities), (other_distance, other_entities) in zip(sorted(with_matrices.items()),
+                                                                              sorted(without.items())):
+                self.assertAlmostEqual(distance, other_distance)
+                self.assertEqual([(type(e), e.id) for e in entities], [(type(e), e.id) for e in other_entities])
+
+    def test_cached_per_frame(self):
+        self.assertIs(self.game_map.distances(), self.matrices)
+        self.assertIs(self.matrices.ship_planet, self.matrices.ship_planet)
+        self.game_map._parse(random_frame(1))
+        self.assertIsNot(self.game_map.distances(), self.matrices)
+
+
+if __name__ == "__main__":
+    unittest.main()
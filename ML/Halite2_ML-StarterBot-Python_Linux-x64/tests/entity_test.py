@@ -0,0 +1,63 @@
+from hlt.entity import Position
+from hlt.game_map import Map
+
+from game_map_test import FRAME
+
+import copy
+import pickle
+import unittest
+
+
+class TestPosition(unittest.TestCase):
+    def test_immutable(self):
+        position = Position(1.5, 2.0)
+        for name in ('x', 'y', 'radius', 'other'):
+            with self.assertRaises(AttributeError):
+                setattr(position, name, 3.0)
+        with self.assertRaises(AttributeError):
+            del position.x
+        self.assertEqual((position.x, position.y, position.radius), (1.5, 2.0, 0))
+        self.assertFalse(hasattr(position, '__dict__'))
+
+    def test_equal_positions_are_interchangeable_keys(self):
+        position = Position(1.5, 2.0)
+        same = Position(1.5, 2.0)
+        self.assertIsNot(position, same)
+        self.assertEqual(position, same)
+        self.assertEqual(hash(position), hash(same))
+        self.assertNotEqual(position, Position(2.0, 1.5))
+        self.assertEqual(len({position, same, Position(2.0, 1.5)}), 2)
+        self.assertEqual({position: "cached"}[same], "cached")
+        self.assertEqual(copy.copy(position), position)
+        self.assertEqual(pickle.loads(pickle.dumps(position)), position)
+
+
+class TestEntityIdentity(unittest.TestCase):
+    def setUp(self):
+        self.game_map = Map(0, 240, 160)
+        self.game_map._parse(FRAME)
+        self.other_map = Map(0, 240, 160)
+        self.other_map._parse(FRAME)
+
+    def test_entities_are_equal_by_identity(self):
+        ship = self.game_map.get_me().get_ship(0)
+        same_ship = self.other_map.get_me().get_ship(0)
+        self.assertEqual((ship.x, ship.y, ship.health), (same_ship.x, same_ship.y, same_ship.health))
+        self.assertEqual(ship, ship)
+        self.assertNotEqual(ship, same_ship)
+        self.assertEqual(len({ship, same_ship}), 2)
+        planet = self.game_map.get_planet(0)
+        self.assertNotEqual(planet, self.other_map.get_planet(0))
+        self.assertNotEqual(ship, Position(ship.x, ship.y))
+        self.assertNotEqual(Position(ship.x, ship.y), ship)
+
+    def test_entities_have_slots(self):
+        ship = self.game_map.get_me().get_ship(0)
+        with self.assertRaises(AttributeError):
+            ship.other = 1
+        with self.assertRaises(AttributeError):
+            self.game_map.get_planet(0).other = 1
+
+
+if __name__ == "__main__":
+    unittest.main()
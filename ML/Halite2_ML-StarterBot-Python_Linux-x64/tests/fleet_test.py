@@ -0,0 +1,70 @@
+from hlt.deadline import TurnDeadline
+from hlt.fleet import FleetPlanner, resolve_commands
+from hlt.game_map import Map
+
+import math
+import unittest
+
+# Player 0 has two ships facing each other, one docked to planet 0 and one at the bottom border of the map. Player 1
+# has one ship far away.
+FRAME = ("2 "
+         "0 4 0 50.0 50.0 255 0.0 0.0 0 0 0 0 1 60.0 50.0 255 0.0 0.0 0 0 0 0 "
+         "2 50.0 66.5 255 0.0 0.0 2 0 0 0 3 150.0 2.0 255 0.0 0.0 0 0 0 0 "
+         "1 1 4 200.0 150.0 255 0.0 0.0 0 0 0 0 "
+         "1 "
+         "0 50.0 62.0 1000 3.0 3 0 800 1 0 1 2")
+
+
+def end_of_turn(ship, move):
+    speed, angle = move if move is not None else (0, 0)
+    return ship.x + speed * math.cos(math.radians(angle)), ship.y + speed * math.sin(math.radians(angle))
+
+
+class TestFleetPlanner(unittest.TestCase):
+    def setUp(self):
+        self.game_map = Map(0, 240, 160)
+        self.game_map._parse(FRAME)
+        self.me = self.game_map.get_me()
+
+    def test_head_on_moves_are_resolved(self):
+        planner = FleetPlanner(self.game_map)
+        first, second = self.me.get_ship(0), self.me.get_ship(1)
+        self.assertEqual(planner.plan(first, 7, 0), (7, 0))
+        speed, angle = planner.plan(second, 7, 180)
+        self.assertEqual(speed, 7)
+        self.assertNotEqual(angle, 180)
+        # The second ship passes the first one's end position with room to spare
+        x, y = end_of_turn(first, (7, 0))
+        for t in (0.0, 0.25, 0.5, 0.75, 1.0):
+            other_x = second.x + t * speed * math.cos(math.radians(angle))
+            other_y = second.y + t * speed * math.sin(math.radians(angle))
+            first_x = first.x + t * (x - first.x)
+            self.assertGreater(math.hypot(other_x - first_x, other_y - y), 1.0)
+        self.assertEqual(sorted(planner.commands()), sorted(["t 0 7 0", "t 1 7 {}".format(angle)]))
+
+    def test_static_obstacles_and_borders(self):
+        planner = FleetPlanner(self.game_map)
+        ship = self.me.get_ship(0)
+        speed, angle = planner.plan(ship, 7, 90)
+        self.assertEqual(speed, 7)
+        x, y = end_of_turn(ship, (speed, angle))
+        self.assertGreater(math.hypot(x - 50.0, y - 62.0), 3.5)
+
+        ship = self.me.get_ship(3)
+        speed, angle = planner.plan(ship, 7, 270)
+        self.assertGreaterEqual(end_of_turn(ship, (speed, angle))[1], ship.radius)
+        self.assertIsNone(planner.plan(ship, 7, 270, search=False))
+        self.assertNotIn(ship.id, planner.moves)
+
+    def test_resolve_commands(self):
+        commands = ["t 0 7 0", "u 2", "t 1 7 180"]
+        resolved = resolve_commands(self.game_map, commands)
+        self.assertEqual(resolved[:2], ["u 2", "t 0 7 0"])
+        self.assertNotEqual(resolved[2], "t 1 7 180")
+        # Without time left, the conflicting move is dropped instead of corrected
+        expired = TurnDeadline(0.0)
+        self.assertEqual(resolve_commands(self.game_map, commands, expired), ["u 2", "t 0 7 0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
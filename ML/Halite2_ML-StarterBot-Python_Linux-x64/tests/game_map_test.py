@@ -0,0 +1,234 @@
+from hlt.entity import Planet, Position, Ship
+from hlt.game_map import Map
+
+import unittest
+
+# Two players; player 0 has a ship docked to planet 1, player 1 has two undocked ships. Planet 0 is unowned.
+FRAME = ("2 "
+         "0 1 0 10.0 20.0 255 0.0 0.0 2 1 0 0 "
+         "1 2 1 100.5 80.25 128 0.0 0.0 0 0 0 0 2 101.0 81.0 64 0.0 0.0 0 0 0 1 "
+         "2 "
+         "0 50.0 50.0 1000 5.5 3 0 800 0 0 0 "
+         "1 12.0 22.0 900 4.0 2 36 600 1 0 1 0")
+
+
+# The next frame: ship 0 undocks, ship 1 moves, ship 2 dies, ship 3 spawns and planet 0 is destroyed.
+NEXT_FRAME = ("2 "
+              "0 1 0 10.0 20.0 255 0.0 0.0 3 1 0 0 "
+              "1 2 1 103.5 80.25 128 0.0 0.0 0 0 0 0 3 12.0 27.0 255 0.0 0.0 0 0 0 0 "
+              "1 "
+              "1 12.0 22.0 900 4.0 2 42 600 1 0 1 0")
+
+
+class TestMapParse(unittest.TestCase):
+    def setUp(self):
+        self.game_map = Map(0, 240, 160)
+        self.game_map._parse(FRAME)
+
+    def test_players_and_ships(self):
+        self.assertEqual(sorted(player.id for player in self.game_map.all_players()), [0, 1])
+        enemy = self.game_map.get_player(1)
+        self.assertEqual(sorted(ship.id for ship in enemy.all_ships()), [1, 2])
+        ship = enemy.get_ship(2)
+        self.assertEqual((ship.x, ship.y, ship.health), (101.0, 81.0, 64))
+        self.assertIs(ship.owner, enemy)
+        self.assertIsNone(ship.planet)
+
+    def test_planets_are_linked(self):
+        planet = self.game_map.get_planet(1)
+        docked_ship = self.game_map.get_me().get_ship(0)
+        self.assertIs(planet.owner, self.game_map.get_me())
+        self.assertEqual(planet.all_docked_ships(), [docked_ship])
+        self.assertEqual(docked_ship.docking_status, Ship.DockingStatus.DOCKED)
+        self.assertIs(docked_ship.planet, planet)
+        self.assertFalse(self.game_map.get_planet(0).is_owned())
+
+    def test_columnar_view(self):
+        state = self.game_map.columnar()
+        self.assertIs(self.game_map.columnar(), state)
+        self.assertEqual(list(state.ship_ids), [0, 1, 2])
+        row = state.ship_row(self.game_map.get_player(1).get_ship(2))
+        self.assertEqual((state.ship_x[row], state.ship_health[row], state.ship_owner[row]), (101.0, 64, 1))
+        self.assertEqual(list(state.ship_planet), [1, -1, -1])
+        self.assertEqual(list(state.ship_docking_status), [Ship.DockingStatus.DOCKED.value, 0, 0])
+        self.assertEqual(list(state.planet_owner), [-1, 0])
+        self.assertEqual(list(state.planet_docked), [0, 1])
+
+    def test_collections_are_cached_per_frame(self):
+        planets = self.game_map.all_planets()
+        ships = self.game_map._all_ships()
+        self.assertIs(self.game_map.all_planets(), planets)
+        self.assertIs(self.game_map._all_ships(), ships)
+        self.assertIs(self.game_map.get_me().all_ships(), self.game_map.get_me().all_ships())
+        self.assertEqual(self.game_map._all_entities(), planets + ships)
+        self.game_map._parse(FRAME)
+        self.assertIsNot(self.game_map.all_planets(), planets)
+        self.assertEqual([ship.id for ship in self.game_map._all_ships()], [ship.id for ship in ships])
+
+    def test_obstacles_between(self):
+        me = self.game_map.get_me()
+        enemy = self.game_map.get_player(1)
+        planet = self.game_map.get_planet(1)
+        self.assertEqual(self.game_map.obstacles_between(enemy.get_ship(1), Position(102.0, 82.0)),
+                         [enemy.get_ship(2)])
+        self.assertEqual(self.game_map.obstacles_between(enemy.get_ship(1), Position(102.0, 82.0), Ship), [])
+        self.assertEqual(self.game_map.obstacles_between(me.get_ship(0), Position(30.0, 40.0)), [planet])
+        self.assertEqual(self.game_map.obstacles_between(me.get_ship(0), Position(30.0, 40.0), Planet), [])
+        self.assertEqual(self.game_map.obstacles_between(enemy.get_ship(1), Position(100.5, 60.0)), [])
+
+    def test_any_and_first_obstacle(self):
+        me = self.game_map.get_me()
+        enemy = self.game_map.get_player(1)
+        self.assertTrue(self.game_map.any_obstacle_between(enemy.get_ship(1), Position(102.0, 82.0)))
+        self.assertFalse(self.game_map.any_obstacle_between(enemy.get_ship(1), Position(102.0, 82.0), Ship))
+        self.assertFalse(self.game_map.any_obstacle_between(enemy.get_ship(1), Position(100.5, 60.0)))
+        self.assertTrue(self.game_map.any_obstacle_between(me.get_ship(0), Position(30.0, 40.0), Ship))
+        self.assertIs(self.game_map.first_obstacle_between(enemy.get_ship(1), Position(102.0, 82.0)),
+                      enemy.get_ship(2))
+        self.assertIsNone(self.game_map.first_obstacle_between(enemy.get_ship(1), Position(100.5, 60.0)))
+        # Planet 1 is in the way before planet 0, and both enemy ships beyond planet 0
+        path = (me.get_ship(0), Position(109.55, 86.275))
+        self.assertEqual(len(self.game_map.obstacles_between(*path)), 4)
+        self.assertIs(self.game_map.first_obstacle_between(*path), self.game_map.get_planet(1))
+        self.assertIs(self.game_map.first_obstacle_between(*path, ignore=Planet), enemy.get_ship(1))
+
+    def test_navigate_around_obstacles(self):
+        ship = self.game_map.get_player(1).get_ship(1)
+        self.assertEqual(ship.navigate(Position(100.5, 60.0), self.game_map, 7), "t 1 7 270")
+        # Ship 2 is right next to ship 1, which has to turn at least 90 degrees away from it
+        self.assertEqual(ship.navigate(Position(120.5, 80.25), self.game_map, 7), "t 1 7 326")
+        self.assertEqual(ship.navigate(Position(120.5, 80.25), self.game_map, 7, ignore_ships=True), "t 1 7 0")
+        self.assertIsNone(ship.navigate(Position(120.5, 80.25), self.game_map, 7, max_corrections=3))
+        self.assertEqual(ship.navigate(Position(120.5, 80.25), self.game_map, 7, avoid_obstacles=False), "t 1 7 0")
+
+    def test_spatial_queries(self):
+        index = self.game_map.spatial_index()
+        self.assertIs(self.game_map.spatial_index(), index)
+        self.assertEqual(index.query(0, 0, 20, 20), [self.game_map.get_planet(1), self.game_map.get_me().get_ship(0)])
+        self.assertEqual(sorted(ship.id for ship in index.query(95, 75, 105, 85)), [1, 2])
+        self.assertIs(self.game_map._intersects_entity(Position(16.05, 22.0)), self.game_map.get_planet(1))
+        self.assertIsNone(self.game_map._intersects_entity(Position(16.2, 22.0)))
+        nearby = self.game_map.nearby_entities_by_distance(self.game_map.get_player(1).get_ship(1), 5)
+        self.assertEqual([entity.id for entities in nearby.values() for entity in entities], [2])
+
+    def test_reparse_replaces_state(self):
+        self.game_map._parse("1 0 0 0")
+        self.assertEqual(self.game_map.get_me().all_ships(), ())
+        self.assertEqual(self.game_map.all_planets(), ())
+        self.assertEqual(len(self.game_map.columnar().ship_ids), 0)
+
+    def test_trailing_tokens_are_rejected(self):
+        with self.assertRaises(AssertionError):
+            self.game_map._parse(FRAME + " 7")
+
+
+class TestMapSnapshot(unittest.TestCase):
+    def test_snapshot_shares_parsed_frame(self):
+        game_map = Map(0, 240, 160)
+        game_map._parse(FRAME)
+        planets = game_map.all_planets()
+        snapshot = game_map.snapshot()
+        game_map._parse(NEXT_FRAME)
+
+        self.assertIs(snapshot.all_planets(), planets)
+        self.assertIs(snapshot.snapshot(), snapshot)
+        self.assertEqual(snapshot.get_player(1).get_ship(1).x, 100.5)
+        self.assertEqual(game_map.get_player(1).get_ship(1).x, 103.5)
+        with self.assertRaises(TypeError):
+            snapshot._parse(FRAME)
+
+    def test_incremental_snapshot_is_copied(self):
+        game_map = Map(0, 240, 160, incremental=True)
+        game_map._parse(FRAME)
+        snapshot = game_map.snapshot()
+        game_map._parse(NEXT_FRAME)
+
+        me = snapshot.get_me()
+        docked_ship = me.get_ship(0)
+        planet = snapshot.get_planet(1)
+        self.assertIsNot(docked_ship, game_map.get_me().get_ship(0))
+        self.assertEqual(snapshot.get_player(1).get_ship(1).x, 100.5)
+        self.assertEqual(sorted(ship.id for ship in snapshot._all_ships()), [0, 1, 2])
+        self.assertEqual(docked_ship.docking_status, Ship.DockingStatus.DOCKED)
+        self.assertIs(docked_ship.owner, me)
+        self.assertIs(docked_ship.planet, planet)
+        self.assertIs(planet.owner, me)
+        self.assertEqual(planet.all_docked_ships(), [docked_ship])
+        self.assertEqual(planet.current_production, 36)
+        self.assertFalse(snapshot.get_planet(0).is_owned())
+
+
+class TestMapLazy(unittest.TestCase):
+    def setUp(self):
+        self.game_map = Map(0, 240, 160, lazy=True)
+        self.game_map._parse(FRAME)
+
+    def test_enemy_ships_are_not_parsed_until_accessed(self):
+        me = self.game_map.get_me()
+        enemy = self.game_map.get_player(1)
+        planet = self.game_map.get_planet(1)
+        self.assertEqual(planet.all_docked_ships(), [me.get_ship(0)])
+        self.assertIs(me.get_ship(0).planet, planet)
+        self.assertIsNone(enemy._ships)
+
+        ship = enemy.get_ship(2)
+        self.assertEqual((ship.x, ship.y, ship.health), (101.0, 81.0, 64))
+        self.assertIs(ship.owner, enemy)
+        self.assertEqual(len(self.game_map._all_ships()), 3)
+
+    def test_lazy_and_incremental_are_exclusive(self):
+        with self.assertRaises(ValueError):
+            Map(0, 240, 160, incremental=True, lazy=True)
+
+
+class TestMapIncremental(unittest.TestCase):
+    def setUp(self):
+        self.game_map = Map(0, 240, 160, incremental=True)
+        self.game_map._parse(FRAME)
+
+    def test_first_frame_spawns_everything(self):
+        self.assertEqual(sorted(ship.id for ship in self.game_map.delta.spawned_ships), [0, 1, 2])
+        self.assertIs(self.game_map.get_planet(1).owner, self.game_map.get_me())
+
+    def test_objects_are_reused(self):
+        me = self.game_map.get_me()
+        docked_ship = me.get_ship(0)
+        moving_ship = self.game_map.get_player(1).get_ship(1)
+        planet = self.game_map.get_planet(1)
+        self.game_map._parse(NEXT_FRAME)
+
+        self.assertIs(self.game_map.get_me(), me)
+        self.assertIs(me.get_ship(0), docked_ship)
+        self.assertIs(self.game_map.get_player(1).get_ship(1), moving_ship)
+        self.assertIs(self.game_map.get_planet(1), planet)
+        self.assertEqual(moving_ship.x, 103.5)
+        self.assertEqual(planet.current_production, 42)
+        self.assertIs(planet.owner, me)
+        self.assertEqual(planet.all_docked_ships(), [docked_ship])
+        self.assertIs(docked_ship.planet, planet)
+        self.assertEqual(docked_ship.docking_status, Ship.DockingStatus.UNDOCKING)
+
+    def test_delta(self):
+        self.game_map._parse(NEXT_FRAME)
+        delta = self.game_map.delta
+        self.assertEqual([ship.id for ship in delta.spawned_ships], [3])
+        self.assertIs(delta.spawned_ships[0].owner, self.game_map.get_player(1))
+        self.assertEqual([ship.id for ship in delta.died_ships], [2])
+        self.assertEqual([ship.id for ship in delta.moved_ships], [1])
+        self.assertEqual([ship.id for ship in delta.docking_changed_ships], [0])
+        self.assertEqual([planet.id for planet in delta.destroyed_planets], [0])
+        self.assertIsNone(self.game_map.get_player(1).get_ship(2))
+        self.assertIsNone(self.game_map.get_planet(0))
+
+    def test_cached_collections_follow_updates(self):
+        enemy = self.game_map.get_player(1)
+        self.assertEqual(len(enemy.all_ships()), 2)
+        self.assertEqual(len(self.game_map.all_planets()), 2)
+        self.game_map._parse(NEXT_FRAME)
+        self.assertEqual(sorted(ship.id for ship in enemy.all_ships()), [1, 3])
+        self.assertEqual(sorted(ship.id for ship in self.game_map._all_ships()), [0, 1, 3])
+        self.assertEqual([planet.id for planet in self.game_map.all_planets()], [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+from halite_sim.bots import SubprocessBot
+from halite_sim.engine import Engine, parse_commands
+from halite_sim.game import play_game
+from halite_sim.inprocess import play_in_process
+from halite_sim.mapgen import generate_map
+from halite_sim.state import DOCKED, DOCKING, GameState, Planet
+import hlt
+from hlt import constants
+from hlt.game_map import Map
+
+import os
+import shlex
+import sys
+import tempfile
+import unittest
+
+# A bot which docks every ship it can and otherwise stays put, using the starter kit like any other bot
+DOCKING_BOT = """
+import sys
+sys.path.insert(0, {!r})
+import hlt
+game = hlt.Game("Docker")
+while True:
+    game_map = game.update_map()
+    commands = [ship.dock(planet) for ship in game_map.get_me().all_ships() for planet in game_map.all_planets()
+                if ship.docking_status == ship.DockingStatus.UNDOCKED and ship.can_dock(planet)][:1]
+    game.send_command_queue(commands)
+""".format(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def small_state(*ships, planets=()):
+    """
+    :param ships: (owner, x, y) of every ship
+    :param planets: (x, y, radius) of every planet
+    """
+    state = GameState(100, 100, 2)
+    for owner, x, y in ships:
+        state.add_ship(owner, x, y)
+    for x, y, radius in planets:
+        state.planets[len(state.planets)] = Planet(len(state.planets), x, y, radius)
+    return state
+
+
+class DockingBot:
+    """The in-process counterpart of DOCKING_BOT, counting the games it played."""
+    def __init__(self):
+        self.games = 0
+
+    def play(self, transport=None, log_level=None):
+        game = hlt.Game("Docker", transport=transport, log_level=log_level)
+        self.games += 1
+        while True:
+            game_map = game.update_map()
+            commands = [ship.dock(planet) for ship in game_map.get_me().all_ships()
+                        for planet in game_map.all_planets()
+                        if ship.docking_status == ship.DockingStatus.UNDOCKED and ship.can_dock(planet)][:1]
+            game.send_command_queue(commands)
+
+
+def crashing_bot(transport=None, log_level=None):
+    hlt.Game("Crash", transport=transport, log_level=log_level)
+    raise RuntimeError("Crash")
+
+
+class IdleBot:
+    """Connection to a bot which never does anything."""
+    def __init__(self, name):
+        self.name = name
+        self.frames = 0
+
+    def send_line(self, line):
+        self.frames += 1
+
+    def read_line(self, timeout=None):
+        return (self.name if self.frames == 3 else ""), 0.0
+
+    def close(self):
+        pass
+
+
+class TestCommands(unittest.TestCase):
+    def test_parse_unseparated_commands(self):
+        self.assertEqual(parse_commands("t 1 7 270d 2 5u 3t 4 0 -90"),
+                         [('t', 1, (7, 270)), ('d', 2, (5,)), ('u', 3, ()), ('t', 4, (0, -90))])
+        self.assertEqual(parse_commands(""), [])
+        for line in ("t 1 7", "x 1", "d 1 2 3", "t 1 7 2.5"):
+            with self.assertRaises(ValueError):
+                parse_commands(line)
+
+
+class TestMap(unittest.TestCase):
+    def test_frame_is_parsed_by_starter_kit(self):
+        for num_players in (2, 4):
+            state = generate_map(240, 160, num_players, seed=5)
+            game_map = Map(0, 240, 160)
+            game_map._parse(state.frame())
+            self.assertEqual(len(game_map.all_players()), num_players)
+            self.assertEqual(len(game_map.get_me().all_ships()), 3)
+            self.assertEqual(len(game_map.all_planets()),
+                             constants.EXTRA_PLANETS + num_players * constants.PLANETS_PER_PLAYER)
+            for planet in game_map.all_planets():
+                self.assertEqual(planet.remaining_resources, int(round(planet.radius * constants.RESOURCES_PER_RADIUS)))
+            for ship in game_map._all_ships():
+                self.assertIsNone(game_map._intersects_entity(ship))
+
+    def test_symmetric(self):
+        state = generate_map(240, 160, 2, seed=9)
+        positions = {(round(planet.x, 6), round(planet.y, 6), planet.radius) for planet in state.planets.values()}
+        self.assertEqual({(round(240 - x, 6), round(160 - y, 6), radius) for x, y, radius in positions}, positions)
+        self.assertNotEqual(generate_map(240, 160, 2, seed=9).frame(), generate_map(240, 160, 2, seed=10).frame())
+
+
+class TestRules(unittest.TestCase):
+    def test_collisions(self):
+        engine = Engine(small_state((0, 10, 10), (1, 16, 10), (0, 30, 30), (1, 80, 50), (1, 60, 95),
+                                    planets=[(80, 40, 5)]))
+        engine.step({0: "t 0 3 0", 1: "t 1 3 180t 3 7 270"})
+        ships = engine.state.ships
+        self.assertEqual(sorted(ships), [2, 4])  # Ships 0 and 1 collided, ship 3 crashed into the planet
+        self.assertEqual(engine.state.planets[0].health, 5 * constants.MAX_SHIP_HEALTH - constants.BASE_SHIP_HEALTH)
+        engine.step({0: "t 2 7 180", 1: "t 4 7 90"})
+        self.assertEqual(ships[2].x, 23)
+        self.assertNotIn(4, ships)  # Left the map
+
+    def test_weapons(self):
+        engine = Engine(small_state((0, 10, 10), (1, 15, 10), (1, 10, 15), (0, 50, 50)))
+        engine.step({})
+        ships = engine.state.ships
+        # Ship 0 splits its damage between ships 1 and 2, which both fire at ship 0
+        self.assertEqual([ships[ship_id].health for ship_id in range(4)], [255 - 128, 255 - 32, 255 - 32, 255])
+        self.assertEqual(engine.stats[0].damage_dealt, 64)
+        self.assertEqual(engine.stats[1].damage_dealt, 128)
+
+    def test_docking_and_production(self):
+        engine = Engine(small_state((0, 50, 44), (1, 50, 80), planets=[(50, 50, 5)]))
+        engine.step({0: "d 0 0"})
+        ship = engine.state.ships[0]
+        self.assertEqual((ship.docking_status, engine.state.planets[0].owner), (DOCKING, 0))
+        for _ in range(constants.DOCK_TURNS):
+            engine.step({})
+        self.assertEqual(ship.docking_status, DOCKED)
+        turns = constants.PRODUCTION_PER_SHIP // constants.BASE_PRODUCTIVITY
+        for _ in range(turns):
+            engine.step({})
+        self.assertEqual(len(engine.state.player_ships(0)), 2)
+        self.assertEqual(engine.stats[0].ships_produced, 1)
+
+    def test_contested_dock(self):
+        engine = Engine(small_state((0, 50, 44), (1, 50, 56), planets=[(50, 50, 5)]))
+        engine.step({0: "d 0 0", 1: "d 1 0"})
+        self.assertIsNone(engine.state.planets[0].owner)
+
+    def test_explosion(self):
+        engine = Engine(small_state((0, 50, 44), (1, 61, 50), (1, 50, 62), planets=[(50, 50, 5)]))
+        engine.step({0: "d 0 0"})
+        engine.state.planets[0].health = 100
+        engine.step({1: "t 1 7 180"})
+        self.assertEqual(engine.state.planets, {})
+        self.assertEqual(list(engine.state.ships), [2])
+        self.assertLess(engine.state.ships[2].health, constants.BASE_SHIP_HEALTH)
+        self.assertTrue(engine.finished())
+        self.assertEqual(engine.ranking(), [1, 0])
+
+
+class TestGame(unittest.TestCase):
+    def test_idle_game(self):
+        result = play_game([IdleBot("A"), IdleBot("B")], 240, 160, seed=1, max_turns=10)
+        self.assertEqual(result.turns, 10)
+        self.assertEqual([player.name for player in result.ranking()], ["A", "B"])  # Ties go to earlier seats
+        self.assertEqual(str(result).splitlines()[2],
+                         "Player #1, B, came in rank #2 and was last alive on frame #10, producing 0 ships and "
+                         "dealing 0 damage!")
+
+    def test_subprocess_bots(self):
+        command = "{} -c {}".format(shlex.quote(sys.executable), shlex.quote(DOCKING_BOT))
+        crashing = "{} -c 'print(\"Crash\")'".format(shlex.quote(sys.executable))
+        with tempfile.TemporaryDirectory() as directory:
+            result = play_game([SubprocessBot(command, cwd=directory), IdleBot("Idle")], 240, 160, seed=2,
+                               max_turns=5)
+            self.assertEqual([(player.name, player.error) for player in result.players], [("Docker", None),
+                                                                                           ("Idle", None)])
+            self.assertEqual(len(result.players[0].latencies), 6)
+            self.assertTrue(os.path.exists(os.path.join(directory, "0_Docker.log")))
+
+            result = play_game([SubprocessBot(crashing, cwd=directory), SubprocessBot(command, cwd=directory)],
+                               240, 160, seed=2)
+        crashed, docker = result.players
+        self.assertEqual((crashed.name, crashed.rank, docker.rank), ("Crash", 2, 1))
+        self.assertIn("exited", crashed.error)
+        self.assertLessEqual(result.turns, 1)  # The game ends as soon as the other player is out
+
+    def test_in_process_bots(self):
+        bot = DockingBot()
+        with tempfile.TemporaryDirectory() as directory:
+            cwd = os.getcwd()
+            os.chdir(directory)
+            try:
+                results = [play_in_process([bot.play, bot.play], 240, 160, seed=seed, max_turns=20)
+                           for seed in (2, 3)]
+                self.assertEqual(os.listdir(directory), [])  # No logs
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(bot.games, 4)
+        for result in results:
+            self.assertEqual(result.turns, 20)
+            self.assertEqual([(player.name, player.error) for player in result.players], [("Docker", None)] * 2)
+            self.assertEqual(len(result.players[0].latencies), 21)
+
+        result = play_in_process([crashing_bot, bot.play], 240, 160, seed=2)
+        crashed, docker = result.players
+        self.assertEqual((crashed.name, crashed.rank, docker.rank), ("Player 0", 2, 1))  # Crashed before its name
+        self.assertIn("RuntimeError", crashed.error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+from hlt.networking import Game, StdioTransport
+
+from game_map_test import FRAME
+
+import atexit
+import io
+import logging
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+
+def start(stdin, stdout=None, **options):
+    """
+    :return: A Game over the given stdin, which does not set up logging
+    """
+    with mock.patch.object(Game, "_set_up_logging"):
+        return Game("Test", transport=StdioTransport(stdin, stdout or io.BytesIO()), **options)
+
+
+class TestStdioTransport(unittest.TestCase):
+    def test_lines(self):
+        stdout = io.BytesIO()
+        transport = StdioTransport(io.BytesIO(b"0\n240 160\n"), stdout)
+        self.assertEqual(transport.read_line(), "0")
+        self.assertEqual(transport.read_line(), "240 160")
+        self.assertRaises(EOFError, transport.read_line)
+        transport.write_line("t 0 3 90")
+        self.assertEqual(stdout.getvalue(), b"t 0 3 90\n")
+
+    def test_end_of_game_ends_the_loop(self):
+        stdout = io.BytesIO()
+        game = start(io.BytesIO("0\n240 160\n{}\n{}\n".format(FRAME, FRAME).encode()), stdout)
+        turns = 0
+        with self.assertRaises(EOFError):
+            while True:
+                game.update_map()
+                game.send_command_queue([])
+                turns += 1
+        self.assertEqual(turns, 1)
+        self.assertEqual(stdout.getvalue(), b"Test\n\n")
+
+
+class TestGame(unittest.TestCase):
+    def start(self, **options):
+        return start(io.BytesIO("0\n240 160\n{}\n".format(FRAME).encode()), **options)
+
+    def test_approaches_are_built_on_request(self):
+        self.assertNotIn('approaches', self.start().map._static)
+        game = self.start(approaches=True)
+        self.assertIn('approaches', game.map._static)
+        self.assertIs(game.map.approaches(), game.initial_map.approaches())
+
+
+class Formatted:
+    """
+    A log argument which records the thread formatting it.
+    """
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread())
+        return "formatted"
+
+
+class TestLogging(unittest.TestCase):
+    def setUp(self):
+        # logging.basicConfig only configures a root logger without handlers
+        root = logging.getLogger()
+        self.addCleanup(setattr, root, 'level', root.level)
+        self.addCleanup(setattr, root, 'handlers', root.handlers)
+        root.handlers = []
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+
+    def play(self, async_logging):
+        """
+        :return: The logs written by a game in a directory of its own, by file name, and the argument logged
+        """
+        argument = Formatted()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            game = Game("Test", transport=StdioTransport(io.BytesIO("1\n240 160\n{}\n".format(FRAME).encode()),
+                                                         io.BytesIO()), async_logging=async_logging)
+            logging.info("ship %s", argument)
+            logging.debug("turn %d", 1)
+            if async_logging:
+                atexit.unregister(game._log_listener.stop)
+                game._log_listener.stop()
+            else:
+                self.assertIsNone(game._log_listener)
+            root = logging.getLogger()
+            for handler in root.handlers:
+                handler.close()
+            root.handlers = []
+            logs = {}
+            for name in os.listdir(directory):
+                with open(os.path.join(directory, name)) as log:
+                    logs[name] = log.read()
+        return logs, argument
+
+    def test_asynchronous_log_matches_synchronous_log(self):
+        logs, argument = self.play(async_logging=False)
+        self.assertEqual(argument.threads, [threading.main_thread()])
+        self.assertEqual(list(logs), ["1_Test.log"])
+        self.assertIn("INFO:root:ship formatted\nDEBUG:root:turn 1\n", logs["1_Test.log"])
+
+        async_logs, argument = self.play(async_logging=True)
+        self.assertEqual(async_logs, logs)
+        self.assertEqual(len(argument.threads), 1)
+        self.assertIsNot(argument.threads[0], threading.main_thread())
+
+
+if __name__ == "__main__":
+    unittest.main()
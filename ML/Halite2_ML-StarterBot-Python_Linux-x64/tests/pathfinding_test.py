@@ -0,0 +1,63 @@
+from hlt import collision
+from hlt.entity import Position
+from hlt.game_map import Map
+
+import unittest
+
+# One player with a ship at (40, 80), with planets 0 and 1 forming a wall between it and the right side of the map.
+FRAME = ("1 "
+         "0 1 0 40.0 80.0 255 0.0 0.0 0 0 0 0 "
+         "3 "
+         "0 80.0 70.0 1000 10.0 3 0 800 0 0 0 "
+         "1 80.0 92.0 1000 10.0 3 0 800 0 0 0 "
+         "2 200.0 30.0 1000 5.0 3 0 800 0 0 0")
+
+
+class TestVisibilityGraph(unittest.TestCase):
+    def setUp(self):
+        self.game_map = Map(0, 240, 160)
+        self.game_map._parse(FRAME)
+        self.graph = self.game_map.visibility_graph()
+        self.ship = self.game_map.get_me().get_ship(0)
+
+    def assert_clear(self, start, waypoints):
+        for end in waypoints:
+            for planet in self.game_map.all_planets():
+                self.assertFalse(collision.intersect_segment_circle(start, end, planet, fudge=0.5))
+            start = end
+
+    def test_path_around_planets(self):
+        target = Position(120.0, 81.0)
+        path = self.graph.path(self.ship, target)
+        self.assertGreater(len(path), 1)
+        self.assertIs(path[-1], target)
+        self.assert_clear(self.ship, path)
+        # The path goes around the wall, not around planet 2 on the far side of the map
+        self.assertLess(max(waypoint.y for waypoint in path), 115.0)
+        self.assertGreater(min(waypoint.y for waypoint in path), 45.0)
+
+    def test_direct_and_impossible_paths(self):
+        target = Position(40.0, 20.0)
+        self.assertEqual(self.graph.path(self.ship, target), [target])
+        self.assertIsNone(self.graph.path(self.ship, Position(200.0, 31.0)))  # inside planet 2
+
+    def test_next_waypoint_is_cached_per_turn(self):
+        target = Position(120.0, 81.0)
+        waypoint = self.game_map.next_waypoint(self.ship, target)
+        self.assertEqual(waypoint, self.graph.path(self.ship, target)[0])
+        self.assertIs(self.game_map.next_waypoint(Position(40.2, 80.3), target), waypoint)
+        self.assertEqual(len(self.game_map._cache['waypoints']), 1)
+        self.game_map._parse(FRAME)
+        self.assertNotIn('waypoints', self.game_map._cache)
+        self.assertIs(self.game_map.visibility_graph(), self.graph)
+
+    def test_navigate_along_path(self):
+        target = Position(120.0, 81.0)
+        waypoint = self.game_map.next_waypoint(self.ship, target)
+        command = self.ship.navigate(target, self.game_map, speed=7, pathfind=True)
+        self.assertEqual(command, self.ship.navigate(waypoint, self.game_map, speed=7))
+        self.assertIsNone(self.ship.navigate(Position(200.0, 31.0), self.game_map, speed=7, pathfind=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+from hlt import constants
+from hlt.entity import Ship
+from hlt.game_map import Map
+
+import random
+import unittest
+
+
+def random_frame(seed, num_players=3, ships_per_player=30, num_planets=10):
+    rng = random.Random(seed)
+    players = []
+    for player in range(num_players):
+        ships = ["{} {} {} 255 0.0 0.0 {} 0 0 0".format(player * 1000 + i, rng.uniform(0, 240), rng.uniform(0, 160),
+                                                       rng.randrange(4))
+                 for i in range(ships_per_player)]
+        players.append("{} {} {}".format(player, ships_per_player, " ".join(ships)))
+    planets = ["{} {} {} 1000 {} 3 0 800 {} {} 0".format(i, rng.uniform(0, 240), rng.uniform(0, 160),
+                                                         rng.uniform(3, 8), int(i % 3 != 2), i % 3)
+               for i in range(num_planets)]
+    return "{} {} {} {}".format(num_players, " ".join(players), num_planets, " ".join(planets))
+
+
+def edge_distance(source, target):
+    return source.calculate_distance_between(target) - source.radius - target.radius
+
+
+class TestQueries(unittest.TestCase):
+    def setUp(self):
+        self.game_map = Map(0, 240, 160)
+        self.game_map._parse(random_frame(0))
+        self.ships = self.game_map._all_ships()
+        self.planets = self.game_map.all_planets()
+
+    def test_nearest_ships(self):
+        for source in self.ships[::7] + self.planets[::3]:
+            for k in (1, 5, 200):
+                expected = sorted((ship for ship in self.ships if ship is not source),
+                                  key=source.calculate_distance_between)[:k]
+                self.assertEqual(self.game_map.nearest_ships(source, k), expected)
+            enemies = self.game_map.nearest_ships(source, 4, enemy_of=0, docking_status=Ship.DockingStatus.UNDOCKED)
+            self.assertEqual(enemies, sorted((ship for ship in self.ships if ship.owner.id != 0 and ship is not source
+                                              and ship.docking_status is Ship.DockingStatus.UNDOCKED),
+                                             key=source.calculate_distance_between)[:4])
+            nearby = self.game_map.nearest_ships(source, 200, owner=1, max_distance=30.0)
+            self.assertEqual(nearby, sorted((ship for ship in self.ships if ship.owner.id == 1 and ship is not source
+                                             and source.calculate_distance_between(ship) <= 30.0),
+                                            key=source.calculate_distance_between))
+
+    def test_nearest_planets(self):
+        ship = self.ships[0]
+        self.assertEqual(self.game_map.nearest_planets(ship, 3),
+                         sorted(self.planets, key=ship.calculate_distance_between)[:3])
+        self.assertEqual(self.game_map.nearest_planets(ship, 20, enemy_of=0),
+                         sorted((planet for planet in self.planets if planet.owner is None or planet.owner.id != 0),
+                                key=ship.calculate_distance_between))
+        self.assertEqual(self.game_map.nearest_planets(ship, 0), [])
+
+    def test_ranges(self):
+        for ship in self.ships:
+            self.assertEqual(set(self.game_map.enemies_in_weapon_range(ship)),
+                             {other for other in self.ships if other.owner is not ship.owner
+                              and edge_distance(ship, other) <= constants.WEAPON_RADIUS})
+        for planet in self.planets:
+            self.assertEqual(set(self.game_map.ships_in_dock_range(planet)),
+                             {ship for ship in self.ships if ship.can_dock(planet)})
+            in_range = self.game_map.ships_in_explosion_range(planet, owner=2)
+            self.assertEqual(in_range, sorted((ship for ship in self.ships if ship.owner.id == 2
+                                               and edge_distance(planet, ship) <= constants.EXPLOSION_RADIUS),
+                                              key=planet.calculate_distance_between))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+from halite_sim.tournament import lineups, run_tournament, schedule, wilson_interval
+import hlt
+
+import os
+import shlex
+import sys
+import tempfile
+import unittest
+
+# A bot which stays put, using the starter kit like any other bot
+IDLE_BOT = """
+import sys
+sys.path.insert(0, {!r})
+import hlt
+game = hlt.Game("Idle")
+while True:
+    game.update_map()
+    game.send_command_queue([])
+""".format(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def idle_bot(transport=None, log_level=None):
+    game = hlt.Game("Idle", transport=transport, log_level=log_level)
+    while True:
+        game.update_map()
+        game.send_command_queue([])
+
+
+def quitting_bot(transport=None, log_level=None):
+    hlt.Game("Quitter", transport=transport, log_level=log_level)
+
+
+class TestSchedule(unittest.TestCase):
+    def test_lineups(self):
+        self.assertEqual(lineups(2, 2), [(0, 1), (1, 0)])
+        self.assertEqual(lineups(2, 4), [(0, 1, 0, 1), (1, 0, 1, 0)])
+        self.assertEqual(len(lineups(3, 2)), 6)
+        self.assertEqual(len(set(lineups(4, 4))), 24)
+
+    def test_maps_are_shared_by_a_rotation(self):
+        games = schedule(2, 5, seed=3)
+        self.assertEqual([game.lineup for game in games], [(0, 1), (1, 0)] * 2 + [(0, 1)])
+        self.assertEqual(games[0].seed, games[1].seed)
+        self.assertNotEqual(games[1].seed, games[2].seed)
+        self.assertEqual([game.seed for game in schedule(2, 5, seed=3)], [game.seed for game in games])
+        self.assertEqual({(game.width, game.height) for game in schedule(2, 4, dimensions=(240, 160))}, {(240, 160)})
+
+
+class TestStandings(unittest.TestCase):
+    def test_wilson_interval(self):
+        self.assertEqual(wilson_interval(0, 0), (0.0, 1.0))
+        low, high = wilson_interval(50, 100)
+        self.assertAlmostEqual(low, 0.4038, places=4)
+        self.assertAlmostEqual(high, 0.5962, places=4)
+        self.assertEqual(wilson_interval(10, 10)[1], 1.0)
+
+    def test_early_stop(self):
+        standings, results = run_tournament([idle_bot, quitting_bot], 100, names=["Idle", "Quitter"], workers=1,
+                                            min_games=10, seed=1)
+        self.assertEqual(len(results), 10)
+        self.assertEqual((standings.wins, standings.games), ([10, 0], [10, 10]))
+        self.assertEqual(standings.leader(), 0)
+        self.assertTrue(standings.summary().startswith("Idle: won 10/10 = 100.0% ["))
+
+        standings, results = run_tournament([idle_bot, idle_bot], 4, num_players=4, workers=1, seed=1, max_turns=2)
+        self.assertEqual(len(results), 4)  # Never decided
+        self.assertEqual(standings.seats, [8, 8])
+        self.assertIsNone(standings.leader())
+
+    def test_process_pool(self):
+        command = "{} -c {}".format(shlex.quote(sys.executable), shlex.quote(IDLE_BOT))
+        quitting = "{} -c 'print(\"Quitter\")'".format(shlex.quote(sys.executable))
+        with tempfile.TemporaryDirectory() as directory:
+            standings, results = run_tournament([command, quitting], 4, workers=2, early_stop=False, max_turns=3,
+                                                log_dir=directory)
+            # Every game keeps the log of the idle bot, named after its seat, in a directory of its own
+            self.assertEqual({game.index: os.listdir(os.path.join(directory, "game_{}".format(game.index)))
+                              for game, _ in results},
+                             {game.index: ["{}_Idle.log".format(game.lineup.index(0))] for game, _ in results})
+        self.assertEqual(sorted(game.index for game, _ in results), [0, 1, 2, 3])
+        self.assertEqual(standings.wins, [4, 0])
+        self.assertEqual(len(standings.latencies[0]), sum(result.turns for _, result in results))
+
+    def test_logs_are_removed(self):
+        command = "{} -c {}".format(shlex.quote(sys.executable), shlex.quote(IDLE_BOT))
+        with tempfile.TemporaryDirectory() as directory:
+            cwd = os.getcwd()
+            os.chdir(directory)
+            try:
+                run_tournament([command, command], 2, workers=2, early_stop=False, max_turns=2)
+                self.assertEqual(os.listdir(directory), [])
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    unittest.main()
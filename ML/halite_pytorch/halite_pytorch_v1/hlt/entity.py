@@ -2,7 +2,7 @@ import logging
 import abc
 import math
 from enum import Enum
-from . import constants
+from . import angles, collision, constants
 
 
 class Entity:
@@ -19,6 +19,7 @@ class Entity:
     :ivar owner: The player ID of the owner, if any. If None, Entity is not owned.
     """
     __metaclass__ = abc.ABCMeta
+    __slots__ = ('x', 'y', 'radius', 'health', 'owner', 'id')
 
     def __init__(self, x, y, radius, health, player, entity_id):
         self.x = x
@@ -58,12 +59,9 @@ class Entity:
         :return: The closest point's coordinates
         :rtype: Position
         """
-        angle = target.calculate_angle_between(self)
+        angle = math.atan2(self.y - target.y, self.x - target.x)
         radius = target.radius + min_distance
-        x = target.x + radius * math.cos(math.radians(angle))
-        y = target.y + radius * math.sin(math.radians(angle))
-
-        return Position(x, y)
+        return Position(target.x + radius * math.cos(angle), target.y + radius * math.sin(angle))
 
     @abc.abstractmethod
     def _link(self, players, planets):
@@ -92,6 +90,8 @@ class Planet(Entity):
     :ivar owner: The player ID of the owner, if any. If None, Entity is not owned.
 
     """
+    __slots__ = ('num_docking_spots', 'current_production', 'remaining_resources',
+                 '_docked_ship_ids', '_docked_ships')
 
     def __init__(self, planet_id, x, y, hp, radius, docking_spots, current,
                  remaining, owned, owner, docked_ships):
@@ -105,7 +105,7 @@ class Planet(Entity):
         self.health = hp
         self.owner = owner if bool(int(owned)) else None
         self._docked_ship_ids = docked_ships
-        self._docked_ships = {}
+        self._docked_ships = None
 
     def get_docked_ship(self, ship_id):
         """
@@ -115,7 +115,7 @@ class Planet(Entity):
         :return: The Ship object representing that id or None if not docked.
         :rtype: Ship
         """
-        return self._docked_ships.get(ship_id)
+        return self._get_docked_ships().get(ship_id)
 
     def all_docked_ships(self):
         """
@@ -124,7 +124,7 @@ class Planet(Entity):
         :return: The list of all ships docked
         :rtype: list[Ship]
         """
-        return list(self._docked_ships.values())
+        return list(self._get_docked_ships().values())
 
     def is_owned(self):
         """
@@ -143,64 +143,138 @@ class Planet(Entity):
         """
         return len(self._docked_ship_ids) >= self.num_docking_spots
 
+    def _get_docked_ships(self):
+        """
+        The docked ships keyed by id, looked up from the owner the first time they are needed, so that linking a
+        planet does not force the owner's ships to be parsed (see Map lazy mode).
+
+        :rtype: dict[int, Ship]
+        """
+        if self._docked_ships is None:
+            self._docked_ships = {} if self.owner is None else \
+                {ship_id: self.owner.get_ship(ship_id) for ship_id in self._docked_ship_ids}
+        return self._docked_ships
+
     def _link(self, players, planets):
         """
         This function serves to take the id values set in the parse function and use it to populate the planet
-        owner and docked_ships params with the actual objects representing each, rather than IDs
+        owner param with the actual object representing it, rather than its ID. The docked ships are resolved
+        on first access.
 
         :param dict[int, gane_map.Player] players: A dictionary of player objects keyed by id
         :return: nothing
         """
         if self.owner is not None:
             self.owner = players.get(self.owner)
-            for ship in self._docked_ship_ids:
-                self._docked_ships[ship] = self.owner.get_ship(ship)
+        self._docked_ships = None
+
+    def _update(self, hp, current, remaining, owned, owner, docked_ships):
+        """
+        Update this planet in place with its state from a newer frame. Like a freshly parsed planet, the owner
+        and docked ships are ids again until the planet is linked.
+
+        :return: nothing
+        """
+        self.health = hp
+        self.current_production = current
+        self.remaining_resources = remaining
+        self.owner = owner if owned else None
+        self._docked_ship_ids = docked_ships
+        self._docked_ships = None
+
+    def _copy(self):
+        """
+        Copy the planet, with its owner as an id again until the copy is linked. The list of docked ship ids is
+        shared, as it is replaced rather than modified by updates.
+
+        :return: The unlinked copy
+        :rtype: Planet
+        """
+        return Planet(self.id, self.x, self.y, self.health, self.radius, self.num_docking_spots,
+                      self.current_production, self.remaining_resources, self.owner is not None,
+                      None if self.owner is None else self.owner.id, self._docked_ship_ids)
 
     @staticmethod
-    def _parse_single(tokens):
+    def _parse_single(tokens, index):
         """
         Parse a single planet given tokenized input from the game environment.
 
-        :return: The planet ID, planet object, and unused tokens.
-        :rtype: (int, Planet, list[str])
+        :param list[str] tokens: The tokenized input
+        :param int index: The position of the planet's first token
+        :return: The planet ID, planet object, and the position of the next unused token.
+        :rtype: (int, Planet, int)
         """
         (plid, x, y, hp, r, docking, current, remaining,
-         owned, owner, num_docked_ships, *remainder) = tokens
+         owned, owner, num_docked_ships) = tokens[index:index + 11]
+        index += 11
 
         plid = int(plid)
-        docked_ships = []
-
-        for _ in range(int(num_docked_ships)):
-            ship_id, *remainder = remainder
-            docked_ships.append(int(ship_id))
+        num_docked_ships = int(num_docked_ships)
+        docked_ships = [int(ship_id) for ship_id in tokens[index:index + num_docked_ships]]
+        index += num_docked_ships
 
-        planet = Planet(int(plid),
+        planet = Planet(plid,
                         float(x), float(y),
                         int(hp), float(r), int(docking),
                         int(current), int(remaining),
                         bool(int(owned)), int(owner),
                         docked_ships)
 
-        return plid, planet, remainder
+        return plid, planet, index
 
     @staticmethod
-    def _parse(tokens):
+    def _parse(tokens, index):
         """
         Parse planet data given a tokenized input.
 
         :param list[str] tokens: The tokenized input
-        :return: the populated planet dict and the unused tokens.
-        :rtype: (dict, list[str])
+        :param int index: The position of the planet count token
+        :return: the populated planet dict and the position of the next unused token.
+        :rtype: (dict, int)
         """
-        num_planets, *remainder = tokens
-        num_planets = int(num_planets)
+        num_planets = int(tokens[index])
+        index += 1
         planets = {}
 
         for _ in range(num_planets):
-            plid, planet, remainder = Planet._parse_single(remainder)
+            plid, planet, index = Planet._parse_single(tokens, index)
             planets[plid] = planet
 
-        return planets, remainder
+        return planets, index
+
+
+    @staticmethod
+    def _parse_incremental(planets, tokens, index, delta):
+        """
+        Parse planet data given a tokenized input, updating the planets of the previous frame in place.
+
+        :param dict[int, Planet] planets: The planets of the previous frame, keyed by id. Consumed by the update.
+        :param list[str] tokens: The tokenized input
+        :param int index: The position of the planet count token
+        :param game_map.MapDelta delta: Collects the planets which were destroyed
+        :return: the populated planet dict and the position of the next unused token.
+        :rtype: (dict, int)
+        """
+        num_planets = int(tokens[index])
+        index += 1
+        updated = {}
+
+        for _ in range(num_planets):
+            planet = planets.pop(int(tokens[index]), None)
+            if planet is None:
+                plid, planet, index = Planet._parse_single(tokens, index)
+            else:
+                hp, current, remaining, owned, owner, num_docked_ships = \
+                    tokens[index + 3], tokens[index + 6], tokens[index + 7], tokens[index + 8], \
+                    tokens[index + 9], int(tokens[index + 10])
+                index += 11
+                planet._update(int(hp), int(current), int(remaining), bool(int(owned)), int(owner),
+                               [int(ship_id) for ship_id in tokens[index:index + num_docked_ships]])
+                index += num_docked_ships
+            updated[planet.id] = planet
+
+        delta.destroyed_planets.extend(planets.values())
+        return updated, index
 
 
 class Ship(Entity):
@@ -223,6 +297,8 @@ class Ship(Entity):
         DOCKED = 2
         UNDOCKING = 3
 
+    __slots__ = ('docking_status', 'planet', '_velocity_x', '_velocity_y', '_docking_progress', '_weapon_cooldown')
+
     def __init__(self, player_id, ship_id, x, y, hp, vel_x, vel_y,
                  docking_status, planet, progress, cooldown):
         self.id = ship_id
@@ -233,9 +309,44 @@ class Ship(Entity):
         self.health = hp
         self.docking_status = docking_status
         self.planet = planet if (docking_status is not Ship.DockingStatus.UNDOCKED) else None
+        self._velocity_x = vel_x
+        self._velocity_y = vel_y
         self._docking_progress = progress
         self._weapon_cooldown = cooldown
 
+    def _update(self, x, y, hp, vel_x, vel_y, docking_status, planet, progress, cooldown):
+        """
+        Update this ship in place with its state from a newer frame. If the docking status changed, the planet is
+        an id again until the ship is linked.
+
+        :return: Whether the ship moved, and whether its docking status changed
+        :rtype: (bool, bool)
+        """
+        moved = x != self.x or y != self.y
+        docking_changed = docking_status is not self.docking_status
+        self.x = x
+        self.y = y
+        self.health = hp
+        self._velocity_x = vel_x
+        self._velocity_y = vel_y
+        if docking_changed:
+            self.docking_status = docking_status
+            self.planet = planet if (docking_status is not Ship.DockingStatus.UNDOCKED) else None
+        self._docking_progress = progress
+        self._weapon_cooldown = cooldown
+        return moved, docking_changed
+
+    def _copy(self):
+        """
+        Copy the ship, with its owner and planet as ids again until the copy is linked.
+
+        :return: The unlinked copy
+        :rtype: Ship
+        """
+        return Ship(self.owner.id, self.id, self.x, self.y, self.health, self._velocity_x, self._velocity_y,
+                    self.docking_status, None if self.planet is None else self.planet.id,
+                    self._docking_progress, self._weapon_cooldown)
+
     def thrust(self, magnitude, angle):
         """
         Generate a command to accelerate this ship.
@@ -270,14 +381,15 @@ class Ship(Entity):
         return "u {}".format(self.id)
 
     def navigate(self, target, game_map, speed, avoid_obstacles=True, max_corrections=90, angular_step=1,
-                 ignore_ships=False, ignore_planets=False):
+                 ignore_ships=False, ignore_planets=False, pathfind=False):
         """
         Move a ship to a specific target position (Entity). It is recommended to place the position
         itself here, else navigate will crash into the target. If avoid_obstacles is set to True (default)
         will avoid obstacles on the way, with up to max_corrections corrections. Note that each correction accounts
-        for angular_step degrees difference, meaning that the algorithm will naively try max_correction degrees before giving
-        up (and returning None). The navigation will only consist of up to one command; call this method again
-        in the next turn to continue navigating to the position.
+        for angular_step degrees difference in either direction: the headings blocked by the nearby obstacles are
+        computed at once, and the free heading closest to the target's direction is taken. If every heading up to
+        max_corrections - 1 corrections away is blocked, returns None. The navigation will only consist of up to one
+        command; call this method again in the next turn to continue navigating to the position.
 
         :param Entity target: The entity to which you will navigate
         :param game_map.Map game_map: The map of the game, from which obstacles will be extracted
@@ -287,23 +399,30 @@ class Ship(Entity):
         :param int angular_step: The degree difference to deviate if the original destination has obstacles
         :param bool ignore_ships: Whether to ignore ships in calculations (this will make your movement faster, but more precarious)
         :param bool ignore_planets: Whether to ignore planets in calculations (useful if you want to crash onto planets)
+        :param bool pathfind: Whether to head for the next waypoint of the shortest path around the planets
+            (see Map.next_waypoint) instead of straight for the target. Requires NumPy.
         :return string: The command trying to be passed to the Halite engine or None if movement is not possible within max_corrections degrees.
         :rtype: str
         """
         # Assumes a position, not planet (as it would go to the center of the planet otherwise)
         if max_corrections <= 0:
             return None
+        if pathfind and not ignore_planets:
+            target = game_map.next_waypoint(self, target)
+            if target is None:
+                return None
         distance = self.calculate_distance_between(target)
         angle = self.calculate_angle_between(target)
         ignore = () if not (ignore_ships or ignore_planets) \
             else Ship if (ignore_ships and not ignore_planets) \
             else Planet if (ignore_planets and not ignore_ships) \
             else Entity
-        if avoid_obstacles and game_map.obstacles_between(self, target, ignore):
-            new_target_dx = math.cos(math.radians(angle + angular_step)) * distance
-            new_target_dy = math.sin(math.radians(angle + angular_step)) * distance
-            new_target = Position(self.x + new_target_dx, self.y + new_target_dy)
-            return self.navigate(new_target, game_map, speed, True, max_corrections - 1, angular_step)
+        if avoid_obstacles and game_map.any_obstacle_between(self, target, ignore):
+            obstacles = game_map._obstacles_around(self, target, distance, ignore)
+            blocked = collision.blocked_headings(self, obstacles, distance, fudge=self.radius + 0.1)
+            angle = _nearest_free_heading(angle, blocked, max_corrections, angular_step)
+            if angle is None:
+                return None
         speed = speed if (distance >= speed) else distance
         return self.thrust(speed, angle)
 
@@ -330,17 +449,18 @@ class Ship(Entity):
         self.planet = planets.get(self.planet)  # If not will just reset to none
 
     @staticmethod
-    def _parse_single(player_id, tokens):
+    def _parse_single(player_id, tokens, index):
         """
         Parse a single ship given tokenized input from the game environment.
 
         :param int player_id: The id of the player who controls the ships
-        :param list[tokens]: The remaining tokens
-        :return: The ship ID, ship object, and unused tokens.
-        :rtype: int, Ship, list[str]
+        :param list[str] tokens: The tokenized input
+        :param int index: The position of the ship's first token
+        :return: The ship ID, ship object, and the position of the next unused token.
+        :rtype: int, Ship, int
         """
         (sid, x, y, hp, vel_x, vel_y,
-         docked, docked_planet, progress, cooldown, *remainder) = tokens
+         docked, docked_planet, progress, cooldown) = tokens[index:index + 10]
 
         sid = int(sid)
         docked = Ship.DockingStatus(int(docked))
@@ -353,28 +473,104 @@ class Ship(Entity):
                     docked, int(docked_planet),
                     int(progress), int(cooldown))
 
-        return sid, ship, remainder
+        return sid, ship, index + 10
 
     @staticmethod
-    def _parse(player_id, tokens):
+    def _parse(player_id, tokens, index):
         """
         Parse ship data given a tokenized input.
 
         :param int player_id: The id of the player who owns the ships
         :param list[str] tokens: The tokenized input
-        :return: The dict of Players and unused tokens.
-        :rtype: (dict, list[str])
+        :param int index: The position of the ship count token
+        :return: The dict of Ships and the position of the next unused token.
+        :rtype: (dict, int)
         """
         ships = {}
-        num_ships, *remainder = tokens
-        for _ in range(int(num_ships)):
-            ship_id, ships[ship_id], remainder = Ship._parse_single(player_id, remainder)
-        return ships, remainder
+        num_ships = int(tokens[index])
+        index += 1
+        for _ in range(num_ships):
+            ship_id, ships[ship_id], index = Ship._parse_single(player_id, tokens, index)
+        return ships, index
+
+
+    @staticmethod
+    def _parse_incremental(player_id, ships, tokens, index, delta):
+        """
+        Parse ship data given a tokenized input, updating the ships of the previous frame in place.
+
+        :param int player_id: The id of the player who owns the ships
+        :param dict[int, Ship] ships: The player's ships in the previous frame, keyed by id. Consumed by the update.
+        :param list[str] tokens: The tokenized input
+        :param int index: The position of the ship count token
+        :param game_map.MapDelta delta: Collects the spawned, died, moved and docking changed ships
+        :return: The dict of Ships and the position of the next unused token.
+        :rtype: (dict, int)
+        """
+        updated = {}
+        num_ships = int(tokens[index])
+        index += 1
+        for _ in range(num_ships):
+            ship = ships.pop(int(tokens[index]), None)
+            if ship is None:
+                ship_id, ship, index = Ship._parse_single(player_id, tokens, index)
+                delta.spawned_ships.append(ship)
+            else:
+                (x, y, hp, vel_x, vel_y, docked, docked_planet, progress, cooldown) = tokens[index + 1:index + 10]
+                index += 10
+                moved, docking_changed = ship._update(float(x), float(y), int(hp), float(vel_x), float(vel_y),
+                                                      Ship.DockingStatus(int(docked)), int(docked_planet),
+                                                      int(progress), int(cooldown))
+                if moved:
+                    delta.moved_ships.append(ship)
+                if docking_changed:
+                    delta.docking_changed_ships.append(ship)
+            updated[ship.id] = ship
+        delta.died_ships.extend(ships.values())
+        return updated, index
+
+
+def _nearest_free_heading(angle, blocked, max_corrections, angular_step):
+    """
+    Find the heading closest to angle, in whole steps of angular_step degrees in either direction, which lies outside
+    all blocked intervals. Ties go to the counterclockwise (positive) direction.
+
+    :param float angle: The desired heading in degrees
+    :param list[(float, float)] blocked: The blocked intervals, as direction and half-width in degrees
+    :param int max_corrections: The number of headings to try in each direction, including angle itself
+    :param float angular_step: The difference between tried headings in degrees
+    :return: The free heading in degrees, or None if every tried heading is blocked
+    :rtype: float
+    """
+    # The blocked intervals as offsets from the desired heading, including their copies a full turn away
+    offsets = []
+    for direction, half_width in blocked:
+        offset = angles.difference(direction, angle)
+        for turn in (-360, 0, 360):
+            offsets.append((offset + turn - half_width, offset + turn + half_width))
+
+    best_steps, best_sign = max_corrections, None
+    for sign in (1, -1):
+        intervals = offsets if sign > 0 else [(-high, -low) for low, high in offsets]
+        steps = 0
+        moved = True
+        while moved and steps < best_steps:
+            moved = False
+            for low, high in intervals:
+                if low <= steps * angular_step <= high:
+                    steps = int(high // angular_step) + 1
+                    moved = True
+        if steps < best_steps:
+            best_steps, best_sign = steps, sign
+    if best_sign is None:
+        return None
+    return (angle + best_sign * best_steps * angular_step) % 360
 
 
 class Position(Entity):
     """
-    A simple wrapper for a coordinate. Intended to be passed to some functions in place of a ship or planet.
+    A simple immutable wrapper for a coordinate. Intended to be passed to some functions in place of a ship or
+    planet. Positions compare equal and hash by their coordinates.
 
     :ivar id: Unused
     :ivar x: The x-coordinate.
@@ -383,14 +579,38 @@ class Position(Entity):
     :ivar health: Unused.
     :ivar owner: Unused.
     """
+    __slots__ = ()
+
+    # Shadow the Entity slots, so a position only ever stores its coordinates.
+    radius = 0
+    health = None
+    owner = None
+    id = None
 
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.radius = 0
-        self.health = None
-        self.owner = None
-        self.id = None
+        _set_x(self, x)
+        _set_y(self, y)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Position is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Position is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, Position):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
+
+    def __hash__(self):
+        return hash((self.x, self.y))
+
+    def __reduce__(self):
+        return Position, (self.x, self.y)
 
     def _link(self, players, planets):
         raise NotImplementedError("Position should not have link attributes.")
+
+
+_set_x = Entity.x.__set__
+_set_y = Entity.y.__set__
@@ -0,0 +1,167 @@
+from . import angles, collision, constants, entity
+
+# Friendly ships are bucketed by their position at the start of the turn in cells this large, so that every ship
+# which can reach another one during the turn is in the same or a neighboring cell.
+_CELL_SIZE = 2 * constants.MAX_SPEED + 2 * constants.SHIP_RADIUS + 1
+
+
+class FleetPlanner:
+    """
+    Plans the moves of all of the player's ships together, so that no two of them collide during the turn. Every ship
+    stays where it is until a move is planned for it. A move is checked against the paths of all other ships as they
+    are planned at that moment, with their actual (integer) speed and angle, and against the planets, docked enemy
+    ships and map borders; if it conflicts, the closest free heading, then a lower speed, is used instead.
+
+    Plan the most important moves first: a ship planned later has to give way.
+
+    :ivar moves: Dict of ship id to the planned (speed, angle) of every ship which moves
+    """
+
+    def __init__(self, game_map, max_corrections=45, angular_step=1, margin=0.1):
+        """
+        :param game_map.Map game_map: The map of the current turn
+        :param int max_corrections: The number of alternative headings to try on either side of a conflicting move
+        :param int angular_step: The degree difference between alternative headings
+        :param float margin: Additional distance to keep between ships and from obstacles
+        """
+        self.moves = {}
+        self._map = game_map
+        self._me = game_map.get_me()
+        self._max_corrections = max_corrections
+        self._angular_step = angular_step
+        self._margin = margin
+        self._velocities = {}
+        self._cells = {}
+        for ship in self._me.all_ships():
+            self._velocities[ship.id] = (0.0, 0.0)
+            self._cells.setdefault(self._cell(ship), []).append(ship)
+
+    def plan(self, ship, speed, angle, search=True):
+        """
+        Plan a move for one of the player's (undocked) ships.
+
+        :param entity.Ship ship: The ship to move
+        :param int speed: The desired speed
+        :param int angle: The desired angle in degrees
+        :param bool search: Whether to look for an alternative if the desired move conflicts; if False the ship stays
+            put instead (cheap, e.g. when the turn's time is up)
+        :return: The planned (speed, angle), or None if the ship stays put
+        :rtype: (int, int)
+        """
+        self._set_velocity(ship, 0, 0)
+        self.moves.pop(ship.id, None)
+        speed = int(speed)
+        angle = angles.to_thrust_angle(angle)
+        if speed <= 0:
+            return None
+        for candidate in self._candidates(speed, angle) if search else ((speed, angle),):
+            if self._is_free(ship, *candidate):
+                self._set_velocity(ship, *candidate)
+                self.moves[ship.id] = candidate
+                return candidate
+        return None
+
+    def commands(self):
+        """
+        :return: The thrust commands of all planned moves
+        :rtype: list[str]
+        """
+        return ["t {} {} {}".format(ship_id, speed, angle) for ship_id, (speed, angle) in self.moves.items()]
+
+    def _candidates(self, speed, angle):
+        """
+        The moves to try for a ship, in order of preference: the desired move, the desired speed at the closest
+        headings on either side, then lower speeds at the desired heading.
+        """
+        yield speed, angle
+        for correction in range(1, self._max_corrections + 1):
+            yield speed, (angle + correction * self._angular_step) % 360
+            yield speed, (angle - correction * self._angular_step) % 360
+        for lower_speed in range(speed - 1, 0, -1):
+            yield lower_speed, angle
+
+    def _is_free(self, ship, speed, angle):
+        """
+        Check a move of a ship against the map borders, static obstacles and the other ships' planned moves.
+
+        :rtype: bool
+        """
+        velocity_x = speed * angles.COS[angle]
+        velocity_y = speed * angles.SIN[angle]
+        end = entity.Position(ship.x + velocity_x, ship.y + velocity_y)
+        if not (ship.radius <= end.x <= self._map.width - ship.radius
+                and ship.radius <= end.y <= self._map.height - ship.radius):
+            return False
+
+        fudge = ship.radius + self._margin
+        for obstacle in self._map.spatial_index().query_segment(ship, end, fudge):
+            static = isinstance(obstacle, entity.Planet) or (
+                obstacle.owner is not self._me and obstacle.docking_status is not entity.Ship.DockingStatus.UNDOCKED)
+            if static and collision.intersect_segment_circle(ship, end, obstacle, fudge=fudge):
+                return False
+
+        column, row = self._cell(ship)
+        for neighbor_column in (column - 1, column, column + 1):
+            for neighbor_row in (row - 1, row, row + 1):
+                for other in self._cells.get((neighbor_column, neighbor_row), ()):
+                    if other is not ship and _paths_collide(ship, velocity_x, velocity_y, other,
+                                                            self._velocities[other.id],
+                                                            ship.radius + other.radius + self._margin):
+                        return False
+        return True
+
+    def _set_velocity(self, ship, speed, angle):
+        self._velocities[ship.id] = (speed * angles.COS[angle], speed * angles.SIN[angle])
+
+    @staticmethod
+    def _cell(ship):
+        return int(ship.x // _CELL_SIZE), int(ship.y // _CELL_SIZE)
+
+    def __str__(self):
+        return "FleetPlanner with {} planned moves".format(len(self.moves))
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def _paths_collide(ship, velocity_x, velocity_y, other, other_velocity, distance):
+    """
+    Check whether two ships moving in straight lines at constant velocity during the turn come within distance of
+    each other.
+
+    :rtype: bool
+    """
+    dx = ship.x - other.x
+    dy = ship.y - other.y
+    dvx = velocity_x - other_velocity[0]
+    dvy = velocity_y - other_velocity[1]
+    relative_speed = dvx ** 2 + dvy ** 2
+    t = 0.0 if relative_speed == 0 else min(max(-(dx * dvx + dy * dvy) / relative_speed, 0.0), 1.0)
+    return (dx + dvx * t) ** 2 + (dy + dvy * t) ** 2 <= distance ** 2
+
+
+def resolve_commands(game_map, command_queue, deadline=None, max_corrections=45, angular_step=1):
+    """
+    Resolve the conflicts between the thrust commands of the player's ships (e.g. produced by Ship.navigate with
+    ignore_ships=True), in the order they are given. Other commands are kept as they are, and their ships stay put.
+    Once the deadline passes, the remaining conflicting moves are dropped rather than corrected.
+
+    :param game_map.Map game_map: The map of the current turn
+    :param list[str] command_queue: The commands of the turn
+    :param deadline.TurnDeadline deadline: The time left in the turn (optional)
+    :param int max_corrections: The number of alternative headings to try on either side of a conflicting move
+    :param int angular_step: The degree difference between alternative headings
+    :return: The commands with the thrusts replaced by conflict-free ones
+    :rtype: list[str]
+    """
+    planner = FleetPlanner(game_map, max_corrections, angular_step)
+    me = game_map.get_me()
+    commands = []
+    for command in command_queue:
+        tokens = command.split()
+        if tokens[0] != "t":
+            commands.append(command)
+            continue
+        ship = me.get_ship(int(tokens[1]))
+        planner.plan(ship, int(tokens[2]), int(tokens[3]), search=deadline is None or not deadline.expired())
+    return commands + planner.commands()
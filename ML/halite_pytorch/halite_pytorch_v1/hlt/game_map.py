@@ -1,4 +1,7 @@
-from . import collision, entity
+import math
+
+from . import approach, collision, constants, entity
+from .spatial import SpatialIndex
 
 
 class Map:
@@ -8,19 +11,31 @@ class Map:
     :ivar my_id: Current player id associated with the map
     :ivar width: Map width
     :ivar height: Map height
+    :ivar incremental: Whether each frame updates the previous frame's objects in place
+    :ivar lazy: Whether a player's ships are only parsed once they are accessed
+    :ivar delta: The changes since the previous frame (MapDelta) if incremental, else None
     """
 
-    def __init__(self, my_id, width, height):
+    def __init__(self, my_id, width, height, incremental=False, lazy=False):
         """
         :param my_id: User's id (tag)
         :param width: Map width
         :param height: Map height
+        :param incremental: Reuse Player, Ship and Planet objects across frames and record a MapDelta
+        :param lazy: Only parse a player's ships the first time they are accessed
         """
+        if incremental and lazy:
+            raise ValueError("A map cannot be both incremental and lazy")
         self.my_id = my_id
         self.width = width
         self.height = height
+        self.incremental = incremental
+        self.lazy = lazy
+        self.delta = None
         self._players = {}
         self._planets = {}
+        self._cache = {}  # Collections and views derived from the current frame, cleared by _parse
+        self._static = {}  # Geometry of the planets, which never move, kept for the whole game
 
     def get_me(self):
         """
@@ -39,10 +54,13 @@ class Map:
 
     def all_players(self):
         """
-        :return: List of all players
-        :rtype: list[Player]
+        :return: All players, shared by every call until the next frame is parsed
+        :rtype: tuple[Player]
         """
-        return list(self._players.values())
+        players = self._cache.get('players')
+        if players is None:
+            players = self._cache['players'] = tuple(self._players.values())
+        return players
 
     def get_planet(self, planet_id):
         """
@@ -54,32 +72,233 @@ class Map:
 
     def all_planets(self):
         """
-        :return: List of all planets
-        :rtype: list[entity.Planet]
+        :return: All planets, shared by every call until the next frame is parsed
+        :rtype: tuple[entity.Planet]
+        """
+        planets = self._cache.get('planets')
+        if planets is None:
+            planets = self._cache['planets'] = tuple(self._planets.values())
+        return planets
+
+    def columnar(self):
+        """
+        Struct-of-arrays view of the current frame, built on first use and cached until the next frame is parsed.
+        Requires NumPy.
+
+        :return: NumPy arrays of all ship and planet attributes
+        :rtype: columnar.ColumnarView
+        """
+        view = self._cache.get('columnar')
+        if view is None:
+            from .columnar import ColumnarView
+            view = self._cache['columnar'] = ColumnarView(self._all_ships(), self.all_planets())
+        return view
+
+    def distances(self):
+        """
+        Distance and angle matrices between all ships and planets of the current frame, built on first use and
+        cached until the next frame is parsed. While they exist, nearby_entities_by_distance reads from them.
+        Requires NumPy.
+
+        :return: The distance matrices of the frame
+        :rtype: distances.DistanceMatrices
+        """
+        matrices = self._cache.get('distances')
+        if matrices is None:
+            from .distances import DistanceMatrices
+            matrices = self._cache['distances'] = DistanceMatrices(self.columnar())
+        return matrices
+
+    def spatial_index(self):
+        """
+        Grid index over all planets and ships of the current frame, built on first use and cached until the next
+        frame is parsed.
+
+        :return: The spatial index of the frame
+        :rtype: spatial.SpatialIndex
+        """
+        index = self._cache.get('spatial')
+        if index is None:
+            index = self._cache['spatial'] = SpatialIndex(self._all_entities())
+        return index
+
+    def approaches(self):
+        """
+        Approach points and dock rings of all planets, built on first use and kept for the whole game. Game builds
+        them from the initial map if asked to (approaches=True), while the bot still has the initialization time.
+
+        :return: The approach geometry of the planets
+        :rtype: approach.PlanetApproaches
+        """
+        approaches = self._static.get('approaches')
+        if approaches is None:
+            approaches = self._static['approaches'] = approach.PlanetApproaches(self.all_planets(), self.width,
+                                                                                self.height)
+        return approaches
+
+    def visibility_graph(self):
+        """
+        Graph of the paths around the planets, built from the approach points on first use and kept for the whole
+        game. Requires NumPy.
+
+        :return: The visibility graph of the planets
+        :rtype: pathfinding.VisibilityGraph
+        """
+        graph = self._static.get('visibility')
+        if graph is None:
+            from .pathfinding import VisibilityGraph
+            graph = self._static['visibility'] = VisibilityGraph(self.approaches())
+        return graph
+
+    def next_waypoint(self, ship, target):
         """
-        return list(self._planets.values())
+        Find where a ship should fly now to reach the target around the planets over the next turns, i.e. the target
+        itself if no planet is in the way, else the first waypoint of the shortest path in the visibility graph. The
+        waypoints are cached until the next frame is parsed, for all ships in the same cell and the same target.
+        Requires NumPy.
 
-    def nearby_entities_by_distance(self, entity):
+        :param entity.Ship ship: The ship
+        :param entity.Entity target: The position to reach
+        :return: The entity to fly to this turn, or None if there is no path
+        :rtype: entity.Entity
+        """
+        cache = self._cache.get('waypoints')
+        if cache is None:
+            cache = self._cache['waypoints'] = {}
+        return self.visibility_graph().next_waypoint(ship, target, cache)
+
+    def snapshot(self):
+        """
+        Freeze the current frame, e.g. as the initial map or to compare the next turn against. A frame parsed from
+        scratch is never modified afterwards (the next frame gets new objects), so the snapshot shares its players,
+        ships, planets and cached collections. An incremental map updates its objects in place, so they are copied.
+
+        :return: A read-only map of the current frame
+        :rtype: MapSnapshot
+        """
+        return MapSnapshot(self)
+
+    def nearby_entities_by_distance(self, entity, max_distance=None):
         """
         :param entity: The source entity to find distances from
+        :param float max_distance: Only include entities within this distance (optional, defaults to all entities)
         :return: Dict containing all entities with their designated distances
         :rtype: dict
         """
         result = {}
-        for foreign_entity in self._all_ships() + self.all_planets():
+        matrices = self._cache.get('distances')
+        row = None if matrices is None else matrices.view.ship_rows.get(entity.id)
+        if row is not None and matrices.view.ships[row] is entity:
+            # A ship of this frame, whose distances to all planets and ships are already computed
+            entities = self._all_entities()
+            distances = matrices.ship_planet[row].tolist() + matrices.ship_ship[row].tolist()
+            for foreign_entity, distance in zip(entities, distances):
+                if foreign_entity is not entity and (max_distance is None or distance <= max_distance):
+                    result.setdefault(distance, []).append(foreign_entity)
+            return result
+        if max_distance is None:
+            entities = self._all_entities()
+        else:
+            entities = self.spatial_index().query_radius(entity, max_distance)
+        for foreign_entity in entities:
             if entity == foreign_entity:
                 continue
-            result.setdefault(entity.calculate_distance_between(foreign_entity), []).append(foreign_entity)
+            distance = entity.calculate_distance_between(foreign_entity)
+            if max_distance is None or distance <= max_distance:
+                result.setdefault(distance, []).append(foreign_entity)
         return result
 
+    def nearest_ships(self, source, k=1, owner=None, enemy_of=None, docking_status=None, max_distance=None):
+        """
+        Find the ships closest to an entity through the spatial index, looking only at the part of the map needed.
+
+        :param entity.Entity source: The entity to search from (not included in the result)
+        :param int k: How many ships to find
+        :param int owner: Only include ships of the player with this id (optional)
+        :param int enemy_of: Only include ships not of the player with this id, e.g. game_map.my_id (optional)
+        :param docking_status: Only include ships with this entity.Ship.DockingStatus, or any of a tuple of them
+            (optional)
+        :param float max_distance: Only include ships within this distance (optional)
+        :return: Up to k ships, nearest first
+        :rtype: list[entity.Ship]
+        """
+        predicate = _entity_filter(entity.Ship, owner, enemy_of, docking_status)
+        return self.spatial_index().nearest(source, k, predicate, max_distance)
+
+    def nearest_planets(self, source, k=1, owner=None, enemy_of=None, max_distance=None):
+        """
+        Find the planets closest to an entity, by the distance between the centers.
+
+        :param entity.Entity source: The entity to search from (not included in the result)
+        :param int k: How many planets to find
+        :param int owner: Only include planets owned by the player with this id (optional)
+        :param int enemy_of: Only include planets not owned by the player with this id, including free ones (optional)
+        :param float max_distance: Only include planets within this distance (optional)
+        :return: Up to k planets, nearest first
+        :rtype: list[entity.Planet]
+        """
+        predicate = _entity_filter(entity.Planet, owner, enemy_of, None)
+        return self.spatial_index().nearest(source, k, predicate, max_distance)
+
+    def ships_within(self, source, distance, owner=None, enemy_of=None, docking_status=None):
+        """
+        Find the ships whose edge is within distance of an entity's edge, which is how the game measures weapon,
+        explosion and docking ranges.
+
+        :param entity.Entity source: The entity to search around (not included in the result)
+        :param float distance: The distance between the edges
+        :param int owner: Only include ships of the player with this id (optional)
+        :param int enemy_of: Only include ships not of the player with this id (optional)
+        :param docking_status: Only include ships with this entity.Ship.DockingStatus, or any of a tuple of them
+            (optional)
+        :return: The ships in range, nearest first
+        :rtype: list[entity.Ship]
+        """
+        predicate = _entity_filter(entity.Ship, owner, enemy_of, docking_status)
+        return self.spatial_index().within(source, distance, predicate)
+
+    def enemies_in_weapon_range(self, ship, docking_status=None):
+        """
+        :param entity.Ship ship: The ship
+        :param docking_status: Only include ships with this entity.Ship.DockingStatus, or any of a tuple of them
+            (optional)
+        :return: The enemy ships this ship can fire at, and which can fire at it unless docked, nearest first
+        :rtype: list[entity.Ship]
+        """
+        return self.ships_within(ship, constants.WEAPON_RADIUS, enemy_of=ship.owner.id, docking_status=docking_status)
+
+    def ships_in_explosion_range(self, planet, owner=None, enemy_of=None):
+        """
+        :param entity.Planet planet: The planet
+        :param int owner: Only include ships of the player with this id (optional)
+        :param int enemy_of: Only include ships not of the player with this id (optional)
+        :return: The ships which take damage if the planet is destroyed, nearest first
+        :rtype: list[entity.Ship]
+        """
+        return self.ships_within(planet, constants.EXPLOSION_RADIUS, owner, enemy_of)
+
+    def ships_in_dock_range(self, planet, owner=None, enemy_of=None, docking_status=None):
+        """
+        :param entity.Planet planet: The planet
+        :param int owner: Only include ships of the player with this id (optional)
+        :param int enemy_of: Only include ships not of the player with this id (optional)
+        :param docking_status: Only include ships with this entity.Ship.DockingStatus, or any of a tuple of them
+            (optional)
+        :return: The ships close enough to dock to the planet (see Ship.can_dock), nearest first
+        :rtype: list[entity.Ship]
+        """
+        return self.ships_within(planet, constants.DOCK_RADIUS, owner, enemy_of, docking_status)
+
     def _link(self):
         """
         Updates all the entities with the correct ship and planet objects
 
         :return:
         """
-        for celestial_object in self.all_planets() + self._all_ships():
-            celestial_object._link(self._players, self._planets)
+        for planet in self.all_planets():
+            planet._link(self._players, self._planets)
+        for player in self.all_players():
+            player._link(self._players, self._planets)
 
     def _parse(self, map_string):
         """
@@ -89,24 +308,67 @@ class Map:
         :return: nothing
         """
         tokens = map_string.split()
+        self._cache.clear()
 
-        self._players, tokens = Player._parse(tokens)
-        self._planets, tokens = entity.Planet._parse(tokens)
+        if self.incremental:
+            self._parse_incremental(tokens)
+            return
 
-        assert(len(tokens) == 0)  # There should be no remaining tokens at this point
+        if self.lazy:
+            self._players, index = Player._parse_lazy(tokens, 0)
+        else:
+            self._players, index = Player._parse(tokens, 0)
+        self._planets, index = entity.Planet._parse(tokens, index)
+
+        assert(index == len(tokens))  # There should be no remaining tokens at this point
         self._link()
 
+    def _parse_incremental(self, tokens):
+        """
+        Update the map in place from the tokenized game description. Surviving ships and planets keep their
+        objects, only new ships are created, and the changes are recorded in self.delta.
+
+        :param list[str] tokens: The tokenized input from the Halite engine
+        :return: nothing
+        """
+        delta = MapDelta()
+        self._players, index = Player._parse_incremental(self._players, tokens, 0, delta)
+        self._planets, index = entity.Planet._parse_incremental(self._planets, tokens, index, delta)
+
+        assert(index == len(tokens))  # There should be no remaining tokens at this point
+
+        # Surviving ships still point at their owner and planet objects, which are reused as well.
+        for ship in delta.spawned_ships:
+            ship._link(self._players, self._planets)
+        for ship in delta.docking_changed_ships:
+            ship.planet = self._planets.get(ship.planet)
+        for planet in self.all_planets():
+            planet._link(self._players, self._planets)
+        self.delta = delta
+
     def _all_ships(self):
         """
         Helper function to extract all ships from all players
 
-        :return: List of ships
-        :rtype: List[Ship]
+        :return: All ships, shared by every call until the next frame is parsed
+        :rtype: tuple[entity.Ship]
         """
-        all_ships = []
-        for player in self.all_players():
-            all_ships.extend(player.all_ships())
-        return all_ships
+        ships = self._cache.get('ships')
+        if ships is None:
+            ships = self._cache['ships'] = tuple(ship for player in self.all_players() for ship in player.all_ships())
+        return ships
+
+    def _all_entities(self):
+        """
+        Helper function to collect all planets and ships, the obstacles of a straight-line path
+
+        :return: All planets followed by all ships, shared by every call until the next frame is parsed
+        :rtype: tuple[entity.Entity]
+        """
+        entities = self._cache.get('entities')
+        if entities is None:
+            entities = self._cache['entities'] = self.all_planets() + self._all_ships()
+        return entities
 
     def _intersects_entity(self, target):
         """
@@ -116,17 +378,118 @@ class Map:
         :return: The colliding entity if so, else None.
         :rtype: entity.Entity
         """
-        for celestial_object in self._all_ships() + self.all_planets():
+        for celestial_object in self.spatial_index().query_radius(target, target.radius + 0.1):
             if celestial_object is target:
                 continue
-            d = celestial_object.calculate_distance_between(target)
-            if d <= celestial_object.radius + target.radius + 0.1:
+            dx = celestial_object.x - target.x
+            dy = celestial_object.y - target.y
+            reach = celestial_object.radius + target.radius + 0.1
+            if dx * dx + dy * dy <= reach * reach:
                 return celestial_object
         return None
 
+    def _obstacles_around(self, ship, target, distance, ignore=()):
+        """
+        Collect the entities which may block a straight move of the given ship of up to distance in any direction.
+
+        :param entity.Ship ship: The moving ship
+        :param entity.Entity target: The ship's target, which is not an obstacle
+        :param float distance: The length of the move
+        :param entity.Entity ignore: Which entity type to ignore
+        :return: The entities near the ship, other than the ship and target
+        :rtype: list[entity.Entity]
+        """
+        if issubclass(entity.Ship, ignore):
+            entities = () if issubclass(entity.Planet, ignore) else self.all_planets()
+        else:
+            entities = self.spatial_index().query_radius(ship, distance + ship.radius + 0.1)
+        return [foreign_entity for foreign_entity in entities if foreign_entity is not ship
+                and foreign_entity is not target and not isinstance(foreign_entity, ignore)]
+
+    def _obstacle_candidates(self, ship, target, fudge, ignore):
+        """
+        Collect the entities whose bounding box overlaps the bounding box of the path from ship to target grown by
+        fudge, other than the ship and target. Only these can be obstacles.
+
+        :return: The candidate obstacles
+        :rtype: list[entity.Entity]
+        """
+        if not issubclass(entity.Ship, ignore):
+            return [foreign_entity for foreign_entity in self.spatial_index().query_segment(ship, target, fudge)
+                    if foreign_entity is not ship and foreign_entity is not target
+                    and not isinstance(foreign_entity, ignore)]
+        if issubclass(entity.Planet, ignore):
+            return []
+        # Planets are few, and a lazy map would have to parse the ships to index them
+        x_min = min(ship.x, target.x) - fudge
+        x_max = max(ship.x, target.x) + fudge
+        y_min = min(ship.y, target.y) - fudge
+        y_max = max(ship.y, target.y) + fudge
+        return [planet for planet in self.all_planets() if planet is not target
+                and planet.x + planet.radius >= x_min and planet.x - planet.radius <= x_max
+                and planet.y + planet.radius >= y_min and planet.y - planet.radius <= y_max]
+
+    def any_obstacle_between(self, ship, target, ignore=()):
+        """
+        Check whether anything is in the way of a straight-line path to the given point, stopping at the first
+        obstacle found. The cheapest of the obstacle queries, enough to decide whether a move needs correcting.
+
+        :param entity.Ship ship: Source entity
+        :param entity.Entity target: Target entity
+        :param entity.Entity ignore: Which entity type to ignore
+        :return: Whether there is an obstacle between the ship and target
+        :rtype: bool
+        """
+        fudge = ship.radius + 0.1
+        if issubclass(entity.Ship, ignore):
+            return any(collision.intersect_segment_circle(ship, target, planet, fudge=fudge)
+                       for planet in self._obstacle_candidates(ship, target, fudge, ignore))
+
+        def blocks(foreign_entity):
+            return foreign_entity is not ship and foreign_entity is not target \
+                and not isinstance(foreign_entity, ignore) \
+                and collision.intersect_segment_circle(ship, target, foreign_entity, fudge=fudge)
+        return self.spatial_index().first(min(ship.x, target.x) - fudge, min(ship.y, target.y) - fudge,
+                                          max(ship.x, target.x) + fudge, max(ship.y, target.y) + fudge,
+                                          blocks) is not None
+
+    def first_obstacle_between(self, ship, target, ignore=()):
+        """
+        Find the obstacle a ship flying straight to the given point would run into first. Candidates are tested
+        nearest first, and the search stops once no remaining candidate can be reached before the obstacle found.
+
+        :param entity.Ship ship: Source entity
+        :param entity.Entity target: Target entity
+        :param entity.Entity ignore: Which entity type to ignore
+        :return: The first obstacle between the ship and target, or None if the path is clear
+        :rtype: entity.Entity
+        """
+        fudge = ship.radius + 0.1
+        length = ship.calculate_distance_between(target)
+        candidates = []
+        for foreign_entity in self._obstacle_candidates(ship, target, fudge, ignore):
+            dx = foreign_entity.x - ship.x
+            dy = foreign_entity.y - ship.y
+            # The path cannot enter the grown circle before the distance between the ship and its edge
+            closest = math.sqrt(dx * dx + dy * dy) - foreign_entity.radius - fudge
+            candidates.append((closest, len(candidates), foreign_entity))
+        candidates.sort()
+
+        first = None
+        first_distance = math.inf
+        for closest, _, foreign_entity in candidates:
+            if closest > first_distance:
+                break
+            entry = collision.segment_circle_entry(ship, target, foreign_entity, fudge=fudge)
+            if entry is not None and entry * length < first_distance:
+                first = foreign_entity
+                first_distance = entry * length
+        return first
+
     def obstacles_between(self, ship, target, ignore=()):
         """
         Check whether there is a straight-line path to the given point, without planetary obstacles in between.
+        Ship.navigate only needs to know whether there is any obstacle, see any_obstacle_between.
 
         :param entity.Ship ship: Source entity
         :param entity.Entity target: Target entity
@@ -134,15 +497,28 @@ class Map:
         :return: The list of obstacles between the ship and target
         :rtype: list[entity.Entity]
         """
-        obstacles = []
-        entities = ([] if issubclass(entity.Planet, ignore) else self.all_planets()) \
-            + ([] if issubclass(entity.Ship, ignore) else self._all_ships())
-        for foreign_entity in entities:
-            if foreign_entity == ship or foreign_entity == target:
-                continue
-            if collision.intersect_segment_circle(ship, target, foreign_entity, fudge=ship.radius + 0.1):
-                obstacles.append(foreign_entity)
-        return obstacles
+        fudge = ship.radius + 0.1
+        return [foreign_entity for foreign_entity in self._obstacle_candidates(ship, target, fudge, ignore)
+                if collision.intersect_segment_circle(ship, target, foreign_entity, fudge=fudge)]
+
+
+def _entity_filter(kind, owner, enemy_of, docking_status):
+    """
+    :return: A predicate selecting the entities of the given class, owner and docking status for the spatial index
+    """
+    if isinstance(docking_status, entity.Ship.DockingStatus):
+        docking_status = (docking_status,)
+
+    def predicate(candidate):
+        if not isinstance(candidate, kind):
+            return False
+        owner_id = None if candidate.owner is None else candidate.owner.id
+        if owner is not None and owner_id != owner:
+            return False
+        if enemy_of is not None and owner_id == enemy_of:
+            return False
+        return docking_status is None or candidate.docking_status in docking_status
+    return predicate
 
 
 class Player:
@@ -156,13 +532,16 @@ class Player:
         """
         self.id = player_id
         self._ships = ships
+        self._ship_tuple = None
 
     def all_ships(self):
         """
-        :return: A list of all ships which belong to the user
-        :rtype: list[entity.Ship]
+        :return: All ships which belong to the user, shared by every call until the next frame is parsed
+        :rtype: tuple[entity.Ship]
         """
-        return list(self._ships.values())
+        if self._ship_tuple is None:
+            self._ship_tuple = tuple(self._ships.values())
+        return self._ship_tuple
 
     def get_ship(self, ship_id):
         """
@@ -172,41 +551,230 @@ class Player:
         """
         return self._ships.get(ship_id)
 
+    def _copy(self):
+        """
+        Copy the player and its ships, which are unlinked until the player is linked.
+
+        :return: The unlinked copy
+        :rtype: Player
+        """
+        return Player(self.id, {ship_id: ship._copy() for ship_id, ship in self._ships.items()})
+
+    def _link(self, players, planets):
+        """
+        Link all the player's ships with their owner and planet objects.
+
+        :param dict[int, Player] players: A dictionary of player objects keyed by id
+        :param dict[int, entity.Planet] planets: A dictionary of planet objects keyed by id
+        :return: nothing
+        """
+        for ship in self._ships.values():
+            ship._link(players, planets)
+
     @staticmethod
-    def _parse_single(tokens):
+    def _parse_single(tokens, index):
         """
         Parse one user given an input string from the Halite engine.
 
         :param list[str] tokens: The input string as a list of str from the Halite engine.
-        :return: The parsed player id, player object, and remaining tokens
-        :rtype: (int, Player, list[str])
+        :param int index: The position of the player's first token
+        :return: The parsed player id, player object, and the position of the next unused token
+        :rtype: (int, Player, int)
         """
-        player_id, *remainder = tokens
-        player_id = int(player_id)
-        ships, remainder = entity.Ship._parse(player_id, remainder)
+        player_id = int(tokens[index])
+        ships, index = entity.Ship._parse(player_id, tokens, index + 1)
         player = Player(player_id, ships)
-        return player_id, player, remainder
+        return player_id, player, index
 
     @staticmethod
-    def _parse(tokens):
+    def _parse(tokens, index):
         """
         Parse an entire user input string from the Halite engine for all users.
 
         :param list[str] tokens: The input string as a list of str from the Halite engine.
-        :return: The parsed players in the form of player dict, and remaining tokens
-        :rtype: (dict, list[str])
+        :param int index: The position of the player count token
+        :return: The parsed players in the form of player dict, and the position of the next unused token
+        :rtype: (dict, int)
+        """
+        num_players = int(tokens[index])
+        index += 1
+        players = {}
+
+        for _ in range(num_players):
+            player, players[player], index = Player._parse_single(tokens, index)
+
+        return players, index
+
+    @staticmethod
+    def _parse_lazy(tokens, index):
+        """
+        Split the user input string from the Halite engine into one segment per user, without parsing any ships.
+
+        :param list[str] tokens: The input string as a list of str from the Halite engine.
+        :param int index: The position of the player count token
+        :return: The players (LazyPlayer) in the form of player dict, and the position of the next unused token
+        :rtype: (dict, int)
         """
-        num_players, *remainder = tokens
-        num_players = int(num_players)
+        num_players = int(tokens[index])
+        index += 1
         players = {}
 
         for _ in range(num_players):
-            player, players[player], remainder = Player._parse_single(remainder)
+            player_id = int(tokens[index])
+            players[player_id] = LazyPlayer(player_id, tokens, index + 1)
+            index += 2 + 10 * int(tokens[index + 1])
+
+        return players, index
+
+    @staticmethod
+    def _parse_incremental(players, tokens, index, delta):
+        """
+        Parse the user input string for all users, updating the players of the previous frame in place.
+
+        :param dict[int, Player] players: The players of the previous frame, keyed by id
+        :param list[str] tokens: The input string as a list of str from the Halite engine.
+        :param int index: The position of the player count token
+        :param MapDelta delta: Collects the changes to the players' ships
+        :return: The parsed players in the form of player dict, and the position of the next unused token
+        :rtype: (dict, int)
+        """
+        num_players = int(tokens[index])
+        index += 1
+        updated = {}
+
+        for _ in range(num_players):
+            player_id = int(tokens[index])
+            player = players.get(player_id)
+            if player is None:
+                player = Player(player_id, {})
+            player._ships, index = entity.Ship._parse_incremental(player_id, player._ships, tokens, index + 1, delta)
+            player._ship_tuple = None
+            updated[player_id] = player
 
-        return players, remainder
+        return updated, index
 
     def __str__(self):
         return "Player {} with ships {}".format(self.id, self.all_ships())
 
     def __repr__(self):
         return self.__str__()
+
+
+class LazyPlayer(Player):
+    """
+    A player whose ships are parsed from its segment of the frame the first time they are accessed.
+
+    :ivar id: The player's unique id
+    """
+    def __init__(self, player_id, tokens, index):
+        """
+        :param player_id: User's id
+        :param list[str] tokens: The tokenized frame
+        :param int index: The position of the player's ship count token
+        """
+        super().__init__(player_id, None)
+        self._tokens = tokens
+        self._index = index
+        self._players = None
+        self._planets = None
+
+    def all_ships(self):
+        """
+        :return: All ships which belong to the user, shared by every call until the next frame is parsed
+        :rtype: tuple[entity.Ship]
+        """
+        self._load()
+        return super().all_ships()
+
+    def get_ship(self, ship_id):
+        """
+        :param int ship_id: The ship id of the desired ship.
+        :return: The ship designated by ship_id belonging to this user.
+        :rtype: entity.Ship
+        """
+        self._load()
+        return super().get_ship(ship_id)
+
+    def _link(self, players, planets):
+        """
+        Remember the player and planet objects to link the ships with once they are parsed.
+
+        :param dict[int, Player] players: A dictionary of player objects keyed by id
+        :param dict[int, entity.Planet] planets: A dictionary of planet objects keyed by id
+        :return: nothing
+        """
+        self._players = players
+        self._planets = planets
+
+    def _load(self):
+        """
+        Parse and link the ships, if that has not happened yet.
+
+        :return: nothing
+        """
+        if self._ships is None:
+            self._ships, _ = entity.Ship._parse(self.id, self._tokens, self._index)
+            self._tokens = None
+            super()._link(self._players, self._planets)
+
+
+class MapSnapshot(Map):
+    """
+    A read-only copy of one frame of a map (see Map.snapshot). It answers the same queries as the map it was taken
+    from, but cannot be updated.
+
+    :ivar my_id: Current player id associated with the map
+    :ivar width: Map width
+    :ivar height: Map height
+    """
+
+    def __init__(self, game_map):
+        """
+        :param Map game_map: The map whose current frame is frozen
+        """
+        super().__init__(game_map.my_id, game_map.width, game_map.height, lazy=game_map.lazy)
+        self._static = game_map._static  # Same game, same planet geometry
+        if game_map.incremental:
+            self._players = {player_id: player._copy() for player_id, player in game_map._players.items()}
+            self._planets = {planet_id: planet._copy() for planet_id, planet in game_map._planets.items()}
+            self._link()
+        else:
+            self._players = game_map._players
+            self._planets = game_map._planets
+            self._cache = dict(game_map._cache)
+
+    def snapshot(self):
+        """
+        :return: This snapshot, which is already read-only
+        :rtype: MapSnapshot
+        """
+        return self
+
+    def _parse(self, map_string):
+        raise TypeError("A map snapshot cannot be updated")
+
+
+class MapDelta:
+    """
+    The changes between two consecutive frames of an incrementally updated map.
+
+    :ivar spawned_ships: Ships which appeared in this frame
+    :ivar died_ships: Ships which were in the previous frame but not in this one (as they were last seen)
+    :ivar moved_ships: Surviving ships whose position changed
+    :ivar docking_changed_ships: Surviving ships whose docking status changed
+    :ivar destroyed_planets: Planets which were in the previous frame but not in this one
+    """
+    def __init__(self):
+        self.spawned_ships = []
+        self.died_ships = []
+        self.moved_ships = []
+        self.docking_changed_ships = []
+        self.destroyed_planets = []
+
+    def __str__(self):
+        return "MapDelta with {} spawned, {} died, {} moved and {} docking changed ships, {} destroyed planets"\
+            .format(len(self.spawned_ships), len(self.died_ships), len(self.moved_ships),
+                    len(self.docking_changed_ships), len(self.destroyed_planets))
+
+    def __repr__(self):
+        return self.__str__()
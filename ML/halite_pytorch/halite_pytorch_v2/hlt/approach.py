@@ -0,0 +1,132 @@
+import math
+
+from . import constants, entity
+
+DEFAULT_RESOLUTION = 1
+
+
+class PlanetApproaches:
+    """
+    Approach geometry of the planets, which never move: for each planet, the distance within which ships can dock
+    (its dock ring) and a ring of approach points around it, one every resolution degrees as seen from the planet's
+    center, at the distance Entity.closest_point_to keeps. Approach points which lie inside another planet or too
+    close to the map border are left out. Build it through Map.approaches(), which keeps it for the whole game.
+
+    The geometry is computed from the planets present when it is built (normally the initial map), so approach points
+    next to a planet which has since been destroyed stay left out.
+
+    :ivar planets: The planets the geometry was built from
+    :ivar resolution: The angle between neighboring approach points of a planet, in degrees
+    :ivar min_distance: The distance of the approach points from the planets' surface
+    """
+
+    def __init__(self, planets, width, height, min_distance=3, resolution=DEFAULT_RESOLUTION, margin=0.1):
+        """
+        :param list[entity.Planet] planets: The planets of the map
+        :param float width: Map width
+        :param float height: Map height
+        :param float min_distance: The distance of the approach points from the planets' surface
+        :param int resolution: The angle between neighboring approach points of a planet, in degrees; divides 360
+        :param float margin: Additional distance to keep between approach points and obstacles
+        """
+        if 360 % resolution:
+            raise ValueError("The resolution must divide 360 degrees, not {}".format(resolution))
+        self.planets = tuple(planets)
+        self.resolution = resolution
+        self.min_distance = min_distance
+        self._count = 360 // resolution
+        self._points_per_radian = self._count / (2 * math.pi)
+        self._rings = {}  # planet id: (center x, center y, ring radius, approach points, nearest free points)
+        self._dock_distances = {}
+        clearance = constants.SHIP_RADIUS + margin
+        for planet in planets:
+            ring = planet.radius + min_distance
+            neighbors = [(other.x, other.y, (other.radius + clearance) ** 2) for other in planets
+                         if other is not planet
+                         and planet.calculate_distance_between(other) < ring + other.radius + clearance]
+            points = []
+            for index in range(self._count):
+                angle = math.radians(index * resolution)
+                x = planet.x + ring * math.cos(angle)
+                y = planet.y + ring * math.sin(angle)
+                free = clearance <= x <= width - clearance and clearance <= y <= height - clearance \
+                    and all((x - other_x) ** 2 + (y - other_y) ** 2 > reach for other_x, other_y, reach in neighbors)
+                points.append(entity.Position(x, y) if free else None)
+            # The lookup table of closest_approach: the nearest free point for every direction
+            nearest = tuple(point if point is not None else self._nearest_free(points, index, self._count // 2)
+                            for index, point in enumerate(points))
+            self._rings[planet.id] = (planet.x, planet.y, ring, tuple(points), nearest)
+            self._dock_distances[planet.id] = planet.radius + constants.DOCK_RADIUS + constants.SHIP_RADIUS
+
+    def dock_distance(self, planet):
+        """
+        :param entity.Planet planet: The planet
+        :return: The distance from the planet's center within which a ship can dock to it (see Ship.can_dock)
+        :rtype: float
+        """
+        return self._dock_distances[planet.id]
+
+    def approach_points(self, planet):
+        """
+        :param entity.Planet planet: The planet
+        :return: The approach points around the planet counterclockwise from angle 0, None where a point is blocked
+        :rtype: tuple[entity.Position]
+        """
+        return self._rings[planet.id][3]
+
+    def closest_approach(self, ship, planet):
+        """
+        Look up the free approach point of the planet closest to the ship, i.e. Entity.closest_point_to rounded to
+        the approach points and moved past any other planet in the way.
+
+        :param entity.Entity ship: The ship (or any other entity) approaching the planet
+        :param entity.Planet planet: The planet
+        :return: The approach point, or None if all of the planet's approach points are blocked
+        :rtype: entity.Position
+        """
+        x, y, _, _, nearest = self._rings[planet.id]
+        return nearest[round(math.atan2(ship.y - y, ship.x - x) * self._points_per_radian) % self._count]
+
+    def tangent_approaches(self, ship, planet):
+        """
+        Look up the approach points where the lines from the ship just touching the planet's ring of approach points
+        meet it, rounded towards the ship so that the straight path to either clears the planet. These are the
+        waypoints for going around the planet on the left and on the right.
+
+        :param entity.Entity ship: The ship (or any other entity) going around the planet
+        :param entity.Planet planet: The planet
+        :return: The tangent points counterclockwise and clockwise around the planet from the ship's side, or None if
+            the ship is within the ring. A point is None if the part of the ring visible from the ship is blocked on
+            that side.
+        :rtype: (entity.Position, entity.Position)
+        """
+        x, y, ring, points, _ = self._rings[planet.id]
+        distance = math.sqrt((ship.x - x) ** 2 + (ship.y - y) ** 2)
+        if distance <= ring:
+            return None
+        angle = math.atan2(ship.y - y, ship.x - x) * self._points_per_radian
+        spread = math.acos(ring / distance) * self._points_per_radian
+        # Search from each tangent towards the ship, over the part of the ring visible from the ship
+        limit = int(math.floor(spread))
+        return (self._nearest_free(points, int(math.floor(angle + spread)), limit, -1),
+                self._nearest_free(points, int(math.ceil(angle - spread)), limit, 1))
+
+    def _nearest_free(self, points, index, limit, direction=0):
+        """
+        Find the free approach point closest to the given index, at most limit points away, only searching in the
+        given direction if it is non-zero.
+
+        :rtype: entity.Position
+        """
+        for offset in range(limit + 1):
+            for step in ((offset, -offset) if direction == 0 else (direction * offset,)):
+                point = points[(index + step) % self._count]
+                if point is not None:
+                    return point
+        return None
+
+    def __str__(self):
+        return "PlanetApproaches of {} planets every {} degrees".format(len(self._rings), self.resolution)
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,146 @@
+import heapq
+import math
+
+import numpy as np
+
+from . import collision, constants
+
+DEFAULT_NODE_SPACING = 20
+WAYPOINT_CELL_SIZE = 1.0
+
+
+class VisibilityGraph:
+    """
+    Graph for finding paths around the planets over several turns. Its nodes are approach points around every planet
+    (see PlanetApproaches), one every node_spacing degrees, and two nodes are connected if a ship can fly in a straight
+    line between them without touching a planet. A query connects the start and the target to the nodes they can
+    see and runs A* from one to the other. Build it through Map.visibility_graph(), which keeps it for the whole game.
+    Requires NumPy.
+
+    Like the approach points, the graph is built from the initial planets, and a planet which is destroyed later
+    still blocks the paths through it. Ships are not part of the graph: Ship.navigate avoids them on the way to the
+    next waypoint.
+
+    :ivar nodes: The node positions
+    """
+
+    def __init__(self, approaches, node_spacing=DEFAULT_NODE_SPACING, margin=0.1):
+        """
+        :param approach.PlanetApproaches approaches: The approach points of the planets
+        :param int node_spacing: The angle between neighboring nodes around a planet, in degrees
+        :param float margin: Additional distance to keep between the paths and the planets
+        """
+        step = max(1, node_spacing // approaches.resolution)
+        self.nodes = tuple(point for planet in approaches.planets
+                           for point in approaches.approach_points(planet)[::step] if point is not None)
+        self._fudge = constants.SHIP_RADIUS + margin
+        self._x = np.array([node.x for node in self.nodes], dtype=np.float64)
+        self._y = np.array([node.y for node in self.nodes], dtype=np.float64)
+        self._planet_x = np.array([planet.x for planet in approaches.planets], dtype=np.float64)
+        self._planet_y = np.array([planet.y for planet in approaches.planets], dtype=np.float64)
+        self._planet_radius = np.array([planet.radius for planet in approaches.planets], dtype=np.float64)
+
+        # Adjacency lists of (node, distance), from testing each node against all later ones at once
+        self._neighbors = [[] for _ in self.nodes]
+        for node in range(len(self.nodes) - 1):
+            others = np.arange(node + 1, len(self.nodes))
+            starts = np.full(len(others), node)
+            visible = others[~self._blocked(self._x[starts], self._y[starts], self._x[others], self._y[others])]
+            distances = np.hypot(self._x[visible] - self._x[node], self._y[visible] - self._y[node])
+            for other, distance in zip(visible.tolist(), distances.tolist()):
+                self._neighbors[node].append((other, distance))
+                self._neighbors[other].append((node, distance))
+
+    def path(self, start, target):
+        """
+        Find the shortest path from start to target which does not touch a planet.
+
+        :param entity.Entity start: Where the path starts, e.g. a ship
+        :param entity.Entity target: Where the path ends (a position; a planet would be an obstacle itself)
+        :return: The waypoints to fly to one after the other, ending with the target, or None if there is no path
+        :rtype: list[entity.Entity]
+        """
+        if not self._blocked([start.x], [start.y], [target.x], [target.y])[0]:
+            return [target]
+        count = len(self.nodes)
+        from_start = np.flatnonzero(~self._blocked(np.full(count, start.x), np.full(count, start.y), self._x, self._y))
+        to_target = ~self._blocked(self._x, self._y, np.full(count, target.x), np.full(count, target.y))
+        goal = count
+
+        # A* with the straight-line distance to the target as heuristic, which never overestimates
+        costs = {}
+        parents = {}
+        queue = []
+        for node in from_start.tolist():
+            cost = math.hypot(self.nodes[node].x - start.x, self.nodes[node].y - start.y)
+            costs[node] = cost
+            parents[node] = None
+            heapq.heappush(queue, (cost + self._distance(node, target), cost, node))
+        closed = set()
+        while queue:
+            _, cost, node = heapq.heappop(queue)
+            if node == goal:
+                return self._waypoints(parents, parents[goal], target)
+            if node in closed:
+                continue
+            closed.add(node)
+            successors = self._neighbors[node]
+            if to_target[node]:
+                successors = successors + [(goal, self._distance(node, target))]
+            for successor, distance in successors:
+                successor_cost = cost + distance
+                if successor not in closed and successor_cost < costs.get(successor, math.inf):
+                    costs[successor] = successor_cost
+                    parents[successor] = node
+                    heuristic = 0.0 if successor == goal else self._distance(successor, target)
+                    heapq.heappush(queue, (successor_cost + heuristic, successor_cost, successor))
+        return None
+
+    def next_waypoint(self, start, target, cache=None):
+        """
+        Find the first waypoint of the path from start to target (see path). With a cache, the result is stored for
+        all starts within the same cell of WAYPOINT_CELL_SIZE and the same target, so repeated queries (e.g. for a
+        group of ships, or by several parts of a bot) only search once.
+
+        :param entity.Entity start: Where the path starts, e.g. a ship
+        :param entity.Entity target: Where the path ends
+        :param dict cache: Dict to store the waypoints in, e.g. one per turn (optional)
+        :return: The entity to fly to now (the target itself if it is in sight), or None if there is no path
+        :rtype: entity.Entity
+        """
+        if cache is None:
+            path = self.path(start, target)
+            return None if path is None else path[0]
+        key = (int(start.x // WAYPOINT_CELL_SIZE), int(start.y // WAYPOINT_CELL_SIZE), target.x, target.y)
+        try:
+            return cache[key]
+        except KeyError:
+            waypoint = cache[key] = self.next_waypoint(start, target)
+            return waypoint
+
+    def _blocked(self, start_x, start_y, end_x, end_y):
+        """
+        :return: For every segment, whether it touches a planet
+        :rtype: numpy.ndarray
+        """
+        hits = collision.intersect_segments_circles(start_x, start_y, end_x, end_y, self._planet_x, self._planet_y,
+                                                    self._planet_radius, fudge=self._fudge)
+        return hits.any(axis=1)
+
+    def _distance(self, node, target):
+        return math.hypot(self.nodes[node].x - target.x, self.nodes[node].y - target.y)
+
+    def _waypoints(self, parents, node, target):
+        waypoints = [target]
+        while node is not None:
+            waypoints.append(self.nodes[node])
+            node = parents[node]
+        waypoints.reverse()
+        return waypoints
+
+    def __str__(self):
+        return "VisibilityGraph with {} nodes and {} edges"\
+            .format(len(self.nodes), sum(len(neighbors) for neighbors in self._neighbors) // 2)
+
+    def __repr__(self):
+        return self.__str__()
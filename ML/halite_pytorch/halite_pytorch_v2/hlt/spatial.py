@@ -0,0 +1,205 @@
+import heapq
+
+DEFAULT_CELL_SIZE = 8.0
+
+
+class SpatialIndex:
+    """
+    Uniform grid over the entities of one frame, for finding the entities near a point or a path without testing all
+    of them. Small entities (ships) are bucketed by the cell containing their center; entities too large for a cell
+    (planets) are few and kept in a separate list. Build it through Map.spatial_index(), which caches it until the
+    next frame is parsed.
+
+    :ivar cell_size: Width and height of a grid cell
+    """
+
+    def __init__(self, entities, cell_size=DEFAULT_CELL_SIZE):
+        """
+        :param list[entity.Entity] entities: The entities to index
+        :param float cell_size: Width and height of a grid cell
+        """
+        self.cell_size = cell_size
+        self._cells = {}
+        self._large = []
+        self._max_radius = 0.0
+        self._bounds = None
+        for entity in entities:
+            radius = entity.radius
+            if radius > cell_size / 2:
+                # Keep the bounding box, so that queries compare it without looking up the attributes
+                self._large.append((entity.x - radius, entity.y - radius, entity.x + radius, entity.y + radius, entity))
+                continue
+            self._max_radius = max(self._max_radius, entity.radius)
+            self._cells.setdefault((int(entity.x // cell_size), int(entity.y // cell_size)), []).append(entity)
+        if entities:
+            xs = [entity.x for entity in entities]
+            ys = [entity.y for entity in entities]
+            self._bounds = (min(xs), min(ys), max(xs), max(ys))
+
+    def query(self, x_min, y_min, x_max, y_max):
+        """
+        Find the entities whose bounding box overlaps the given rectangle. Large entities come first.
+
+        :param float x_min: Left edge of the rectangle
+        :param float y_min: Bottom edge of the rectangle
+        :param float x_max: Right edge of the rectangle
+        :param float y_max: Top edge of the rectangle
+        :return: The candidate entities
+        :rtype: list[entity.Entity]
+        """
+        result = [entity for left, bottom, right, top, entity in self._large
+                  if right >= x_min and left <= x_max and top >= y_min and bottom <= y_max]
+        for bucket in self._buckets(x_min, y_min, x_max, y_max):
+            for entity in bucket:
+                radius = entity.radius
+                if entity.x + radius >= x_min and entity.x - radius <= x_max \
+                        and entity.y + radius >= y_min and entity.y - radius <= y_max:
+                    result.append(entity)
+        return result
+
+    def first(self, x_min, y_min, x_max, y_max, predicate):
+        """
+        Find the first entity in the order of query for which predicate returns true, without collecting the others,
+        e.g. to check whether anything blocks a path.
+
+        :param float x_min: Left edge of the rectangle
+        :param float y_min: Bottom edge of the rectangle
+        :param float x_max: Right edge of the rectangle
+        :param float y_max: Top edge of the rectangle
+        :param predicate: The test for the entities whose bounding box overlaps the rectangle
+        :return: The first entity found, or None
+        :rtype: entity.Entity
+        """
+        for left, bottom, right, top, entity in self._large:
+            if right >= x_min and left <= x_max and top >= y_min and bottom <= y_max and predicate(entity):
+                return entity
+        for bucket in self._buckets(x_min, y_min, x_max, y_max):
+            for entity in bucket:
+                radius = entity.radius
+                if entity.x + radius >= x_min and entity.x - radius <= x_max \
+                        and entity.y + radius >= y_min and entity.y - radius <= y_max and predicate(entity):
+                    return entity
+        return None
+
+    def _buckets(self, x_min, y_min, x_max, y_max):
+        """
+        :return: The buckets of the cells which may hold small entities overlapping the rectangle
+        :rtype: list[list[entity.Entity]]
+        """
+        cells = self._cells
+        if not cells:
+            return []
+        cell_size = self.cell_size
+        margin = self._max_radius
+        column_min = int((x_min - margin) // cell_size)
+        column_max = int((x_max + margin) // cell_size)
+        row_min = int((y_min - margin) // cell_size)
+        row_max = int((y_max + margin) // cell_size)
+        if (column_max - column_min + 1) * (row_max - row_min + 1) > len(cells):
+            # The rectangle spans more cells than are occupied, so walk the occupied ones instead.
+            return [bucket for (column, row), bucket in cells.items()
+                    if column_min <= column <= column_max and row_min <= row <= row_max]
+        buckets = []
+        for column in range(column_min, column_max + 1):
+            for row in range(row_min, row_max + 1):
+                bucket = cells.get((column, row))
+                if bucket is not None:
+                    buckets.append(bucket)
+        return buckets
+
+    def query_segment(self, start, end, fudge=0.0):
+        """
+        Find the entities which may come within fudge of the segment from start to end, i.e. whose bounding box
+        overlaps the segment's bounding box grown by fudge.
+
+        :param entity.Entity start: The start of the segment
+        :param entity.Entity end: The end of the segment
+        :param float fudge: Additional distance to keep from the segment
+        :return: The candidate entities
+        :rtype: list[entity.Entity]
+        """
+        return self.query(min(start.x, end.x) - fudge, min(start.y, end.y) - fudge,
+                          max(start.x, end.x) + fudge, max(start.y, end.y) + fudge)
+
+    def query_radius(self, center, radius):
+        """
+        Find the entities which may come within radius of the center, i.e. whose bounding box overlaps the center's
+        bounding box grown by radius.
+
+        :param entity.Entity center: The center of the search
+        :param float radius: The distance to search
+        :return: The candidate entities
+        :rtype: list[entity.Entity]
+        """
+        return self.query(center.x - radius, center.y - radius, center.x + radius, center.y + radius)
+
+    def within(self, center, distance, predicate=None):
+        """
+        Find the entities whose edge is within distance of the center's edge, i.e. whose center is within distance plus
+        both radii of the center, nearest first. The center itself is never included.
+
+        :param entity.Entity center: The center of the search
+        :param float distance: The distance between the edges
+        :param predicate: Only include entities for which this returns true (optional)
+        :return: The entities in range, by increasing distance between the centers
+        :rtype: list[entity.Entity]
+        """
+        reach = distance + center.radius
+        found = []
+        for entity in self.query_radius(center, reach):
+            if entity is center or (predicate is not None and not predicate(entity)):
+                continue
+            dx = entity.x - center.x
+            dy = entity.y - center.y
+            squared = dx * dx + dy * dy
+            limit = reach + entity.radius
+            if squared <= limit * limit:
+                found.append((squared, len(found), entity))
+        found.sort()
+        return [entity for _, _, entity in found]
+
+    def nearest(self, center, k=1, predicate=None, max_distance=None):
+        """
+        Find the k entities whose centers are closest to the center, nearest first. The search starts with the cells
+        around the center and doubles its radius until it has found k entities within that radius, so it only looks at
+        the part of the map needed. The center itself is never included.
+
+        :param entity.Entity center: The center of the search
+        :param int k: How many entities to find
+        :param predicate: Only include entities for which this returns true (optional)
+        :param float max_distance: Only include entities whose center is within this distance (optional)
+        :return: Up to k entities, by increasing distance between the centers
+        :rtype: list[entity.Entity]
+        """
+        if k <= 0 or self._bounds is None:
+            return []
+        x_min, y_min, x_max, y_max = self._bounds
+        radius = 2 * self.cell_size
+        while True:
+            capped = max_distance is not None and radius >= max_distance
+            if capped:
+                radius = max_distance
+            # Once the search area holds all entities, the k nearest are among them whatever their distance
+            covered = (center.x - radius <= x_min and center.x + radius >= x_max
+                       and center.y - radius <= y_min and center.y + radius >= y_max)
+            found = []
+            limit = radius * radius
+            for entity in self.query_radius(center, radius):
+                if entity is center or (predicate is not None and not predicate(entity)):
+                    continue
+                dx = entity.x - center.x
+                dy = entity.y - center.y
+                squared = dx * dx + dy * dy
+                # Before that, only entities within the radius are known to be nearer than the ones not searched
+                if squared <= limit or (covered and not capped):
+                    found.append((squared, len(found), entity))
+            if len(found) >= k or covered or capped:
+                return [entity for _, _, entity in heapq.nsmallest(k, found)]
+            radius *= 2
+
+    def __str__(self):
+        return "SpatialIndex with {} occupied cells of size {} and {} large entities"\
+            .format(len(self._cells), self.cell_size, len(self._large))
+
+    def __repr__(self):
+        return self.__str__()
@@ -1,7 +1,7 @@
 import heapq
+import logging
 import numpy as np
 import os
-import time
 
 import hlt
 import torch
@@ -23,18 +23,20 @@ class Bot:
         assert len(predictions.data.numpy()[0]) == PLANET_MAX_NUM
         """
 
-    def play(self):
+    def play(self, transport=None, log_level=logging.DEBUG):
         """
-        Play a game using stdin/stdout.
+        Play a game using stdin/stdout, or another connection to the game.
+
+        :param hlt.networking.Transport transport: The connection (defaults to stdin/stdout)
+        :param log_level: Passed to hlt.Game, None to not set up logging (e.g. for many games in one process)
         """
 
         # Initialize the game.
-        game = hlt.Game(self._name)
+        game = hlt.Game(self._name, transport=transport, log_level=log_level)
 
         while True:
             # Update the game map.
             game_map = game.update_map()
-            start_time = time.time()
 
             # Produce features for each planet.
             features = self.produce_features(game_map)
@@ -50,7 +52,7 @@ class Bot:
             ships_to_planets_assignment = self.produce_ships_to_planets_assignment(game_map, predictions)
 
             # Produce halite instruction for each ship.
-            instructions = self.produce_instructions(game_map, ships_to_planets_assignment, start_time)
+            instructions = self.produce_instructions(game_map, ships_to_planets_assignment, game.deadline)
 
             # Send the command.
             game.send_command_queue(instructions)
@@ -65,7 +67,26 @@ class Bot:
         """
         feature_matrix = [[0 for _ in range(PER_PLANET_FEATURES)] for _ in range(PLANET_MAX_NUM)]
 
-        for planet in game_map.all_planets():
+        # Distances between every ship (rows) and every planet (columns), shared with the rest of the turn.
+        matrices = game_map.distances()
+        state = matrices.view
+        squared_distances = matrices.ship_planet_squared
+        distances = matrices.ship_planet
+
+        mine = state.ship_owner == game_map.my_id
+        signed_health = np.where(mine, state.ship_health, -state.ship_health)
+        gravities = (signed_health[:, np.newaxis] / squared_distances).sum(axis=0)
+        my_best_distances = np.full(len(state.planets), 10000.0)
+        enemy_best_distances = np.full(len(state.planets), 10000.0)
+        if mine.any():
+            my_best_distances = np.minimum(my_best_distances, distances[mine].min(axis=0))
+        if not mine.all():
+            enemy_best_distances = np.minimum(enemy_best_distances, distances[~mine].min(axis=0))
+        sum_of_health = state.ship_health[mine].sum()
+        health_weighted_ship_distances = \
+            (distances[mine] * state.ship_health[mine][:, np.newaxis]).sum(axis=0) / sum_of_health
+
+        for row, planet in enumerate(state.planets):
 
             # Compute "ownership" feature - 0 if planet is not occupied, 1 if occupied by us, -1 if occupied by enemy.
             if planet.owner == game_map.get_me():
@@ -75,30 +96,8 @@ class Bot:
             else:  # owned by enemy
                 ownership = -1
 
-            my_best_distance = 10000
-            enemy_best_distance = 10000
-
-            gravity = 0
-
-            health_weighted_ship_distance = 0
-            sum_of_health = 0
-
-            for player in game_map.all_players():
-                for ship in player.all_ships():
-                    d = ship.calculate_distance_between(planet)
-                    if player == game_map.get_me():
-                        my_best_distance = min(my_best_distance, d)
-                        sum_of_health += ship.health
-                        health_weighted_ship_distance += d * ship.health
-                        gravity += ship.health / (d * d)
-                    else:
-                        enemy_best_distance = min(enemy_best_distance, d)
-                        gravity -= ship.health / (d * d)
-
             distance_from_center = distance(planet.x, planet.y, game_map.width / 2, game_map.height / 2)
 
-            health_weighted_ship_distance = health_weighted_ship_distance / sum_of_health
-
             remaining_docking_spots = planet.num_docking_spots - len(planet.all_docked_ships())
             signed_current_production = planet.current_production * ownership
 
@@ -109,12 +108,12 @@ class Bot:
                 remaining_docking_spots,
                 planet.remaining_resources,
                 signed_current_production,
-                gravity,
-                my_best_distance,
-                enemy_best_distance,
+                gravities[row],
+                my_best_distances[row],
+                enemy_best_distances[row],
                 ownership,
                 distance_from_center,
-                health_weighted_ship_distance,
+                health_weighted_ship_distances[row],
                 is_active
             ]
 
@@ -143,13 +142,17 @@ class Bot:
         planet_heap = []
         ship_heaps = [[] for _ in range(PLANET_MAX_NUM)]
 
+        # The distances of the undocked ships to every planet, from the matrices produce_features computed.
+        matrices = game_map.distances()
+        rows = [matrices.view.ship_row(ship) for ship in undocked_ships]
+        planet_distances = matrices.ship_planet[rows].T.tolist()
+
         # Create heaps for greedy ship assignment.
         for planet in game_map.all_planets():
             # We insert negative number of ships as a key, since we want max heap here.
             heapq.heappush(planet_heap, (-predictions[planet.id] * number_of_ships_to_assign, planet.id))
             h = []
-            for ship in undocked_ships:
-                d = ship.calculate_distance_between(planet)
+            for ship, d in zip(undocked_ships, planet_distances[matrices.view.planet_row(planet)]):
                 heapq.heappush(h, (d, ship.id))
             ship_heaps[planet.id] = h
 
@@ -175,7 +178,7 @@ class Bot:
 
         return assignment
 
-    def produce_instructions(self, game_map, ships_to_planets_assignment, round_start_time):
+    def produce_instructions(self, game_map, ships_to_planets_assignment, deadline):
         """
         Given list of pairs (ship, planet) produce instructions for every ship to go to its respective planet.
         If the planet belongs to the enemy, we go to the weakest docked ship.
@@ -183,22 +186,21 @@ class Bot:
 
         :param game_map: game map
         :param ships_to_planets_assignment: list of tuples (ship, planet)
-        :param round_start_time: time (in seconds) between the Epoch and the start of this round
+        :param deadline: the time left in this round (hlt.deadline.TurnDeadline)
         :return: list of instructions to send to the Halite engine
         """
         command_queue = []
+        moves = []
+        speed = hlt.constants.MAX_SPEED
         # Send each ship to its planet
         for ship, planet in ships_to_planets_assignment:
-            speed = hlt.constants.MAX_SPEED
-
             is_planet_friendly = not planet.is_owned() or planet.owner == game_map.get_me()
 
             if is_planet_friendly:
                 if ship.can_dock(planet):
                     command_queue.append(ship.dock(planet))
                 else:
-                    command_queue.append(
-                        self.navigate(game_map, round_start_time, ship, ship.closest_point_to(planet), speed))
+                    moves.append((ship, ship.closest_point_to(planet)))
             else:
                 docked_ships = planet.all_docked_ships()
                 assert len(docked_ships) > 0
@@ -206,30 +208,37 @@ class Bot:
                 for s in docked_ships:
                     if weakest_ship is None or weakest_ship.health > s.health:
                         weakest_ship = s
-                command_queue.append(
-                    self.navigate(game_map, round_start_time, ship, ship.closest_point_to(weakest_ship), speed))
+                moves.append((ship, ship.closest_point_to(weakest_ship)))
+
+        # Because "navigate" method in Halite API is expensive, we use it (in assignment order) only while we
+        # have time left in the round, and just thrust towards the destination otherwise.
+        command_queue.extend(deadline.run_best_first(
+            moves,
+            lambda move: self.navigate(game_map, move[0], move[1], speed),
+            lambda move: self.thrust(move[0], move[1], speed)))
         return command_queue
 
-    def navigate(self, game_map, start_of_round, ship, destination, speed):
+    def navigate(self, game_map, ship, destination, speed):
         """
-        Send a ship to its destination. Because "navigate" method in Halite API is expensive, we use that method only if
-        we haven't used too much time yet.
+        Send a ship to its destination, avoiding obstacles.
 
         :param game_map: game map
-        :param start_of_round: time (in seconds) between the Epoch and the start of this round
         :param ship: ship we want to send
         :param destination: destination to which we want to send the ship to
         :param speed: speed with which we would like to send the ship to its destination
-        :return:
+        :return: the command, or None if no path was found
+        """
+        return ship.navigate(destination, game_map, speed=speed, max_corrections=180)
+
+    def thrust(self, ship, destination, speed):
+        """
+        Send a ship straight towards its destination, without looking for obstacles.
+
+        :param ship: ship we want to send
+        :param destination: destination to which we want to send the ship to
+        :param speed: speed with which we would like to send the ship to its destination
+        :return: the command
         """
-        current_time = time.time()
-        have_time = current_time - start_of_round < 1.2
-        navigate_command = None
-        if have_time:
-            navigate_command = ship.navigate(destination, game_map, speed=speed, max_corrections=180)
-        if navigate_command is None:
-            # ship.navigate may return None if it cannot find a path. In such a case we just thrust.
-            dist = ship.calculate_distance_between(destination)
-            speed = speed if (dist >= speed) else dist
-            navigate_command = ship.thrust(speed, ship.calculate_angle_between(destination))
-        return navigate_command
+        dist = ship.calculate_distance_between(destination)
+        speed = speed if (dist >= speed) else dist
+        return ship.thrust(speed, ship.calculate_angle_between(destination))
@@ -0,0 +1,56 @@
+import math
+
+# The engine only accepts thrusts at whole degrees, so the cosine and sine of every possible heading are computed once.
+# Entries are exactly math.cos(math.radians(degree)) and math.sin(math.radians(degree)).
+COS = tuple(math.cos(math.radians(degree)) for degree in range(360))
+SIN = tuple(math.sin(math.radians(degree)) for degree in range(360))
+
+# math.radians(angle) == angle * RADIANS_PER_DEGREE; multiplying saves a function call in inner loops
+RADIANS_PER_DEGREE = math.pi / 180
+
+
+def to_cartesian(magnitude, angle):
+    """
+    Convert a vector given by its magnitude and angle to its x and y components.
+
+    :param float magnitude: The length of the vector
+    :param int|float angle: The angle in degrees; whole degrees (ints) are looked up in the tables
+    :return: The x and y components
+    :rtype: (float, float)
+    """
+    if angle.__class__ is int:
+        angle %= 360
+        return magnitude * COS[angle], magnitude * SIN[angle]
+    radians = math.radians(angle)
+    return magnitude * math.cos(radians), magnitude * math.sin(radians)
+
+
+def to_polar(x, y):
+    """
+    Convert a vector given by its x and y components to its magnitude and angle.
+
+    :param float x: The x component
+    :param float y: The y component
+    :return: The magnitude, and the angle in degrees in (-180, 180]
+    :rtype: (float, float)
+    """
+    return math.hypot(x, y), math.degrees(math.atan2(y, x))
+
+
+def to_thrust_angle(angle):
+    """
+    :param float angle: An angle in degrees
+    :return: The whole-degree heading in [0, 360) a thrust command at this angle moves the ship in
+    :rtype: int
+    """
+    return int(round(angle)) % 360
+
+
+def difference(angle, reference):
+    """
+    :param float angle: An angle in degrees
+    :param float reference: Another angle in degrees
+    :return: The signed difference from reference to angle in degrees, in [-180, 180)
+    :rtype: float
+    """
+    return (angle - reference + 180) % 360 - 180
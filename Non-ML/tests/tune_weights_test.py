@@ -0,0 +1,90 @@
+from tune_weights import MIN_STD, SMOOTHING, Search, write_json
+
+import json
+import math
+import os
+import tempfile
+import unittest
+
+SETTINGS = {'bot': "vector_field_v2", 'backend': 'selfplay', 'population': 8, 'elite': 0.25, 'initial_std': 1.0,
+            'seed': 3, 'max_turns': None, 'games': 4, 'baseline': None}
+BASELINE = {"a": 10.0, "b": 1000.0}
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        self.search = Search(dict(SETTINGS), BASELINE)
+
+    def test_starts_at_the_baseline(self):
+        self.assertEqual(self.search.keys, ["a", "b"])
+        self.assertEqual(self.search.mean, [1.0, 3.0])
+        self.assertEqual(self.search.weights(self.search.mean), {"a": 10.0, "b": 1000.0})
+
+    def test_sample_is_deterministic(self):
+        self.search.sample()
+        population = self.search.population
+        self.assertEqual((len(population), len(population[0])), (8, 2))
+        self.assertEqual(self.search.fitness, [None] * 8)
+
+        other = Search(dict(SETTINGS), BASELINE)
+        other.sample()
+        self.assertEqual(other.population, population)
+        self.assertEqual(other.map_seed(), self.search.map_seed())
+        other.generation = 1
+        other.sample()
+        self.assertNotEqual(other.population, population)
+        self.assertNotEqual(other.map_seed(), self.search.map_seed())
+
+    def test_update_moves_to_the_elite(self):
+        self.search.sample()
+        self.search.population = [[float(index), 3.0] for index in range(8)]
+        self.search.fitness = [index / 10 for index in range(8)]
+        self.search.update()
+        # The best quarter are candidates 7 and 6, which agree on b; its spread shrinks until it stops at MIN_STD
+        self.assertAlmostEqual(self.search.mean[0], SMOOTHING * 6.5 + (1 - SMOOTHING) * 1.0)
+        self.assertAlmostEqual(self.search.mean[1], 3.0)
+        self.assertAlmostEqual(self.search.std[0], SMOOTHING * 0.5 + (1 - SMOOTHING) * 1.0)
+        self.assertAlmostEqual(self.search.std[1], (1 - SMOOTHING) * 1.0)
+        for _ in range(10):
+            self.search.sample()
+            self.search.population = [[1.0, 3.0]] * 8
+            self.search.fitness = [0.5] * 8
+            self.search.update()
+        self.assertEqual(self.search.std, [MIN_STD, MIN_STD])
+
+        self.assertEqual(self.search.generation, 11)
+        self.assertIsNone(self.search.population)
+        last = self.search.history[0]
+        self.assertEqual((last['generation'], last['best_fitness']), (0, 0.7))
+        self.assertAlmostEqual(last['mean_fitness'], 0.35)
+        self.assertEqual(last['best_weights'], {"a": 1e7, "b": 1e3})
+        self.assertTrue(math.isclose(last['weights']["a"], 10 ** (SMOOTHING * 6.5 + (1 - SMOOTHING) * 1.0)))
+
+    def test_resumes_from_checkpoint(self):
+        self.search.sample()
+        self.search.fitness[:3] = [0.25, 0.5, 0.75]  # Interrupted after three candidates
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "search.json")
+            self.search.save(path)
+            self.assertEqual(os.listdir(directory), ["search.json"])
+            resumed = Search.load(path)
+        self.assertEqual(resumed.__dict__, self.search.__dict__)
+        self.assertEqual(resumed.fitness, [0.25, 0.5, 0.75] + [None] * 5)
+        resumed.fitness[3:] = [0.0] * 5
+        resumed.update()
+        self.assertEqual(resumed.generation, 1)
+
+
+class TestWriteJson(unittest.TestCase):
+    def test_replaces_the_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "weights.json")
+            write_json(path, {"a": 1.0})
+            write_json(path, BASELINE, indent=4)
+            self.assertEqual(os.listdir(directory), ["weights.json"])
+            with open(path) as weights_file:
+                self.assertEqual(json.load(weights_file), BASELINE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Tune the weights of a vector field bot with the cross-entropy method: every generation samples a population of
+weightings around the current estimate (in log10 space, as the weights span orders of magnitude), plays each against
+the bot's default weights (or --baseline), and moves the estimate to the best quarter of them.
+
+    python3 tune_weights.py vector_field_v2 --generations 30
+    python3 tune_weights.py vector_field_v1 --games 20 --workers 8
+
+Candidates are evaluated on a pool of processes, either by reinforcement_bot.selfplay (vector_field_v2 only, fast
+but with simplified rules) or by games on halite_sim, the local engine of the ML starter kit, in which the bot runs
+unchanged with the candidate weights in the file named by HALITE_WEIGHTS. All candidates of a generation play on the
+same maps. The fitness of a candidate is its mean share of the ships at the end of its games.
+
+The state of the search, including the estimate after every generation, is written to the checkpoint after every
+evaluated candidate; running the same command again resumes it. Once the search has run all its generations, its
+estimate is written to the bot's weights.json (or --output), which the bot loads at startup.
+"""
+import argparse
+import concurrent.futures
+import json
+import math
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+NON_ML = os.path.dirname(os.path.abspath(__file__))
+BOTS = {name: os.path.join(NON_ML, name) for name in ("vector_field_v1", "vector_field_v2")}
+STARTER_KIT = os.path.join(os.path.dirname(NON_ML), "ML", "Halite2_ML-StarterBot-Python_Linux-x64")
+
+# Smoothing of the distribution updates, and the least spread (in decades) the search keeps exploring with
+SMOOTHING = 0.7
+MIN_STD = 0.05
+
+
+def write_json(path, value, indent=None):
+    """
+    Write a JSON file, replacing the previous one at once so that an interruption cannot leave it truncated.
+
+    :param str path: The file
+    :param value: The value to write
+    :param int indent: The indentation of the JSON
+    :return: nothing
+    """
+    temporary = "{}.{}.tmp".format(path, os.getpid())
+    with open(temporary, 'w') as json_file:
+        json.dump(value, json_file, indent=indent)
+    os.replace(temporary, path)
+
+
+def use_bot(bot):
+    """
+    Make the bot's packages importable, and halite_sim with the starter kit's hlt, which has every engine constant.
+    Every worker process calls it too, as processes which are spawned rather than forked start with a fresh sys.path.
+
+    :param str bot: The bot directory name
+    :return: nothing
+    """
+    sys.path[:0] = [path for path in (STARTER_KIT, BOTS[bot]) if path not in sys.path]
+
+
+def selfplay_fitness(weights, baseline, num_maps, seed, max_turns):
+    """
+    :return: The mean reward of the weights against the baseline in reinforcement_bot.selfplay
+    :rtype: float
+    """
+    from reinforcement_bot.selfplay import evaluate
+    return evaluate(weights, baseline, num_maps=num_maps, seed=seed, max_turns=max_turns)[0]
+
+
+def engine_fitness(bot, weights, baseline, game, max_turns):
+    """
+    Play one game on halite_sim between the bot with the weights (tournament player 0) and with the baseline.
+
+    :param halite_sim.tournament.ScheduledGame game: The map and seats
+    :return: The share of the ships of the weights at the end
+    :rtype: float
+    """
+    from halite_sim.bots import SubprocessBot
+    from halite_sim.game import play_game
+    with tempfile.TemporaryDirectory() as directory:
+        commands = []
+        for index, player_weights in enumerate((weights, baseline)):
+            path = os.path.join(directory, "weights_{}.json".format(index))
+            with open(path, 'w') as weights_file:
+                json.dump(player_weights, weights_file)
+            commands.append("HALITE_WEIGHTS={} {} {}".format(shlex.quote(path), shlex.quote(sys.executable),
+                                                           shlex.quote(os.path.join(BOTS[bot], "MyBot.py"))))
+        # The logs go to the temporary directory
+        bots = [SubprocessBot(commands[player], cwd=directory, stderr=subprocess.DEVNULL) for player in game.lineup]
+        result = play_game(bots, game.width, game.height, game.seed, max_turns, timeouts=False)
+    ships = [0, 0]
+    for player in result.players:
+        ships[game.lineup[player.player_id]] += player.ships
+    return ships[0] / sum(ships) if sum(ships) else 0.5
+
+
+class Search:
+    """
+    The state of a cross-entropy search, as saved in the checkpoint.
+
+    :ivar settings: The options of the search, which a resumed search keeps
+    :ivar keys: The names of the weights, in the order of the vectors
+    :ivar baseline: The weights every candidate plays against
+    :ivar generation: The number of the current generation, from 0
+    :ivar mean: The log10 weights the search is centered on
+    :ivar std: The spread of the search per weight, in decades
+    :ivar population: The log10 weights of the current generation's candidates
+    :ivar fitness: The fitness of every candidate, None until evaluated
+    :ivar history: Per finished generation its mean and best fitness, and the estimate after it
+    """
+
+    def __init__(self, settings, baseline):
+        self.settings = settings
+        self.keys = sorted(baseline)
+        self.baseline = baseline
+        self.generation = 0
+        self.mean = [math.log10(baseline[key]) for key in self.keys]
+        self.std = [settings['initial_std']] * len(self.keys)
+        self.population = None
+        self.fitness = None
+        self.history = []
+
+    @staticmethod
+    def load(path):
+        """
+        :param str path: The checkpoint
+        :return: The search saved in it
+        :rtype: Search
+        """
+        with open(path) as checkpoint:
+            state = json.load(checkpoint)
+        search = Search.__new__(Search)
+        search.__dict__.update(state)
+        return search
+
+    def save(self, path):
+        """
+        Write the checkpoint.
+
+        :param str path: The checkpoint
+        :return: nothing
+        """
+        write_json(path, self.__dict__, indent=1)
+
+    def weights(self, vector):
+        """
+        :param list[float] vector: log10 weights
+        :return: The weights by name
+        :rtype: dict
+        """
+        return {key: 10 ** value for key, value in zip(self.keys, vector)}
+
+    def sample(self):
+        """
+        Draw the population of the current generation.
+
+        :return: nothing
+        """
+        rng = np.random.RandomState([self.settings['seed'], self.generation])
+        population = np.array(self.mean) + np.array(self.std) * rng.randn(self.settings['population'], len(self.keys))
+        self.population = population.tolist()
+        self.fitness = [None] * len(self.population)
+
+    def map_seed(self):
+        """
+        :return: The seed of the maps of the current generation
+        :rtype: int
+        """
+        return int(np.random.RandomState([self.settings['seed'], self.generation, 1]).randint(2 ** 31 - 1))
+
+    def update(self):
+        """
+        Move the distribution to the elite of the evaluated population, and start the next generation.
+
+        :return: nothing
+        """
+        order = np.argsort(self.fitness)[::-1]
+        elite = np.array(self.population)[order[:max(2, int(round(self.settings['elite'] * len(order))))]]
+        self.mean = (SMOOTHING * elite.mean(axis=0) + (1 - SMOOTHING) * np.array(self.mean)).tolist()
+        self.std = np.maximum(SMOOTHING * elite.std(axis=0) + (1 - SMOOTHING) * np.array(self.std), MIN_STD).tolist()
+        self.history.append({'generation': self.generation, 'mean_fitness': float(np.mean(self.fitness)),
+                             'best_fitness': float(np.max(self.fitness)),
+                             'best_weights': self.weights(self.population[order[0]]),
+                             'weights': self.weights(self.mean)})
+        self.generation += 1
+        self.population = None
+        self.fitness = None
+
+
+def evaluate(search, executor, checkpoint):
+    """
+    Evaluate the candidates of the current generation which are not evaluated yet, saving each result.
+
+    :return: nothing
+    """
+    settings = search.settings
+    futures = {}
+    for index, vector in enumerate(search.population):
+        if search.fitness[index] is not None:
+            continue
+        weights = search.weights(vector)
+        if settings['backend'] == 'selfplay':
+            futures[executor.submit(selfplay_fitness, weights, search.baseline, settings['games'], search.map_seed(),
+                                    settings['max_turns'])] = (index, 1)
+        else:
+            from halite_sim.tournament import schedule
+            for game in schedule(2, settings['games'], seed=search.map_seed()):
+                futures[executor.submit(engine_fitness, settings['bot'], weights, search.baseline, game,
+                                        settings['max_turns'])] = (index, settings['games'])
+    partial = {}
+    for future in concurrent.futures.as_completed(futures):
+        index, games = futures[future]
+        partial.setdefault(index, []).append(future.result())
+        if len(partial[index]) == games:
+            search.fitness[index] = float(np.mean(partial[index]))
+            search.save(checkpoint)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-entropy search for the weights of a vector field bot")
+    parser.add_argument("bot", choices=sorted(BOTS), help="the bot to tune")
+    parser.add_argument("--backend", choices=("selfplay", "engine"),
+                        help="how candidates play (defaults to selfplay where the bot has it, else engine)")
+    parser.add_argument("--generations", type=int, default=20, help="generations to run in total")
+    parser.add_argument("--population", type=int, default=16, help="candidates per generation")
+    parser.add_argument("--elite", type=float, default=0.25, help="share of the candidates the search moves to")
+    parser.add_argument("--initial-std", type=float, default=1.0, help="initial spread, in decades")
+    parser.add_argument("--games", type=int,
+                        help="games per candidate: maps played from both seats with selfplay (defaults to 64), "
+                             "games with engine (defaults to 10)")
+    parser.add_argument("--turns", type=int, help="turn limit of the games (defaults to the one of the map size)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the candidates and maps")
+    parser.add_argument("--workers", type=int, help="evaluations at a time (defaults to the number of cores)")
+    parser.add_argument("--baseline", help="weights file the candidates play against and the search starts from "
+                                           "(defaults to the bot's DEFAULT_WEIGHTS)")
+    parser.add_argument("--checkpoint", help="state of the search (defaults to tune_BOT.json in this directory)")
+    parser.add_argument("--output",
+                        help="weights file to write when the search finishes (defaults to the bot's weights.json)")
+    args = parser.parse_args()
+
+    use_bot(args.bot)
+    from functions.weights import DEFAULT_WEIGHTS, WEIGHTS_FILE, load_weights
+    checkpoint = args.checkpoint or os.path.join(NON_ML, "tune_{}.json".format(args.bot))
+    if os.path.exists(checkpoint):
+        search = Search.load(checkpoint)
+        if search.settings['bot'] != args.bot:
+            parser.error("{} is a search for {}".format(checkpoint, search.settings['bot']))
+        print("Resuming generation {} of {}".format(search.generation, checkpoint))
+    else:
+        backend = args.backend or ('selfplay' if os.path.exists(
+            os.path.join(BOTS[args.bot], "reinforcement_bot", "selfplay.py")) else 'engine')
+        if backend == 'selfplay' and args.bot != "vector_field_v2":
+            parser.error("only vector_field_v2 has a selfplay environment")
+        # Not the bot's weights.json, which this search overwrites, so that a new search does not depend on the last
+        baseline = os.path.abspath(args.baseline) if args.baseline else None
+        settings = {'bot': args.bot, 'backend': backend, 'population': args.population, 'elite': args.elite,
+                    'initial_std': args.initial_std, 'seed': args.seed, 'max_turns': args.turns,
+                    'games': args.games or (64 if backend == 'selfplay' else 10), 'baseline': baseline}
+        search = Search(settings, load_weights(baseline) if baseline else dict(DEFAULT_WEIGHTS))
+    output = args.output or WEIGHTS_FILE
+
+    with concurrent.futures.ProcessPoolExecutor(args.workers, initializer=use_bot, initargs=(args.bot,)) as executor:
+        while search.generation < args.generations:
+            if search.population is None:
+                search.sample()
+                search.save(checkpoint)
+            evaluate(search, executor, checkpoint)
+            search.update()
+            search.save(checkpoint)
+            last = search.history[-1]
+            print("Generation {}: mean fitness {:.3f}, best {:.3f}, weights {}".format(
+                last['generation'], last['mean_fitness'], last['best_fitness'],
+                ", ".join("{} {:.3g}".format(key, value) for key, value in sorted(last['weights'].items()))))
+            sys.stdout.flush()
+    # Only a finished search replaces the weights the bot plays with
+    if search.history:
+        write_json(output, search.history[-1]['weights'], indent=4)
+        print("Wrote the weights to {}".format(output))
+
+
+if __name__ == "__main__":
+    main()
@@ -23,24 +23,23 @@ import logging
 import math
 
 from functions.vector import add_vectors, resize_vector
+from functions.weights import load_weights
 
 # GAME START
 # Here we define the bot's name as Settler and initialize the game, including communication with the Halite engine.
-game = hlt.Game("Vectorizor")
+game = hlt.Game("Vectorizor", approaches=True)
 # Then we print our start message to the logs
 logging.info("Starting my Vectorizor bot!")
 
-WEIGHT_CONSTANTS = {
-    "friendly_open_docks": 500,
-    "unclaimed_planets": 10000,
-    "friendly_ships": 100,
-    "enemy_ships": 50
-}
+#The hand-set weights are in functions/weights.py; weights.json next to this file, or the file named by the
+#HALITE_WEIGHTS environment variable, overrides them
+WEIGHT_CONSTANTS = load_weights()
 
 while True:
     # TURN START
     # Update the map for the new turn and get the latest version
     game_map = game.update_map()
+    approaches = game_map.approaches()
 
     # Here we define the set of commands to be sent to the Halite engine at the end of the turn
     command_queue = []
@@ -73,6 +72,14 @@ while True:
                 enemy_ships.append(ship)
 
     friendly_ships = game_map.get_me().all_ships()
+
+    #Distances and angles between all ships and planets, computed once for the turn
+    matrices = game_map.distances()
+    friendly_open_docks_columns = [matrices.view.planet_row(planet) for planet in friendly_open_docks]
+    unclaimed_planets_columns = [matrices.view.planet_row(planet) for planet in unclaimed_planets]
+    friendly_ships_columns = [matrices.view.ship_row(friendly_ship) for friendly_ship in friendly_ships]
+    enemy_ships_columns = [matrices.view.ship_row(enemy_ship) for enemy_ship in enemy_ships]
+
     for ship in friendly_ships:
         # Dock them ships brah
         if ship.docking_status != ship.DockingStatus.UNDOCKED:
@@ -85,25 +92,31 @@ while True:
             friendly_ships_vector = [0,0]
             enemy_ships_vector = [0,0]
 
-            for friendly_dock in friendly_open_docks:
-                distance = ship.calculate_distance_between(friendly_dock)
-                angle = ship.calculate_angle_between(friendly_dock)
+            row = matrices.view.ship_row(ship)
+            planet_distances = matrices.ship_planet[row].tolist()
+            planet_angles = matrices.ship_planet_angle[row].tolist()
+            ship_distances = matrices.ship_ship[row].tolist()
+            ship_angles = matrices.ship_ship_angle[row].tolist()
+
+            for column in friendly_open_docks_columns:
+                distance = planet_distances[column]
+                angle = planet_angles[column]
                 if distance != 0:
                     friendly_open_docks_vector = add_vectors(friendly_open_docks_vector,[1/(distance*distance),angle])
-            for unclaimed_planet in unclaimed_planets:
-                distance = ship.calculate_distance_between(unclaimed_planet)
-                angle = ship.calculate_angle_between(unclaimed_planet)
+            for column in unclaimed_planets_columns:
+                distance = planet_distances[column]
+                angle = planet_angles[column]
                 if distance != 0:
                     unclaimed_planets_vector = add_vectors(unclaimed_planets_vector,[1/(distance*distance),angle])
-            for friendly_ship in friendly_ships:
-                distance = ship.calculate_distance_between(friendly_ship)
+            for column in friendly_ships_columns:
+                distance = ship_distances[column]
                 #Correction to reverse the vector
-                angle = (ship.calculate_angle_between(friendly_ship)+180)%360
+                angle = (ship_angles[column]+180)%360
                 if distance != 0:
                     friendly_ships_vector = add_vectors(friendly_ships_vector,[1/(distance*distance),angle])
-            for enemy_ship in enemy_ships:
-                distance = ship.calculate_distance_between(enemy_ship)
-                angle = ship.calculate_angle_between(enemy_ship)
+            for column in enemy_ships_columns:
+                distance = ship_distances[column]
+                angle = ship_angles[column]
                 if distance != 0:
                     enemy_ships_vector = add_vectors(enemy_ships_vector,[1/(distance*distance),angle])
 
@@ -143,17 +156,18 @@ while True:
                             if planet.owner == game_map.my_id:
                                     navigate_command = ship.thrust(
                                         magnitude = 5,
-                                        angle = ship.calculate_angle_between(ship.closest_point_to(planet))+90
+                                        angle = ship.calculate_angle_between(approaches.closest_approach(ship, planet) or ship.closest_point_to(planet))+90
                                     )
                                     check = False
                                     logging.info("Sending ship away from there")
                     else:
-                        distance = ship.calculate_distance_between(ship.closest_point_to(planet))
+                        closest_point = approaches.closest_approach(ship, planet) or ship.closest_point_to(planet)
+                        distance = ship.calculate_distance_between(closest_point)
                         if  distance < hlt.constants.MAX_SPEED:
                             planet_angle = ship.calculate_angle_between(planet)
                             if math.fabs(output_vector[1]-planet_angle)<30:
                                 navigate_command = ship.navigate(
-                                    ship.closest_point_to(planet),
+                                    closest_point,
                                     game_map,
                                     speed=3,
                                     ignore_ships=True
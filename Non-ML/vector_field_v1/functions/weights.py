@@ -0,0 +1,38 @@
+import json
+import os
+
+#Hand-set weights, used for every weight a weights file does not set
+DEFAULT_WEIGHTS = {
+    "friendly_open_docks": 500,
+    "unclaimed_planets": 10000,
+    "friendly_ships": 100,
+    "enemy_ships": 50
+}
+
+#Environment variable naming the weights file to load instead of WEIGHTS_FILE
+WEIGHTS_ENVIRONMENT_VARIABLE = "HALITE_WEIGHTS"
+#Weights file loaded at startup if it exists, next to MyBot.py (e.g. written by Non-ML/tune_weights.py)
+WEIGHTS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "weights.json")
+
+
+def load_weights(path=None):
+    """
+    Load the weights the bot plays with: DEFAULT_WEIGHTS, updated with the ones of a JSON object file.
+
+    :param str path: The weights file (defaults to the one named by HALITE_WEIGHTS, else WEIGHTS_FILE if it exists)
+    :return: The weights by name
+    :rtype: dict
+    :raises ValueError: If the file sets a weight the bot does not have
+    """
+    path = path or os.environ.get(WEIGHTS_ENVIRONMENT_VARIABLE) or (WEIGHTS_FILE if os.path.exists(WEIGHTS_FILE)
+                                                                   else None)
+    weights = dict(DEFAULT_WEIGHTS)
+    if path is None:
+        return weights
+    with open(path) as weights_file:
+        loaded = json.load(weights_file)
+    unknown = sorted(set(loaded) - set(weights))
+    if unknown:
+        raise ValueError("{} sets unknown weights {}, expected some of {}".format(path, unknown, sorted(weights)))
+    weights.update((name, float(value)) for name, value in loaded.items())
+    return weights
@@ -1,4 +1,4 @@
-from .entity import Position, Entity
+import math
 
 
 def intersect_segment_circle(start, end, circle, *, fudge=0.5):
@@ -24,17 +24,174 @@ def intersect_segment_circle(start, end, circle, *, fudge=0.5):
               start.y**2 - start.y*end.y - start.y*circle.y + end.y*circle.y)
     c = (start.x - circle.x)**2 + (start.y - circle.y)**2
 
+    reach = circle.radius + fudge
     if a == 0.0:
         # Start and end are the same point
-        return start.calculate_distance_between(circle) <= circle.radius + fudge
+        return c <= reach * reach
 
     # Time along segment when closest to the circle (vertex of the quadratic)
     t = min(-b / (2 * a), 1.0)
     if t < 0:
         return False
 
+    # Compare squared distances rather than taking the square root
     closest_x = start.x + dx * t
     closest_y = start.y + dy * t
-    closest_distance = Position(closest_x, closest_y).calculate_distance_between(circle)
+    return (circle.x - closest_x) ** 2 + (circle.y - closest_y) ** 2 <= reach * reach
 
-    return closest_distance <= circle.radius + fudge
+
+def segment_circle_entry(start, end, circle, *, fudge=0.5):
+    """
+    Find where a line segment enters a circle grown by fudge, if it intersects the circle according to
+    intersect_segment_circle, e.g. to tell which of several obstacles a ship would run into first.
+
+    :param Entity start: The start of the line segment. (Needs x, y attributes)
+    :param Entity end: The end of the line segment. (Needs x, y attributes)
+    :param Entity circle: The circle to test against. (Needs x, y, r attributes)
+    :param float fudge: A fudge factor; additional distance to leave between the segment and circle.
+    :return: The fraction of the segment before it enters the circle (0 if it starts inside), or None if it does not
+        intersect
+    :rtype: float
+    """
+    if not intersect_segment_circle(start, end, circle, fudge=fudge):
+        return None
+    dx = end.x - start.x
+    dy = end.y - start.y
+    a = dx * dx + dy * dy
+    if a == 0.0:
+        return 0.0
+    # Smaller root of |start + t * (end - start) - circle|^2 = reach^2
+    offset_x = start.x - circle.x
+    offset_y = start.y - circle.y
+    half_b = offset_x * dx + offset_y * dy
+    reach = circle.radius + fudge
+    c = offset_x * offset_x + offset_y * offset_y - reach * reach
+    return max((-half_b - math.sqrt(max(half_b * half_b - a * c, 0.0))) / a, 0.0)
+
+
+def blocked_headings(start, obstacles, distance, *, fudge=0.5):
+    """
+    Find the headings in which a segment of the given length, starting at start, would intersect each obstacle
+    according to intersect_segment_circle. For each obstacle these form one interval of headings centered on the
+    obstacle's direction.
+
+    :param Entity start: The start of the segments. (Needs x, y attributes)
+    :param list[Entity] obstacles: The circles to avoid. (Need x, y, radius attributes)
+    :param float distance: The length of the segments
+    :param float fudge: A fudge factor; additional distance to leave between the segments and circles.
+    :return: The direction of each obstacle that blocks any heading, and the half-width of its blocked interval,
+        in degrees
+    :rtype: list[(float, float)]
+    """
+    blocked = []
+    for obstacle in obstacles:
+        dx = obstacle.x - start.x
+        dy = obstacle.y - start.y
+        center_squared = dx ** 2 + dy ** 2
+        reach = obstacle.radius + fudge
+        if center_squared <= reach ** 2:
+            # The segment starts inside the grown circle: every heading up to 90 degrees away hits it
+            half_width = 90.0
+        elif distance == 0:
+            continue
+        else:
+            center = math.sqrt(center_squared)
+            if center_squared - reach ** 2 <= distance ** 2:
+                # The segment reaches the tangent points, so it is blocked up to the tangents
+                half_width = math.degrees(math.asin(reach / center))
+            else:
+                # Only the end of the segment can reach into the circle
+                cosine = (center_squared + distance ** 2 - reach ** 2) / (2 * center * distance)
+                if cosine > 1:
+                    continue
+                half_width = math.degrees(math.acos(cosine))
+        blocked.append((math.degrees(math.atan2(dy, dx)) % 360, half_width))
+    return blocked
+
+
+def intersect_segments_circles(start_x, start_y, end_x, end_y, circle_x, circle_y, circle_radius, *, fudge=0.5):
+    """
+    Test many line segments against many circles at once, with the same rule as intersect_segment_circle. Segments
+    and circles are given as coordinate arrays, e.g. the columns of a ColumnarView. Requires NumPy.
+
+    :param start_x: The x-coordinates of the segment starts, shape (S,)
+    :param start_y: The y-coordinates of the segment starts, shape (S,)
+    :param end_x: The x-coordinates of the segment ends, shape (S,)
+    :param end_y: The y-coordinates of the segment ends, shape (S,)
+    :param circle_x: The x-coordinates of the circle centers, shape (C,)
+    :param circle_y: The y-coordinates of the circle centers, shape (C,)
+    :param circle_radius: The circle radii, shape (C,)
+    :param fudge: Additional distance to leave between segment and circle: a number, one per circle (C,) or one per
+        pair (S, C)
+    :return: Boolean matrix whose element [i, j] is True if segment i intersects circle j, shape (S, C)
+    :rtype: numpy.ndarray
+    """
+    return _segments_circles(start_x, start_y, end_x, end_y, circle_x, circle_y, circle_radius, fudge)[0]
+
+
+def first_segment_circle_hits(start_x, start_y, end_x, end_y, circle_x, circle_y, circle_radius, *, fudge=0.5):
+    """
+    For many line segments, find the circle each one runs into first: the intersecting circle (see
+    intersect_segments_circles) whose fudge-grown boundary the segment enters closest to its start. Requires NumPy.
+
+    :param start_x: The x-coordinates of the segment starts, shape (S,)
+    :param start_y: The y-coordinates of the segment starts, shape (S,)
+    :param end_x: The x-coordinates of the segment ends, shape (S,)
+    :param end_y: The y-coordinates of the segment ends, shape (S,)
+    :param circle_x: The x-coordinates of the circle centers, shape (C,)
+    :param circle_y: The y-coordinates of the circle centers, shape (C,)
+    :param circle_radius: The circle radii, shape (C,)
+    :param fudge: Additional distance to leave between segment and circle: a number, one per circle (C,) or one per
+        pair (S, C)
+    :return: The index of the first circle hit by each segment, -1 if it hits none, shape (S,)
+    :rtype: numpy.ndarray
+    """
+    import numpy as np
+
+    hits, a, b, c, reach = _segments_circles(start_x, start_y, end_x, end_y, circle_x, circle_y, circle_radius, fudge)
+    if hits.shape[1] == 0:
+        return np.full(hits.shape[0], -1, dtype=np.int64)
+    # The segment enters the grown circle at the smaller root of a * t^2 + b * t + c = reach^2 (0 if it starts inside)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        entry = (-b - np.sqrt(np.maximum(b * b - 4 * a * (c - reach * reach), 0.0))) / (2 * a)
+    entry = np.where(a > 0, np.maximum(entry, 0.0), 0.0)
+    entry[~hits] = np.inf
+    first = entry.argmin(axis=1)
+    first[~hits.any(axis=1)] = -1
+    return first
+
+
+def _segments_circles(start_x, start_y, end_x, end_y, circle_x, circle_y, circle_radius, fudge):
+    """
+    Evaluate intersect_segment_circle for every segment and circle pair.
+
+    :return: The intersection matrix, and the coefficients a, b, c of the squared distance between the circle center
+        and start + t * (end - start), a * t^2 + b * t + c, and the grown radius of every pair
+    :rtype: (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray)
+    """
+    import numpy as np
+
+    start_x = np.asarray(start_x, dtype=np.float64)[:, np.newaxis]
+    start_y = np.asarray(start_y, dtype=np.float64)[:, np.newaxis]
+    end_x = np.asarray(end_x, dtype=np.float64)[:, np.newaxis]
+    end_y = np.asarray(end_y, dtype=np.float64)[:, np.newaxis]
+    circle_x = np.asarray(circle_x, dtype=np.float64)
+    circle_y = np.asarray(circle_y, dtype=np.float64)
+    reach = np.broadcast_to(np.asarray(circle_radius, dtype=np.float64) + fudge,
+                            (start_x.shape[0], circle_x.shape[0]))
+
+    # Same parameterization as intersect_segment_circle: the closest approach is at start + t * (end - start)
+    dx = end_x - start_x
+    dy = end_y - start_y
+    a = dx ** 2 + dy ** 2
+    b = -2 * (start_x ** 2 - start_x * end_x - start_x * circle_x + end_x * circle_x +
+              start_y ** 2 - start_y * end_y - start_y * circle_y + end_y * circle_y)
+    degenerate = a == 0.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.minimum(-b / (2 * np.where(degenerate, 1.0, a)), 1.0)
+    t = np.where(degenerate, 0.0, t)
+
+    closest_squared = (circle_x - (start_x + dx * t)) ** 2 + (circle_y - (start_y + dy * t)) ** 2
+    hits = (closest_squared <= reach * reach) & (degenerate | (t >= 0))
+    c = (start_x - circle_x) ** 2 + (start_y - circle_y) ** 2
+    return hits, a, b, c, reach
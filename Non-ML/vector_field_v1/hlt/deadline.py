@@ -0,0 +1,73 @@
+import time
+
+
+class TurnDeadline:
+    """
+    The time left to answer the current frame. Game.update_map creates one per turn, starting the clock when the frame
+    is received, so parsing and everything the bot computes count against the budget.
+
+    :ivar start: time.perf_counter() value at which the frame was received
+    :ivar budget: Seconds the bot allows itself for the turn
+    :ivar end: time.perf_counter() value at which the budget is spent
+    """
+
+    def __init__(self, budget, start=None):
+        """
+        :param float budget: Seconds the bot allows itself for the turn
+        :param float start: time.perf_counter() value at which the turn started (defaults to now)
+        """
+        self.start = start if start is not None else time.perf_counter()
+        self.budget = budget
+        self.end = self.start + budget
+
+    def elapsed(self):
+        """
+        :return: Seconds since the turn started
+        :rtype: float
+        """
+        return time.perf_counter() - self.start
+
+    def remaining(self):
+        """
+        :return: Seconds left until the deadline (negative once it has passed)
+        :rtype: float
+        """
+        return self.end - time.perf_counter()
+
+    def expired(self):
+        """
+        :return: True if the deadline has passed, False otherwise
+        :rtype: bool
+        """
+        return time.perf_counter() >= self.end
+
+    def run_best_first(self, items, task, fallback, key=None):
+        """
+        Run an expensive task (e.g. Ship.navigate) for each item, most important item first, while time remains, and
+        a cheap fallback for the rest. A task is only started if the time left exceeds the longest task run so far,
+        so the last one does not overrun the deadline. Items whose task returns None also get the fallback.
+
+        :param list items: The items to process, e.g. ships or (ship, target) pairs
+        :param task: Function of an item returning its result, e.g. a command
+        :param fallback: Cheap function of an item returning its result when the task is skipped or fails
+        :param key: Function of an item whose value orders the items (smallest first); keeps the given order if None
+        :return: The results, in the order of the given items
+        :rtype: list
+        """
+        order = range(len(items)) if key is None else sorted(range(len(items)), key=lambda i: key(items[i]))
+        results = [None] * len(items)
+        slowest = 0.0
+        for i in order:
+            started = time.perf_counter()
+            if self.end - started > slowest:
+                results[i] = task(items[i])
+                slowest = max(slowest, time.perf_counter() - started)
+            if results[i] is None:
+                results[i] = fallback(items[i])
+        return results
+
+    def __str__(self):
+        return "TurnDeadline with {:.1f} of {:.1f} ms left".format(self.remaining() * 1000, self.budget * 1000)
+
+    def __repr__(self):
+        return self.__str__()
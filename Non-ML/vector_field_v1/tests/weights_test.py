@@ -0,0 +1,49 @@
+from functions import weights
+from functions.weights import DEFAULT_WEIGHTS, WEIGHTS_ENVIRONMENT_VARIABLE, load_weights
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestLoadWeights(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.weights_file = os.path.join(self.directory.name, "weights.json")
+        self.other_file = os.path.join(self.directory.name, "other.json")
+        environment = mock.patch.dict(os.environ)
+        environment.start()
+        self.addCleanup(environment.stop)
+        os.environ.pop(WEIGHTS_ENVIRONMENT_VARIABLE, None)
+        weights_file = mock.patch.object(weights, "WEIGHTS_FILE", self.weights_file)
+        weights_file.start()
+        self.addCleanup(weights_file.stop)
+        self.key, self.other_key = sorted(DEFAULT_WEIGHTS)[:2]
+
+    def write(self, path, values):
+        with open(path, 'w') as weights_file:
+            json.dump(values, weights_file)
+
+    def test_defaults(self):
+        self.assertEqual(load_weights(), DEFAULT_WEIGHTS)
+        self.assertIsNot(load_weights(), DEFAULT_WEIGHTS)
+
+    def test_precedence(self):
+        self.write(self.weights_file, {self.key: 1})
+        self.write(self.other_file, {self.other_key: 2})
+        self.assertEqual(load_weights(), dict(DEFAULT_WEIGHTS, **{self.key: 1.0}))
+        os.environ[WEIGHTS_ENVIRONMENT_VARIABLE] = self.other_file
+        self.assertEqual(load_weights(), dict(DEFAULT_WEIGHTS, **{self.other_key: 2.0}))
+        self.assertEqual(load_weights(self.weights_file), dict(DEFAULT_WEIGHTS, **{self.key: 1.0}))
+
+    def test_unknown_weights(self):
+        self.write(self.weights_file, {self.key: 1, "unknown": 2})
+        with self.assertRaisesRegex(ValueError, "unknown"):
+            load_weights()
+
+
+if __name__ == "__main__":
+    unittest.main()
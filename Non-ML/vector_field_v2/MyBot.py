@@ -1,11 +1,8 @@
+from functions.weights import load_weights
 from reinforcement_bot.bot import Bot
 
-weight_parameters = {
-    "unowned_planet": 1e3*10,
-    "friendly_planet": 1e3,
-    "enemy_planet": 1e3*10,
-    "enemy_ship": 1e3,
-    "friendly_ship": 1e3*100
-}
+#The hand-set weights are in functions/weights.py; weights.json next to this file, or the file named by the
+#HALITE_WEIGHTS environment variable, overrides them
+weight_parameters = load_weights()
 
 Bot(weight_parameters).play()
@@ -0,0 +1,93 @@
+import numpy as np
+
+
+class ColumnarView:
+    """
+    Struct-of-arrays snapshot of one frame, for vectorized computations over all ships and planets. Row i of every
+    ship_* array describes ships[i], and row j of every planet_* array describes planets[j]. Build it through
+    Map.columnar(), which caches it until the next frame is parsed.
+
+    :ivar ships: All ships, in row order
+    :ivar ship_rows: Dict mapping ship id to row
+    :ivar ship_ids: Ship ids
+    :ivar ship_x: Ship x-coordinates
+    :ivar ship_y: Ship y-coordinates
+    :ivar ship_health: Ship health
+    :ivar ship_owner: Id of the player owning the ship
+    :ivar ship_docking_status: Docking status value (see Ship.DockingStatus)
+    :ivar ship_planet: Id of the planet the ship is docked to, -1 if undocked
+    :ivar ship_velocity_x: Ship velocity along x
+    :ivar ship_velocity_y: Ship velocity along y
+    :ivar planets: All planets, in row order
+    :ivar planet_rows: Dict mapping planet id to row
+    :ivar planet_ids: Planet ids
+    :ivar planet_x: Planet x-coordinates
+    :ivar planet_y: Planet y-coordinates
+    :ivar planet_radius: Planet radii
+    :ivar planet_health: Planet health
+    :ivar planet_owner: Id of the player owning the planet, -1 if unowned
+    :ivar planet_docking_spots: Max number of ships that can dock
+    :ivar planet_docked: Number of ships docked
+    :ivar planet_production: Current production of the planet
+    :ivar planet_remaining: Remaining resources of the planet
+    """
+
+    def __init__(self, ships, planets):
+        """
+        :param list[entity.Ship] ships: The linked ships of the frame
+        :param list[entity.Planet] planets: The linked planets of the frame
+        """
+        self.ships = ships
+        self.ship_rows = {ship.id: row for row, ship in enumerate(ships)}
+        columns = list(zip(*[(ship.id, ship.x, ship.y, ship.health, ship.owner.id, ship.docking_status.value,
+                              ship.planet.id if ship.planet is not None else -1,
+                              ship._velocity_x, ship._velocity_y) for ship in ships])) or [()] * 9
+        self.ship_ids = np.array(columns[0], dtype=np.int64)
+        self.ship_x = np.array(columns[1], dtype=np.float64)
+        self.ship_y = np.array(columns[2], dtype=np.float64)
+        self.ship_health = np.array(columns[3], dtype=np.int64)
+        self.ship_owner = np.array(columns[4], dtype=np.int64)
+        self.ship_docking_status = np.array(columns[5], dtype=np.int8)
+        self.ship_planet = np.array(columns[6], dtype=np.int64)
+        self.ship_velocity_x = np.array(columns[7], dtype=np.float64)
+        self.ship_velocity_y = np.array(columns[8], dtype=np.float64)
+
+        self.planets = planets
+        self.planet_rows = {planet.id: row for row, planet in enumerate(planets)}
+        columns = list(zip(*[(planet.id, planet.x, planet.y, planet.radius, planet.health,
+                              planet.owner.id if planet.owner is not None else -1,
+                              planet.num_docking_spots, len(planet._docked_ship_ids),
+                              planet.current_production, planet.remaining_resources)
+                             for planet in planets])) or [()] * 10
+        self.planet_ids = np.array(columns[0], dtype=np.int64)
+        self.planet_x = np.array(columns[1], dtype=np.float64)
+        self.planet_y = np.array(columns[2], dtype=np.float64)
+        self.planet_radius = np.array(columns[3], dtype=np.float64)
+        self.planet_health = np.array(columns[4], dtype=np.int64)
+        self.planet_owner = np.array(columns[5], dtype=np.int64)
+        self.planet_docking_spots = np.array(columns[6], dtype=np.int64)
+        self.planet_docked = np.array(columns[7], dtype=np.int64)
+        self.planet_production = np.array(columns[8], dtype=np.int64)
+        self.planet_remaining = np.array(columns[9], dtype=np.int64)
+
+    def ship_row(self, ship):
+        """
+        :param entity.Ship ship: A ship of this frame
+        :return: The row describing the ship
+        :rtype: int
+        """
+        return self.ship_rows[ship.id]
+
+    def planet_row(self, planet):
+        """
+        :param entity.Planet planet: A planet of this frame
+        :return: The row describing the planet
+        :rtype: int
+        """
+        return self.planet_rows[planet.id]
+
+    def __str__(self):
+        return "ColumnarView with {} ships and {} planets".format(len(self.ships), len(self.planets))
+
+    def __repr__(self):
+        return self.__str__()
@@ -1,87 +1,229 @@
 import sys
+import atexit
 import logging
-import copy
+import logging.handlers
+import queue
+import time
 
 from . import game_map
+from .deadline import TurnDeadline
 
 
-class Game:
+class Transport:
     """
-    :ivar map: Current map representation
-    :ivar initial_map: The initial version of the map before game starts
+    Line based connection between a Game and the Halite engine. The engine normally talks to the bot over its
+    standard streams (StdioTransport), but any object with these two methods will do, e.g. to run several bots in one
+    process.
     """
-    @staticmethod
-    def _send_string(s):
+    def read_line(self):
         """
-        Send data to the game. Call :function:`done_sending` once finished.
+        Wait for the next line from the game. Raise EOFError once the game is over, to end the bot's loop.
 
-        :param str s: String to send
+        :return: The line without its line terminator
+        :rtype: str
+        """
+        raise NotImplementedError
+
+    def write_line(self, line):
+        """
+        Send one line to the game.
+
+        :param str line: The line, without line terminator
         :return: nothing
         """
-        sys.stdout.write(s)
+        raise NotImplementedError
 
-    @staticmethod
-    def _done_sending():
+
+class StdioTransport(Transport):
+    """
+    Line based connection to the Halite engine over the process' standard streams. Frames are read from the binary
+    stdin buffer, and every line is sent with a single write and flush.
+    """
+    def __init__(self, stdin=None, stdout=None):
+        """
+        :param stdin: Binary stream to read from (defaults to sys.stdin.buffer)
+        :param stdout: Binary stream to write to (defaults to sys.stdout.buffer)
         """
-        Finish sending commands to the game.
+        self._stdin = stdin if stdin is not None else sys.stdin.buffer
+        self._stdout = stdout if stdout is not None else sys.stdout.buffer
 
+    def read_line(self):
+        """
+        Read one line from the game.
+
+        :return: The line without its line terminator
+        :rtype: str
+        :raises EOFError: Once the engine has closed stdin at the end of the game
+        """
+        line = self._stdin.readline()
+        if not line:
+            raise EOFError("The game is over")
+        return line.rstrip(b'\n').decode()
+
+    def write_line(self, line):
+        """
+        Send one line to the game and flush it.
+
+        :param str line: The line, without line terminator
         :return: nothing
         """
-        sys.stdout.write('\n')
-        sys.stdout.flush()
+        self._stdout.write(line.encode() + b'\n')
+        self._stdout.flush()
 
-    @staticmethod
-    def _get_string():
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler which passes records on unformatted, so that the writer thread formats their messages as well.
+    """
+    def prepare(self, record):
+        return record
+
+
+class TurnTimings:
+    """
+    Wall-clock seconds spent in each phase of a turn: reading the frame (including waiting for the engine), parsing
+    it, computing the commands (from update_map returning until send_command_queue is called) and writing them.
+
+    :ivar turns: The number of turns whose commands have been sent
+    :ivar last: Dict of phase name to the seconds spent in the latest turn
+    :ivar total: Dict of phase name to the seconds accumulated over the game
+    """
+    PHASES = ('read', 'parse', 'compute', 'write')
+
+    def __init__(self):
+        self.turns = 0
+        self.last = dict.fromkeys(self.PHASES, 0.0)
+        self.total = dict.fromkeys(self.PHASES, 0.0)
+
+    def average(self, phase):
+        """
+        :param str phase: One of PHASES
+        :return: The mean seconds per turn spent in the phase
+        :rtype: float
+        """
+        return self.total[phase] / max(self.turns, 1)
+
+    def _record(self, phase, seconds):
+        self.last[phase] = seconds
+        self.total[phase] += seconds
+
+    def __str__(self):
+        return "Turn {}: ".format(self.turns) + ", ".join(
+            "{} {:.1f} ms (avg {:.1f} ms)".format(phase, self.last[phase] * 1000, self.average(phase) * 1000)
+            for phase in self.PHASES)
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class Game:
+    """
+    :ivar map: Current map representation
+    :ivar initial_map: The initial version of the map before game starts (a MapSnapshot)
+    :ivar timings: Per-phase timings of the turns played so far (TurnTimings)
+    :ivar deadline: The time left to answer the current frame (TurnDeadline)
+    """
+    def _send_string(self, s):
+        """
+        Send one line to the game.
+
+        :param str s: String to send
+        :return: nothing
+        """
+        self._transport.write_line(s)
+
+    def _get_string(self):
         """
         Read input from the game.
 
         :return: The input read from the Halite engine
         :rtype: str
         """
-        result = sys.stdin.readline().rstrip('\n')
-        return result
+        return self._transport.read_line()
 
-    @staticmethod
-    def send_command_queue(command_queue):
+    def send_command_queue(self, command_queue):
         """
         Issue the given list of commands.
 
         :param list[str] command_queue: List of commands to send the Halite engine
         :return: nothing
         """
-        for command in command_queue:
-            Game._send_string(command)
-
-        Game._done_sending()
+        start = time.perf_counter()
+        self.timings._record('compute', start - self._map_ready)
+        self._send_string(''.join(command_queue))
+        self.timings._record('write', time.perf_counter() - start)
+        self.timings.turns += 1
 
     @staticmethod
-    def _set_up_logging(tag, name):
+    def _set_up_logging(tag, name, level=logging.DEBUG, asynchronous=False):
         """
-        Set up and truncate the log
+        Set up and truncate the log. In asynchronous mode, log records are put on a queue and formatted and written
+        by a background thread, which flushes the remaining records when the bot exits.
 
         :param tag: The user tag (used for naming the log)
         :param name: The bot name (used for naming the log)
-        :return: nothing
+        :param level: The minimum level of the records to log
+        :param asynchronous: Whether to write the log from a background thread
+        :return: The listener writing the log in asynchronous mode, else None
+        :rtype: logging.handlers.QueueListener
         """
         log_file = "{}_{}.log".format(tag, name)
-        logging.basicConfig(filename=log_file, level=logging.DEBUG, filemode='w')
-        logging.info("Initialized bot {}".format(name))
-
-    def __init__(self, name):
+        if asynchronous:
+            file_handler = logging.FileHandler(log_file, mode='w')
+            file_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+            log_queue = queue.Queue()
+            listener = logging.handlers.QueueListener(log_queue, file_handler)
+            listener.start()
+            atexit.register(listener.stop)
+            logging.basicConfig(level=level, handlers=[_DeferredQueueHandler(log_queue)])
+        else:
+            listener = None
+            logging.basicConfig(filename=log_file, level=level, filemode='w')
+        logging.info("Initialized bot %s", name)
+        return listener
+
+    def __init__(self, name, incremental=False, lazy=False, transport=None, log_level=logging.DEBUG,
+                 async_logging=False, turn_budget=1.2, approaches=False, pathfinding=False):
         """
         Initialize the bot with the given name.
 
+        With async_logging, log messages are formatted after the logging call returns, so log the values rather than
+        objects which change later (e.g. ships of an incremental map), and pass them as arguments
+        (logging.info("ship %d", ship.id)) so that the formatting happens in the writer thread.
+
         :param name: The name of the bot.
+        :param incremental: Update the map in place every turn instead of rebuilding it (see Map.delta)
+        :param lazy: Only parse a player's ships once the bot accesses them (see Map.lazy)
+        :param Transport transport: Connection to the game (defaults to a StdioTransport over stdin/stdout)
+        :param log_level: The minimum level of the records to log (defaults to logging.DEBUG), or None to leave the
+            logging configuration alone, e.g. when several games run in one process: logging.basicConfig only
+            takes effect once per process, so every game after the first would log to the first game's file
+        :param async_logging: Format and write the log in a background thread instead of the turn loop
+        :param turn_budget: Seconds from receiving a frame until the commands should be sent (see Game.deadline)
+        :param approaches: Build the planet approach geometry for Map.approaches while initializing instead of on
+            first use during a turn
+        :param pathfinding: Build the visibility graph for Map.next_waypoint while initializing (requires NumPy)
         """
         self._name = name
         self._send_name = False
+        self._turn_budget = turn_budget
+        self._transport = transport if transport is not None else StdioTransport()
+        self.timings = TurnTimings()
+        self._map_ready = time.perf_counter()
         tag = int(self._get_string())
-        Game._set_up_logging(tag, name)
+        self._log_listener = None
+        if log_level is not None:
+            self._log_listener = Game._set_up_logging(tag, name, log_level, async_logging)
         width, height = [int(x) for x in self._get_string().strip().split()]
-        self.map = game_map.Map(tag, width, height)
+        self.map = game_map.Map(tag, width, height, incremental, lazy)
         self.update_map()
-        self.initial_map = copy.deepcopy(self.map)
+        self.initial_map = self.map.snapshot()
+        if approaches:
+            self.initial_map.approaches()  # Shared with self.map
+        if pathfinding:
+            self.initial_map.visibility_graph()
         self._send_name = True
+        self.timings = TurnTimings()  # The initialization frame does not count as a turn
 
     def update_map(self):
         """
@@ -92,8 +234,14 @@ class Game:
         """
         if self._send_name:
             self._send_string(self._name)
-            self._done_sending()
             self._send_name = False
         logging.info("---NEW TURN---")
-        self.map._parse(self._get_string())
+        start = time.perf_counter()
+        map_string = self._get_string()
+        received = time.perf_counter()
+        self.deadline = TurnDeadline(self._turn_budget, received)
+        self.map._parse(map_string)
+        self._map_ready = time.perf_counter()
+        self.timings._record('read', received - start)
+        self.timings._record('parse', self._map_ready - received)
         return self.map
@@ -41,11 +41,19 @@ class Bot:
         """
         self.weight_parameters = weight_parameters
 
-    def play(self):
+    def play(self, transport=None, log_level=logging.DEBUG):
+        """
+        Play a game using stdin/stdout, or another connection to the game.
+
+        :param hlt.networking.Transport transport: The connection (defaults to stdin/stdout)
+        :param log_level: Passed to hlt.Game, None to not set up logging (e.g. for many games in one process)
+        """
 
         # GAME START
         # Here we define the bot's name as Settler and initialize the game, including communication with the Halite engine.
-        game = hlt.Game("Gradient Bot")
+        # The log is formatted and written by a background thread, so the logging calls below pass their values as
+        # arguments instead of formatting them in the turn loop.
+        game = hlt.Game("Gradient Bot", transport=transport, log_level=log_level, async_logging=True, approaches=True)
         # Then we print our start message to the logs
         logging.info("Starting my bot!")
 
@@ -53,6 +61,7 @@ class Bot:
             # TURN START
             # Update the map for the new turn and get the latest version
             game_map = game.update_map()
+            approaches = game_map.approaches()
 
             # Here we define the set of commands to be sent to the Halite engine at the end of the turn
             command_queue = []
@@ -65,25 +74,24 @@ class Bot:
             friendly_ships = []
 
             #Get all the reqluired objects
-            logging.info("My player id is {}".format(game_map.my_id))
+            logging.info("My player id is %s", game_map.my_id)
             #For every planet
             for planet in game_map.all_planets():
                 #The planet is unclaimed
-                logging.info("Checking planet owned by {}".format(planet.owner))
+                logging.info("Checking planet owned by %s", planet.owner)
                 if not planet.is_owned():
-                    logging.info("unowned planet {} has {} docking spots".format(planet.id,planet.num_docking_spots))
+                    logging.info("unowned planet %s has %s docking spots", planet.id, planet.num_docking_spots)
                     unowned_planets.extend(repeat(planet,(planet.num_docking_spots)))
                 #It's one of our planets
                 elif planet.owner.id == game_map.my_id:
-                    logging.info("friendly planet {} has {} docking spots and {} current docked ships".format(planet.id,planet.num_docking_spots,len(planet.all_docked_ships())))
+                    logging.info("friendly planet %s has %s docking spots and %s current docked ships", planet.id, planet.num_docking_spots, len(planet.all_docked_ships()))
                     friendly_planets.extend(repeat(planet,(planet.num_docking_spots-len(planet.all_docked_ships()))))
                 else:
                     enemy_planets.extend(repeat(planet,(planet.num_docking_spots)))
-            logging.info("{} unowned docks and {} open friendly docks".format(len(unowned_planets),len(friendly_planets)))
+            logging.info("%s unowned docks and %s open friendly docks", len(unowned_planets), len(friendly_planets))
             #For all players
             for player in game_map.all_players():
                 #Other player
-                logging.info(game_map.my_id)
                 if player.id != game_map.my_id:
                     #Add these ships to the list
                     enemy_ships += player.all_ships()
@@ -111,11 +119,11 @@ class Bot:
                                 if not planet.is_owned() or planet.owner.id == game_map.my_id:
                                     navigate_command=ship.dock(planet)
                         else:
-                            if not planet.is_full() and ship.calculate_distance_between(ship.closest_point_to(planet)) < hlt.constants.DOCK_RADIUS:
-                                closest_point = ship.closest_point_to(planet)
+                            closest_point = approaches.closest_approach(ship, planet) or ship.closest_point_to(planet)
+                            if not planet.is_full() and ship.calculate_distance_between(closest_point) < hlt.constants.DOCK_RADIUS:
                                 opposite_point = hlt.entity.Position((planet.x-closest_point.x)*2,(planet.y-closest_point.y)*2)
                                 navigate_command = ship.navigate(
-                                            ship.closest_point_to(planet),
+                                            closest_point,
                                             game_map,
                                             speed=7,
                                             ignore_ships=False
@@ -145,13 +153,10 @@ class Bot:
                         x_partial, y_partial = compute_gradient(ship.x,ship.y,friendly_ship.x,friendly_ship.y,1/self.weight_parameters["friendly_ship"],-1)
                         vector_x += x_partial
                         vector_y += y_partial
-                    direction_vector_magnitude = math.sqrt(pow(vector_x,2)+pow(vector_y,2))
-                    angle_radians = math.atan2(vector_y,vector_x)
-                    angle_degrees = (angle_radians*180)/math.pi
-                    direction_vector = [direction_vector_magnitude,angle_degrees]
-                    logging.info("direction vector is {}".format(direction_vector))
-                    end_x = hlt.constants.MAX_SPEED*math.cos(direction_vector[1])+ship.x
-                    end_y = hlt.constants.MAX_SPEED*math.sin(direction_vector[1])+ship.y
+                    direction_vector = list(hlt.angles.to_polar(vector_x,vector_y))
+                    logging.info("direction vector is %s", direction_vector)
+                    end_x = hlt.constants.MAX_SPEED*math.cos(math.radians(direction_vector[1]))+ship.x
+                    end_y = hlt.constants.MAX_SPEED*math.sin(math.radians(direction_vector[1]))+ship.y
                     end_position = hlt.entity.Position(end_x,end_y)
 
                     for planet in friendly_planets+unowned_planets+enemy_planets:
@@ -0,0 +1,519 @@
+"""
+Self-play for tuning the weight_parameters of reinforcement_bot.bot.Bot without the Halite engine.
+
+SelfPlay keeps a batch of 2 player games in NumPy arrays (ships and planets by game) and steps all of them at once:
+every turn, the gradient policy of Bot.play is evaluated for every ship of every game in a few array operations,
+with each player of each game using its own weights. A batch of a few hundred games plays in seconds, so candidate
+weightings can be compared over thousands of games:
+
+    env = SelfPlay(200, seed=1)
+    rewards = env.run([[candidate, opponent]] * 200)  # weight_parameters dicts, or arrays in WEIGHT_KEYS order
+
+The policy is the bot's: dock at the first open planet in reach, else head for the closest point of the first one
+nearly in reach, else thrust at full speed down the summed gradient of compute_gradient, around the planet in the way.
+The rules are the engine's (hlt.constants), simplified where this policy hardly notices: ships do not collide with
+each other, planets neither run out of resources nor explode, a ship which would still hit a planet after steering
+around the nearest one stays put, and a new ship needs a free slot of max_ships.
+"""
+
+import math
+
+import numpy as np
+
+from hlt import constants
+
+#: The keys of Bot.weight_parameters, in the order of the weight arrays
+WEIGHT_KEYS = ("unowned_planet", "friendly_planet", "enemy_planet", "enemy_ship", "friendly_ship")
+
+# Engine rules which hlt.constants of this bot does not list
+PRODUCTION_PER_SHIP = 72
+ADDITIONAL_PRODUCTIVITY = 6
+INITIAL_SHIPS = 3
+
+# Docking status values, as in hlt.entity.Ship.DockingStatus
+UNDOCKED = 0
+DOCKING = 1
+DOCKED = 2
+
+# Distance the bot keeps from a planet's surface when heading for it (Entity.closest_point_to)
+_APPROACH_DISTANCE = 3
+# Margin Ship.navigate keeps from obstacles
+_FUDGE = constants.SHIP_RADIUS + 0.1
+_MIN_PLANET_RADIUS = 3.0
+_MAX_PLANET_RADIUS = 8.0
+_PLANET_GAP = 5.0
+_START_CLEARANCE = 12.0
+
+
+def weight_array(weight_parameters):
+    """
+    :param dict weight_parameters: Weights as Bot takes them
+    :return: The weights in WEIGHT_KEYS order
+    :rtype: numpy.ndarray
+    """
+    return np.array([float(weight_parameters[key]) for key in WEIGHT_KEYS])
+
+
+def gradient(ship_x, ship_y, object_x, object_y, width_weight, slope_constant):
+    """
+    functions.gradient.compute_gradient on arrays, term for term (including its y partial, which measures the x
+    distance as object_y - ship_x), so that the weights found here mean the same to the bot.
+
+    :return: The x and y partials
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    dx = object_x - ship_x
+    dy = object_y - ship_y
+    dy_squared = dy * dy
+    # In place, as the ship to ship pairs make these the largest arrays of a turn
+    x_partial = dx * dx
+    x_partial += dy_squared
+    x_partial *= -width_weight
+    np.exp(x_partial, out=x_partial)
+    x_partial *= dx
+    y_partial = object_y - ship_x
+    y_partial *= y_partial
+    y_partial += dy_squared
+    y_partial *= -width_weight
+    np.exp(y_partial, out=y_partial)
+    y_partial *= dy
+    scale = slope_constant * 2 * width_weight
+    x_partial *= scale
+    y_partial *= scale
+    return x_partial, y_partial
+
+
+def _weights_array(weights):
+    """
+    :return: Nested lists of weight_parameters dicts or weight arrays as one array
+    :rtype: numpy.ndarray
+    """
+    if isinstance(weights, dict):
+        return weight_array(weights)
+    if isinstance(weights, np.ndarray) or np.isscalar(weights[0]):
+        return np.asarray(weights, dtype=float)
+    return np.array([_weights_array(item) for item in weights])
+
+
+def _pick(values, index):
+    """
+    :param numpy.ndarray values: Values by game, ship and planet
+    :param numpy.ndarray index: A planet by game and ship
+    :return: The value of every ship's planet, by game and ship
+    :rtype: numpy.ndarray
+    """
+    games, ships = np.ogrid[:values.shape[0], :values.shape[1]]
+    return values[games, ships, index]
+
+
+class SelfPlay:
+    """
+    A batch of 2 player games played in lock-step. The maps are generated once, with the planets point-symmetric
+    around the map center and the players starting on opposite sides; reset starts the games over on the same maps,
+    so that different weights can be compared on equal terms.
+
+    :ivar num_games: The number of games
+    :ivar width: Map width
+    :ivar height: Map height
+    :ivar max_turns: The turn limit
+    :ivar turn: The turns played since the last reset
+    :ivar alive: Whether a ship slot holds a ship, by game and slot
+    :ivar owner: The player of every ship
+    :ivar x: The x-coordinate of every ship
+    :ivar y: The y-coordinate of every ship
+    :ivar health: The health of every ship
+    :ivar status: The docking status of every ship
+    :ivar planet: The planet every ship is docking or docked to, else -1
+    :ivar planet_x: The x-coordinate of every planet, by game and planet
+    :ivar planet_y: The y-coordinate of every planet
+    :ivar planet_radius: The radius of every planet
+    :ivar docking_spots: How many ships can dock to every planet
+    :ivar planet_owner: The player owning every planet, else -1
+    :ivar docked: The ships docking or docked to every planet
+    :ivar production: The production every planet accumulated towards its next ship
+    """
+
+    def __init__(self, num_maps, width=240, height=160, max_turns=None, max_ships=64, planets_per_player=6,
+                 games_per_map=1, seed=None):
+        """
+        :param int num_maps: The number of different maps
+        :param int width: Map width
+        :param int height: Map height
+        :param int max_turns: The turn limit (defaults to the engine's for the map size)
+        :param int max_ships: The most ships a game can hold
+        :param int planets_per_player: Half the planets of a map
+        :param int games_per_map: The games played on every map, e.g. 2 to let every weighting play both seats; game
+            i is played on map i % num_maps
+        :param int seed: The seed for the maps
+        """
+        self.num_games = num_maps * games_per_map
+        self.width = width
+        self.height = height
+        self.max_turns = max_turns if max_turns is not None else 100 + int(math.sqrt(width * height))
+        self._max_ships = max_ships
+        maps = [self._generate_map(np.random.RandomState(map_seed), planets_per_player)
+                for map_seed in np.random.RandomState(seed).randint(2 ** 31 - 1, size=num_maps)]
+        self.planet_x, self.planet_y, self.planet_radius = [np.tile(np.array(values), (games_per_map, 1))
+                                                            for values in zip(*maps)]
+        self.docking_spots = np.maximum(2, np.ceil(self.planet_radius / 2)).astype(int)
+        self.reset()
+
+    def _starts(self):
+        """
+        :return: The start position of every initial ship of player 0; player 1's are point-symmetric
+        :rtype: list[(float, float)]
+        """
+        return [(self.width / 4, self.height / 2 + 4 * (ship - INITIAL_SHIPS // 2)) for ship in range(INITIAL_SHIPS)]
+
+    def _generate_map(self, rng, planets_per_player):
+        """
+        :return: The x-coordinates, y-coordinates and radii of the planets, every planet followed by its mirror image
+        :rtype: (list[float], list[float], list[float])
+        """
+        starts = self._starts() + [(self.width - x, self.height - y) for x, y in self._starts()]
+        planets = []
+        while len(planets) < 2 * planets_per_player:
+            radius = rng.uniform(_MIN_PLANET_RADIUS, _MAX_PLANET_RADIUS)
+            x = rng.uniform(radius + _PLANET_GAP, self.width - radius - _PLANET_GAP)
+            y = rng.uniform(radius + _PLANET_GAP, self.height - radius - _PLANET_GAP)
+            pair = [(x, y, radius), (self.width - x, self.height - y, radius)]
+            if math.hypot(x - self.width / 2, y - self.height / 2) * 2 > 2 * radius + _PLANET_GAP and \
+                    all(math.hypot(x - other_x, y - other_y) > radius + other_radius + _PLANET_GAP
+                        for other_x, other_y, other_radius in planets for x, y, _ in pair) and \
+                    all(math.hypot(x - start_x, y - start_y) > radius + _START_CLEARANCE
+                        for start_x, start_y in starts for x, y, _ in pair):
+                planets.extend(pair)
+        return tuple(zip(*planets))
+
+    def reset(self):
+        """
+        Start all games over, with the initial ships of both players.
+
+        :return: nothing
+        """
+        shape = (self.num_games, self._max_ships)
+        self.turn = 0
+        self.alive = np.zeros(shape, dtype=bool)
+        self.owner = np.zeros(shape, dtype=int)
+        self.x = np.zeros(shape)
+        self.y = np.zeros(shape)
+        self.health = np.zeros(shape, dtype=int)
+        self.status = np.zeros(shape, dtype=int)
+        self.planet = np.full(shape, -1, dtype=int)
+        self._progress = np.zeros(shape, dtype=int)
+        for slot, (x, y) in enumerate(self._starts()):
+            for player, (player_x, player_y) in enumerate([(x, y), (self.width - x, self.height - y)]):
+                ship = 2 * slot + player
+                self.alive[:, ship] = True
+                self.owner[:, ship] = player
+                self.x[:, ship] = player_x
+                self.y[:, ship] = player_y
+                self.health[:, ship] = constants.BASE_SHIP_HEALTH
+        self.planet_owner = np.full(self.planet_x.shape, -1, dtype=int)
+        self.docked = np.zeros(self.planet_x.shape, dtype=int)
+        self.production = np.zeros(self.planet_x.shape, dtype=int)
+
+    def finished(self):
+        """
+        :return: Whether every game has reached the turn limit or lost a player
+        :rtype: bool
+        """
+        return self.turn >= self.max_turns or bool((self.ship_counts().min(axis=1) == 0).all())
+
+    def ship_counts(self):
+        """
+        :return: The ships of every player, by game and player
+        :rtype: numpy.ndarray
+        """
+        return np.stack([(self.alive & (self.owner == player)).sum(axis=1) for player in range(2)], axis=1)
+
+    def rewards(self):
+        """
+        :return: Every player's share of the ships of its game, by game and player: 1 for destroying the opponent,
+            0.5 for a draw
+        :rtype: numpy.ndarray
+        """
+        counts = self.ship_counts()
+        total = counts.sum(axis=1, keepdims=True)
+        return np.where(total > 0, counts / np.maximum(total, 1), 0.5)
+
+    def winners(self):
+        """
+        :return: The winner of every game (0 or 1), by ships and then total health as the engine ranks them at the
+            turn limit, or 0.5 for a draw in both
+        :rtype: numpy.ndarray
+        """
+        health = np.stack([np.where(self.alive & (self.owner == player), self.health, 0).sum(axis=1)
+                           for player in range(2)], axis=1)
+        counts = self.ship_counts()
+        return np.where(counts[:, 1] != counts[:, 0], counts[:, 1] > counts[:, 0],
+                        np.where(health[:, 1] != health[:, 0], health[:, 1] > health[:, 0], 0.5))
+
+    def run(self, weights):
+        """
+        Play all games from the start until they are finished.
+
+        :param weights: The weights of both players, either for every game (num_games x 2) or for all games (2), as
+            weight_parameters dicts or arrays in WEIGHT_KEYS order
+        :return: The rewards at the end
+        :rtype: numpy.ndarray
+        """
+        widths = self.widths(weights)
+        self.reset()
+        while not self.finished():
+            self.step(widths)
+        return self.rewards()
+
+    def widths(self, weights):
+        """
+        :param weights: See run
+        :return: The width_weight of compute_gradient, 1 / weight, by game, player and WEIGHT_KEYS
+        :rtype: numpy.ndarray
+        """
+        weights = _weights_array(weights)
+        if weights.ndim == 2:
+            weights = np.broadcast_to(weights, (self.num_games,) + weights.shape)
+        if weights.shape != (self.num_games, 2, len(WEIGHT_KEYS)):
+            raise ValueError("Expected weights for {} games, 2 players and {} keys, not {}".format(
+                self.num_games, len(WEIGHT_KEYS), weights.shape))
+        return 1 / weights
+
+    def step(self, widths):
+        """
+        Play one turn of every game.
+
+        :param numpy.ndarray widths: The width_weights of every player of every game (see widths)
+        :return: nothing
+        """
+        docking = self.alive & (self.status == DOCKING)
+        self._progress[docking] -= 1
+        self.status[docking & (self._progress <= 0)] = DOCKED
+
+        # New ships take the lowest free slot, so the slots above the highest one in use can be left out
+        in_use = np.nonzero(self.alive.any(axis=0))[0]
+        ships = slice(in_use[-1] + 1 if len(in_use) else 0)
+        dock, target, speed, angle = self._policy(widths, ships)
+        self._dock(dock, target, ships)
+        self._move(speed, angle, ships)
+        self._fire(ships)
+        self._remove_destroyed()
+        self._produce()
+        self.turn += 1
+
+    def _policy(self, widths, ships):
+        """
+        Bot.play for every undocked ship.
+
+        :param numpy.ndarray widths: See step
+        :param slice ships: The ship slots in use
+        :return: Whether every ship docks, and to which planet, else the speed and angle (radians) of its thrust
+        :rtype: (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        """
+        games = np.arange(self.num_games)[:, np.newaxis]
+        alive = self.alive[:, ships]
+        owner = self.owner[:, ships]
+        ready = alive & (self.status[:, ships] == UNDOCKED)
+        ship_widths = widths[games, owner]  # Game, ship, key
+        x = self.x[:, ships, np.newaxis]
+        y = self.y[:, ships, np.newaxis]
+
+        # Planets by game, ship and planet
+        planet_x = self.planet_x[:, np.newaxis]
+        planet_y = self.planet_y[:, np.newaxis]
+        radius = self.planet_radius[:, np.newaxis]
+        planet_owner = self.planet_owner[:, np.newaxis]
+        open_spots = (self.docking_spots - self.docked)[:, np.newaxis]
+        mine = planet_owner == owner[:, :, np.newaxis]
+        friendly = mine & (open_spots > 0)
+        unowned = planet_owner < 0
+        distance = np.hypot(planet_x - x, planet_y - y)
+        can_dock = (friendly | unowned) & (distance <= radius + constants.DOCK_RADIUS + constants.SHIP_RADIUS)
+        approach = (friendly | unowned) & ~can_dock & (distance - radius - _APPROACH_DISTANCE < constants.DOCK_RADIUS)
+
+        # The first of the friendly planets, then the unowned ones, which the ship can dock to or approach
+        num_planets = self.planet_x.shape[1]
+        order = np.where(friendly, 0, num_planets) + np.arange(num_planets)
+        first = np.where(can_dock | approach, order, 2 * num_planets).argmin(axis=2)
+        acts = ready & (can_dock | approach).any(axis=2)
+        first_can_dock = _pick(can_dock, first)
+        dock = acts & first_can_dock
+
+        # Everyone else follows the gradient
+        spots = np.where(friendly, open_spots, np.where(unowned | ~mine, self.docking_spots[:, np.newaxis], 0))
+        planet_widths = np.where(unowned, ship_widths[:, :, 0:1],
+                                 np.where(mine, ship_widths[:, :, 1:2], ship_widths[:, :, 2:3]))
+        x_partial, y_partial = gradient(x, y, planet_x, planet_y, planet_widths, 1)
+        vector_x = (spots * x_partial).sum(axis=2)
+        vector_y = (spots * y_partial).sum(axis=2)
+        # Enemy ships attract and friendly ships repel, each with its own width, in one pass over all pairs
+        same_owner = owner[:, np.newaxis] == owner[:, :, np.newaxis]
+        x_partial, y_partial = gradient(x, y, x.transpose(0, 2, 1), y.transpose(0, 2, 1),
+                                        np.where(same_owner, ship_widths[:, :, 4:5], ship_widths[:, :, 3:4]),
+                                        np.where(same_owner, -1, 1) * alive[:, np.newaxis])
+        vector_x += x_partial.sum(axis=2)
+        vector_y += y_partial.sum(axis=2)
+        angle = np.radians(np.round(np.degrees(np.arctan2(vector_y, vector_x))))
+        speed = np.where(ready, constants.MAX_SPEED, 0)
+        angle, blocked = self._steer(angle, x, y)
+        speed[blocked] = 0
+
+        # Heading for the closest point of a planet nearly in reach
+        approaching = acts & ~first_can_dock
+        target_distance = _pick(distance - radius - _APPROACH_DISTANCE, first)
+        target_angle = np.arctan2(_pick(planet_y - y, first), _pick(planet_x - x, first))
+        speed = np.where(approaching, np.floor(np.minimum(target_distance, constants.MAX_SPEED)), speed)
+        angle = np.where(approaching, np.radians(np.round(np.degrees(target_angle))), angle)
+        speed[dock] = 0
+        return dock, first, speed, angle
+
+    def _hits(self, angle, x, y):
+        """
+        :param numpy.ndarray angle: The heading of every ship (radians)
+        :param numpy.ndarray x: The x-coordinate of every ship, by game, ship and 1
+        :param numpy.ndarray y: The y-coordinate of every ship, by game, ship and 1
+        :return: Whether a full speed thrust hits each planet, by game, ship and planet, and the distances to them
+        :rtype: (numpy.ndarray, numpy.ndarray)
+        """
+        dx = self.planet_x[:, np.newaxis] - x
+        dy = self.planet_y[:, np.newaxis] - y
+        cos = np.cos(angle)[:, :, np.newaxis]
+        sin = np.sin(angle)[:, :, np.newaxis]
+        along = np.clip(dx * cos + dy * sin, 0, constants.MAX_SPEED)
+        reach = self.planet_radius[:, np.newaxis] + _FUDGE
+        return (dx - along * cos) ** 2 + (dy - along * sin) ** 2 <= reach * reach, np.hypot(dx, dy)
+
+    def _steer(self, angle, x, y):
+        """
+        Turn the ships heading into a planet past its edge, on the side nearer their heading, like Ship.navigate.
+
+        :return: The new headings, and which ships are still blocked
+        :rtype: (numpy.ndarray, numpy.ndarray)
+        """
+        hits, distance = self._hits(angle, x, y)
+        blocked = hits.any(axis=2)
+        if not blocked.any():
+            return angle, blocked
+        nearest = np.where(hits, distance, np.inf).argmin(axis=2)
+        games = np.arange(self.num_games)[:, np.newaxis]
+        center = np.arctan2(self.planet_y[games, nearest] - y[:, :, 0], self.planet_x[games, nearest] - x[:, :, 0])
+        reach = self.planet_radius[games, nearest] + _FUDGE
+        half_width = np.arcsin(np.minimum(reach / _pick(distance, nearest), 1.0))
+        side = np.where(np.sin(angle - center) < 0, -1, 1)
+        steered = center + side * np.radians(np.ceil(np.degrees(half_width)) + 1)
+        angle = np.where(blocked, np.radians(np.round(np.degrees(steered))), angle)
+        return angle, self._hits(angle, x, y)[0].any(axis=2)
+
+    def _dock(self, dock, target, ships):
+        """
+        Dock the ships which asked to, unless both players try to claim the same planet or it has no spot left, in
+        which case the lowest ship ids get the spots.
+        """
+        owner = self.owner[:, ships]
+        for planet in range(self.planet_x.shape[1]):
+            asks = dock & (target == planet)
+            if not asks.any():
+                continue
+            by_player = [asks & (owner == player) for player in range(2)]
+            contested = by_player[0].any(axis=1) & by_player[1].any(axis=1) & (self.planet_owner[:, planet] < 0)
+            for player, player_asks in enumerate(by_player):
+                allowed = ~contested & ((self.planet_owner[:, planet] < 0) | (self.planet_owner[:, planet] == player))
+                open_spots = self.docking_spots[:, planet] - self.docked[:, planet]
+                accepted = player_asks & allowed[:, np.newaxis] & \
+                    (np.cumsum(player_asks, axis=1) <= open_spots[:, np.newaxis])
+                self.status[:, ships][accepted] = DOCKING
+                self._progress[:, ships][accepted] = constants.DOCK_TURNS
+                self.planet[:, ships][accepted] = planet
+                count = accepted.sum(axis=1)
+                self.docked[:, planet] += count
+                self.planet_owner[count > 0, planet] = player
+
+    def _move(self, speed, angle, ships):
+        x = self.x[:, ships]
+        y = self.y[:, ships]
+        x += speed * np.cos(angle)
+        y += speed * np.sin(angle)
+        radius = constants.SHIP_RADIUS
+        outside = (x < radius) | (x > self.width - radius) | (y < radius) | (y > self.height - radius)
+        crashed = (np.hypot(self.planet_x[:, np.newaxis] - x[:, :, np.newaxis],
+                            self.planet_y[:, np.newaxis] - y[:, :, np.newaxis]) <=
+                   self.planet_radius[:, np.newaxis] + radius).any(axis=2)
+        self.health[:, ships][self.alive[:, ships] & (outside | crashed)] = 0
+
+    def _fire(self, ships):
+        """
+        Every undocked ship splits its damage between the enemy ships in range, as in the engine.
+        """
+        x = self.x[:, ships]
+        y = self.y[:, ships]
+        alive = self.alive[:, ships]
+        owner = self.owner[:, ships]
+        dx = x[:, np.newaxis] - x[:, :, np.newaxis]
+        dy = y[:, np.newaxis] - y[:, :, np.newaxis]
+        reach = constants.WEAPON_RADIUS + 2 * constants.SHIP_RADIUS
+        in_range = (dx * dx + dy * dy <= reach * reach) & (owner[:, np.newaxis] != owner[:, :, np.newaxis]) & \
+            alive[:, np.newaxis] & alive[:, :, np.newaxis]
+        targets = in_range.sum(axis=2)
+        damage = np.where(alive & (self.status[:, ships] == UNDOCKED) & (targets > 0),
+                          constants.WEAPON_DAMAGE // np.maximum(targets, 1), 0)
+        self.health[:, ships] -= np.einsum('gst,gs->gt', in_range.astype(int), damage)
+
+    def _remove_destroyed(self):
+        destroyed = self.alive & (self.health <= 0)
+        games, ships = np.nonzero(destroyed & (self.planet >= 0))
+        np.add.at(self.docked, (games, self.planet[games, ships]), -1)
+        lost = self.docked == 0
+        self.planet_owner[lost] = -1
+        self.production[lost] = 0
+        self.alive[destroyed] = False
+        self.status[destroyed] = UNDOCKED
+        self.planet[destroyed] = -1
+
+    def _produce(self):
+        """
+        Docked ships produce for their planet, and every planet with enough production spawns a ship at its
+        surface, facing the map center.
+        """
+        docked = np.zeros(self.docked.shape, dtype=int)
+        games, ships = np.nonzero(self.alive & (self.status == DOCKED))
+        np.add.at(docked, (games, self.planet[games, ships]), 1)
+        self.production += np.where(docked > 0, constants.BASE_PRODUCTIVITY + ADDITIONAL_PRODUCTIVITY * (docked - 1), 0)
+        for planet in range(self.planet_x.shape[1]):
+            spawns = (self.production[:, planet] >= PRODUCTION_PER_SHIP) & (self.planet_owner[:, planet] >= 0) & \
+                ~self.alive.all(axis=1)
+            if not spawns.any():
+                continue
+            games = np.nonzero(spawns)[0]
+            slots = (~self.alive[games]).argmax(axis=1)
+            toward_center = np.arctan2(self.height / 2 - self.planet_y[games, planet],
+                                       self.width / 2 - self.planet_x[games, planet])
+            distance = self.planet_radius[games, planet] + constants.SPAWN_RADIUS
+            self.alive[games, slots] = True
+            self.owner[games, slots] = self.planet_owner[games, planet]
+            self.x[games, slots] = self.planet_x[games, planet] + distance * np.cos(toward_center)
+            self.y[games, slots] = self.planet_y[games, planet] + distance * np.sin(toward_center)
+            self.health[games, slots] = constants.BASE_SHIP_HEALTH
+            self.status[games, slots] = UNDOCKED
+            self.planet[games, slots] = -1
+            self.production[games, planet] -= PRODUCTION_PER_SHIP
+
+
+def evaluate(weight_parameters, opponent, num_maps=100, seed=None, **options):
+    """
+    Play weights against an opponent on every map from both seats.
+
+    :param weight_parameters: The weights to evaluate, as Bot takes them or in WEIGHT_KEYS order
+    :param opponent: The opponent's weights
+    :param int num_maps: The number of maps
+    :param int seed: The seed for the maps
+    :param options: Further SelfPlay arguments, e.g. max_turns
+    :return: The mean reward of the weights (see SelfPlay.rewards), and the share of games they won, a draw counting
+        as half a win
+    :rtype: (float, float)
+    """
+    env = SelfPlay(num_maps, games_per_map=2, seed=seed, **options)
+    weights = [[weight_parameters, opponent]] * num_maps + [[opponent, weight_parameters]] * num_maps
+    rewards = env.run(weights)
+    seat = np.repeat([0, 1], num_maps)
+    games = np.arange(env.num_games)
+    winners = env.winners()
+    return float(rewards[games, seat].mean()), float(np.where(seat == 1, winners, 1 - winners).mean())
@@ -0,0 +1,58 @@
+from functions.gradient import compute_gradient
+from functions.weights import DEFAULT_WEIGHTS
+from reinforcement_bot.selfplay import WEIGHT_KEYS, SelfPlay, evaluate, gradient, weight_array
+
+import numpy as np
+import unittest
+
+
+class TestGradient(unittest.TestCase):
+    def test_matches_compute_gradient(self):
+        rng = np.random.RandomState(0)
+        ship_x, ship_y, object_x, object_y = rng.uniform(0, 240, (4, 1000))
+        width_weight = 10 ** rng.uniform(-6, -2, 1000)
+        slope_constant = rng.choice([-1, 1], 1000)
+        x_partial, y_partial = gradient(ship_x, ship_y, object_x, object_y, width_weight, slope_constant)
+        expected = np.array([compute_gradient(*values) for values in zip(ship_x, ship_y, object_x, object_y,
+                                                                          width_weight, slope_constant)])
+        np.testing.assert_allclose(x_partial, expected[:, 0], rtol=1e-9, atol=1e-300)
+        np.testing.assert_allclose(y_partial, expected[:, 1], rtol=1e-9, atol=1e-300)
+
+    def test_weight_array(self):
+        np.testing.assert_array_equal(weight_array(DEFAULT_WEIGHTS), [DEFAULT_WEIGHTS[key] for key in WEIGHT_KEYS])
+
+
+class TestSelfPlay(unittest.TestCase):
+    def setUp(self):
+        self.env = SelfPlay(3, width=120, height=80, max_turns=30, max_ships=16, planets_per_player=2, seed=1)
+
+    def test_run(self):
+        stronger = dict(DEFAULT_WEIGHTS, enemy_ship=1e5)
+        rewards = self.env.run([stronger, DEFAULT_WEIGHTS])
+        self.assertTrue(self.env.finished())
+        self.assertEqual(rewards.shape, (3, 2))
+        self.assertTrue(((rewards >= 0) & (rewards <= 1)).all())
+        np.testing.assert_allclose(rewards.sum(axis=1), 1)
+        self.assertTrue(np.isin(self.env.winners(), [0, 0.5, 1]).all())
+
+    def test_rerun_is_deterministic(self):
+        first = self.env.run([DEFAULT_WEIGHTS, DEFAULT_WEIGHTS])
+        np.testing.assert_array_equal(self.env.run([DEFAULT_WEIGHTS, DEFAULT_WEIGHTS]), first)
+
+    def test_weights_per_game(self):
+        self.assertRaises(ValueError, self.env.widths, [[DEFAULT_WEIGHTS, DEFAULT_WEIGHTS]] * 2)
+        self.assertEqual(self.env.widths([[DEFAULT_WEIGHTS, DEFAULT_WEIGHTS]] * 3).shape, (3, 2, len(WEIGHT_KEYS)))
+
+    def test_draws(self):
+        np.testing.assert_array_equal(self.env.winners(), [0.5] * 3)  # Equal ships and health at the start
+
+    def test_evaluate(self):
+        self.assertEqual(evaluate(DEFAULT_WEIGHTS, DEFAULT_WEIGHTS, num_maps=2, seed=1, max_turns=0), (0.5, 0.5))
+        reward, win_rate = evaluate(dict(DEFAULT_WEIGHTS, enemy_ship=1e5), DEFAULT_WEIGHTS, num_maps=2, seed=1,
+                                    width=120, height=80, max_turns=30, planets_per_player=2)
+        self.assertTrue(0 <= reward <= 1)
+        self.assertTrue(0 <= win_rate <= 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
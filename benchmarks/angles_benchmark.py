@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Time the trigonometry in the bots' inner loops: whole-degree cosines and sines as the fleet planner takes them, and
+the vector additions of the vector field bots.
+
+The first part compares the math module formulas the code used against hlt.angles and the vector field helpers built
+on it; the second part times FleetPlanner.plan, with a digest of the planned moves, so running it against an older
+checkout with --kit shows the speedup and that no move changed.
+"""
+import argparse
+import hashlib
+import math
+import os
+import sys
+import timeit
+
+from frames import DEFAULT_KIT, REPO_ROOT, synthetic_frame, use_kit
+
+
+def math_add_vectors(vector1, vector2):
+    vector1_radians = (vector1[1] / 180) * math.pi
+    vector2_radians = (vector2[1] / 180) * math.pi
+    add_x = vector1[0] * math.cos(vector1_radians) + vector2[0] * math.cos(vector2_radians)
+    add_y = vector1[0] * math.sin(vector1_radians) + vector2[0] * math.sin(vector2_radians)
+    return [math.sqrt(add_x * add_x + add_y * add_y), (math.atan2(add_y, add_x) * 180) / math.pi]
+
+
+def compare_primitives(hlt, repeat):
+    angles = hlt.angles
+    sys.path.insert(0, os.path.join(REPO_ROOT, "Non-ML", "vector_field_v1"))
+    from functions.vector import add_vectors
+    headings = [(speed, angle) for speed in range(1, 8) for angle in range(360)]
+    vectors = [([1 / (d * d), d * 7.3 % 360], [d * 0.1, d * 13.1 % 360]) for d in range(1, 1001)]
+
+    def best(function, items):
+        return min(timeit.repeat(function, number=10, repeat=repeat)) / 10 / len(items) * 1e9
+
+    def math_velocities():
+        return [(speed * math.cos(math.radians(angle)), speed * math.sin(math.radians(angle)))
+                for speed, angle in headings]
+
+    def table_velocities():
+        return [(speed * angles.COS[angle], speed * angles.SIN[angle]) for speed, angle in headings]
+
+    assert math_velocities() == table_velocities()
+    print("{:<36} math {:8.1f} ns   hlt.angles {:8.1f} ns".format(
+        "whole-degree velocity", best(math_velocities, headings), best(table_velocities, headings)))
+    print("{:<36} math {:8.1f} ns   hlt.angles {:8.1f} ns".format(
+        "functions.vector.add_vectors",
+        best(lambda: [math_add_vectors(*pair) for pair in vectors], vectors),
+        best(lambda: [add_vectors(*pair) for pair in vectors], vectors)))
+
+
+def benchmark_planner(hlt, repeat):
+    game_map = hlt.game_map.Map(0, 384, 256)
+    game_map._parse(synthetic_frame(num_players=4, ships_per_player=100))
+    ships = [ship for ship in game_map.get_me().all_ships()
+             if ship.docking_status == ship.DockingStatus.UNDOCKED]
+
+    def plans():
+        planner = hlt.fleet.FleetPlanner(game_map)
+        return [planner.plan(ship, hlt.constants.MAX_SPEED, ship.id * 37 % 360) for ship in ships]
+
+    digest = hashlib.sha1(repr(plans()).encode()).hexdigest()[:12]
+    elapsed = min(timeit.repeat(plans, number=1, repeat=repeat)) / len(ships)
+    print("{:<36} {:8.1f} us/ship   moves {}".format("FleetPlanner.plan", elapsed * 1e6, digest))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Halite II trigonometry benchmark")
+    parser.add_argument("--kit", help="bot directory whose hlt package is benchmarked", default=DEFAULT_KIT)
+    parser.add_argument("--repeat", type=int, help="timing repetitions", default=10)
+    args = parser.parse_args()
+
+    hlt = use_kit(args.kit)
+    if hasattr(hlt, "angles"):
+        compare_primitives(hlt, args.repeat)
+    benchmark_planner(hlt, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Compare Entity.closest_point_to, which the bots call for every ship and planet every turn, against looking the
+approach point up in Map.approaches(), and time building the approach geometry once per game.
+"""
+import argparse
+import timeit
+
+from frames import DEFAULT_KIT, synthetic_frame, use_kit
+
+
+def benchmark(hlt, name, frame, repeat):
+    game_map = hlt.game_map.Map(0, 384, 256)
+    game_map._parse(frame)
+    planets = game_map.all_planets()
+    pairs = [(ship, planet) for ship in game_map.get_me().all_ships() for planet in planets]
+    approaches = game_map.approaches()
+
+    def best(function, number=1):
+        return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+    build_time = best(lambda: hlt.approach.PlanetApproaches(planets, game_map.width, game_map.height))
+    computed = best(lambda: [ship.closest_point_to(planet) for ship, planet in pairs], 10) / len(pairs)
+    looked_up = best(lambda: [approaches.closest_approach(ship, planet) for ship, planet in pairs], 10) / len(pairs)
+    print("{:<24} build {:7.2f} ms   closest_point_to {:6.3f} us   closest_approach {:6.3f} us"
+          .format(name, build_time * 1e3, computed * 1e6, looked_up * 1e6))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Halite II planet approach benchmark")
+    parser.add_argument("--kit", help="bot directory whose hlt package is benchmarked", default=DEFAULT_KIT)
+    parser.add_argument("--repeat", type=int, help="timing repetitions", default=5)
+    args = parser.parse_args()
+
+    hlt = use_kit(args.kit)
+    for num_planets in (12, 28):
+        frame = synthetic_frame(num_players=4, ships_per_player=100, num_planets=num_planets)
+        benchmark(hlt, "{} planets".format(num_planets), frame, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Compare computing all ship-planet and ship-ship distances and angles of a frame pairwise with the Entity helpers
+against the matrices of Map.distances(), including the columnar view they are built on.
+"""
+import argparse
+import timeit
+
+from frames import DEFAULT_KIT, synthetic_frame, use_kit
+
+
+def benchmark(hlt, name, frame, repeat):
+    game_map = hlt.game_map.Map(0, 384, 256)
+    game_map._parse(frame)
+    ships = game_map._all_ships()
+    targets = game_map.all_planets() + ships
+
+    def pairwise():
+        return [(ship.calculate_distance_between(target), ship.calculate_angle_between(target))
+                for ship in ships for target in targets]
+
+    def matrices():
+        game_map._cache.clear()  # as after parsing the next frame
+        distances = game_map.distances()
+        return (distances.ship_planet, distances.ship_planet_angle, distances.ship_ship, distances.ship_ship_angle)
+
+    def best(function):
+        return min(timeit.repeat(function, number=1, repeat=repeat))
+
+    print("{:<24} pairwise {:9.2f} ms   matrices {:7.2f} ms".format(name, best(pairwise) * 1e3, best(matrices) * 1e3))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Halite II distance matrix benchmark")
+    parser.add_argument("--kit", help="bot directory whose hlt package is benchmarked", default=DEFAULT_KIT)
+    parser.add_argument("--repeat", type=int, help="timing repetitions", default=5)
+    args = parser.parse_args()
+
+    hlt = use_kit(args.kit)
+    for num_players, ships_per_player in ((2, 20), (4, 50), (4, 150)):
+        frame = synthetic_frame(num_players=num_players, ships_per_player=ships_per_player)
+        benchmark(hlt, "{} players x {} ships".format(num_players, ships_per_player), frame, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
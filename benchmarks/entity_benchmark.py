@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Measure the per-turn object footprint of a parsed late-game frame, and the time and allocations spent creating
+Position objects in the navigation hot path (Entity.closest_point_to).
+
+Run it against an older checkout with --kit to compare entity models.
+"""
+import argparse
+import gc
+import sys
+import timeit
+import tracemalloc
+
+from frames import DEFAULT_KIT, synthetic_frame, use_kit
+
+
+def instance_size(obj):
+    """
+    :return: the size of an object including its attribute dict, if it has one
+    :rtype: int
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def measure_turn(hlt, frame):
+    game_map = hlt.game_map.Map(0, 384, 256)
+    game_map._parse(frame)  # warm up caches and interned values
+
+    gc.collect()
+    tracemalloc.start()
+    game_map = hlt.game_map.Map(0, 384, 256)
+    before = tracemalloc.take_snapshot()
+    game_map._parse(frame)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    total = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    ships = game_map._all_ships()
+    planets = game_map.all_planets()
+    print("ships: {}  planets: {}".format(len(ships), len(planets)))
+    print("  retained per turn:   {:9.1f} KiB in {} blocks".format(total / 1024, blocks))
+    print("  Ship instance:       {:9d} bytes".format(instance_size(ships[0])))
+    print("  Planet instance:     {:9d} bytes".format(instance_size(planets[0])))
+    return game_map
+
+
+def measure_positions(hlt, game_map, repeat):
+    ships = game_map.get_me().all_ships()
+    planets = game_map.all_planets()
+    position = hlt.entity.Position(1.0, 2.0)
+    print("  Position instance:   {:9d} bytes".format(instance_size(position)))
+
+    def closest_points():
+        for ship in ships:
+            for planet in planets:
+                ship.closest_point_to(planet)
+
+    calls = len(ships) * len(planets)
+    best = min(timeit.repeat(closest_points, number=1, repeat=repeat))
+    print("  closest_point_to:    {:9.3f} us/call over {} calls".format(best / calls * 1e6, calls))
+
+    best = min(timeit.repeat(lambda: hlt.entity.Position(1.0, 2.0), number=100000, repeat=repeat))
+    print("  Position(x, y):      {:9.3f} us/call".format(best / 100000 * 1e6))
+
+    gc.collect()
+    tracemalloc.start()
+    points = [ship.closest_point_to(planet) for ship in ships for planet in planets]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("  {} live points:    {:9.1f} KiB".format(len(points), current / 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Halite II entity memory and allocation benchmark")
+    parser.add_argument("--kit", help="bot directory whose hlt package is benchmarked", default=DEFAULT_KIT)
+    parser.add_argument("--players", type=int, help="number of players", default=4)
+    parser.add_argument("--ships_per_player", type=int, help="ships per player", default=130)
+    parser.add_argument("--repeat", type=int, help="timing repetitions", default=5)
+    args = parser.parse_args()
+
+    hlt = use_kit(args.kit)
+    frame = synthetic_frame(num_players=args.players, ships_per_player=args.ships_per_player)
+    game_map = measure_turn(hlt, frame)
+    measure_positions(hlt, game_map, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Helpers shared by the benchmarks: turn recorded replays into the frame strings the Halite engine sends to bots,
+build synthetic late-game frames, and make one of the bot directories' hlt package importable.
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_KIT = os.path.join(REPO_ROOT, "Non-ML", "standard_bot_v1")
+DEFAULT_REPLAYS = os.path.join(DEFAULT_KIT, "replays")
+
+DOCKING_STATUS = {"undocked": 0, "docking": 1, "docked": 2, "undocking": 3}
+
+
+def use_kit(kit_directory=DEFAULT_KIT):
+    """
+    Make the hlt package of the given bot directory importable and return it.
+
+    :param str kit_directory: A bot directory containing an hlt package
+    :return: the imported hlt package
+    """
+    sys.path.insert(0, os.path.abspath(kit_directory))
+    import hlt
+    return hlt
+
+
+def load_replay(path):
+    """
+    Load a replay file. Replays downloaded from the website are zstd compressed, files produced by get_data.sh
+    are plain JSON.
+
+    :param str path: location of the replay
+    :return: the decoded replay
+    :rtype: dict
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] == b"\x28\xb5\x2f\xfd":
+        try:
+            import zstandard
+            data = zstandard.ZstdDecompressor().decompress(data, max_output_size=1 << 30)
+        except ImportError:
+            data = subprocess.check_output(["zstd", "-dc", path])
+    return json.loads(data.decode())
+
+
+def frame_string(replay, frame):
+    """
+    Serialize one replay frame in the engine's wire format.
+
+    :param dict replay: the decoded replay (used for the static planet data)
+    :param dict frame: one element of replay['frames']
+    :return: the line the engine would have sent to the bots for this frame
+    :rtype: str
+    """
+    tokens = [str(len(frame["ships"]))]
+    for player_id in sorted(frame["ships"], key=int):
+        ships = frame["ships"][player_id]
+        tokens += [player_id, str(len(ships))]
+        for ship_id in sorted(ships, key=int):
+            ship = ships[ship_id]
+            docking = ship["docking"]
+            tokens += [ship_id, repr(ship["x"]), repr(ship["y"]), str(ship["health"]),
+                       repr(ship["vel_x"]), repr(ship["vel_y"]),
+                       str(DOCKING_STATUS[docking["status"]]), str(docking.get("planet_id", 0)),
+                       str(docking.get("turns_left", 0)), str(ship["cooldown"])]
+
+    static_planets = {str(planet["id"]): planet for planet in replay["planets"]}
+    tokens.append(str(len(frame["planets"])))
+    for planet_id in sorted(frame["planets"], key=int):
+        planet = frame["planets"][planet_id]
+        static = static_planets[planet_id]
+        owned = planet["owner"] is not None
+        tokens += [planet_id, repr(static["x"]), repr(static["y"]), str(planet["health"]), repr(static["r"]),
+                   str(static["docking_spots"]), str(planet["current_production"]),
+                   str(planet["remaining_production"]), str(int(owned)), str(planet["owner"] if owned else 0),
+                   str(len(planet["docked_ships"]))]
+        tokens += [str(ship_id) for ship_id in planet["docked_ships"]]
+    return " ".join(tokens)
+
+
+def recorded_frames(replay_directory=DEFAULT_REPLAYS, limit=10):
+    """
+    :param str replay_directory: directory containing replay files
+    :param int limit: maximum number of replays to load
+    :return: (width, height, frame strings) for every loaded replay
+    :rtype: list[(int, int, list[str])]
+    """
+    games = []
+    replay_files = sorted(f for f in os.listdir(replay_directory) if f.startswith("replay-"))
+    for replay_file in replay_files[:limit]:
+        replay = load_replay(os.path.join(replay_directory, replay_file))
+        frames = [frame_string(replay, frame) for frame in replay["frames"]]
+        games.append((replay["width"], replay["height"], frames))
+    return games
+
+
+def synthetic_frame(num_players=4, ships_per_player=120, num_planets=28, width=384, height=256, seed=0):
+    """
+    Build a late-game frame with the given number of entities. Planets are owned round-robin and every planet has
+    its docking spots filled by its owner's first ships.
+
+    :return: the frame in the engine's wire format
+    :rtype: str
+    """
+    rng = random.Random(seed)
+    planets = []
+    for planet_id in range(num_planets):
+        owner = planet_id % (num_players + 1)
+        planets.append((planet_id, rng.uniform(20, width - 20), rng.uniform(20, height - 20),
+                        rng.uniform(3, 16), rng.randint(2, 6), owner if owner < num_players else None))
+
+    tokens = [str(num_players)]
+    ship_id = 0
+    docked = {planet_id: [] for planet_id, *_ in planets}
+    for player_id in range(num_players):
+        tokens += [str(player_id), str(ships_per_player)]
+        owned_planets = [planet for planet in planets if planet[5] == player_id]
+        for _ in range(ships_per_player):
+            status, planet_id = 0, 0
+            for planet in owned_planets:
+                if len(docked[planet[0]]) < planet[4]:
+                    status, planet_id = 2, planet[0]
+                    docked[planet_id].append(ship_id)
+                    break
+            tokens += [str(ship_id), repr(rng.uniform(0, width)), repr(rng.uniform(0, height)),
+                       str(rng.randint(1, 255)), "0.0", "0.0", str(status), str(planet_id), "0", "0"]
+            ship_id += 1
+
+    tokens.append(str(num_planets))
+    for planet_id, x, y, r, spots, owner in planets:
+        owned = owner is not None
+        tokens += [str(planet_id), repr(x), repr(y), "1500", repr(r), str(spots), "12", "1000",
+                   str(int(owned)), str(owner if owned else 0), str(len(docked[planet_id]))]
+        tokens += [str(docked_id) for docked_id in docked[planet_id]]
+    return " ".join(tokens)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Compare eager and lazy map parsing for a bot which only looks at its own ships and the planets, like the Settler
+bot: per frame it parses the map, walks its own ships and checks every planet and its docked ships.
+"""
+import argparse
+import timeit
+
+from frames import DEFAULT_KIT, DEFAULT_REPLAYS, recorded_frames, synthetic_frame, use_kit
+
+
+def settler_turn(game_map, frame):
+    game_map._parse(frame)
+    for ship in game_map.get_me().all_ships():
+        ship.docking_status
+    for planet in game_map.all_planets():
+        if planet.is_owned() and planet.owner == game_map.get_me():
+            planet.all_docked_ships()
+
+
+def benchmark(hlt, name, frames, repeat):
+    eager = hlt.game_map.Map(0, 384, 256)
+    lazy = hlt.game_map.Map(0, 384, 256, lazy=True)
+
+    def run(game_map):
+        for frame in frames:
+            settler_turn(game_map, frame)
+
+    eager_time = min(timeit.repeat(lambda: run(eager), number=1, repeat=repeat)) / len(frames)
+    lazy_time = min(timeit.repeat(lambda: run(lazy), number=1, repeat=repeat)) / len(frames)
+    print("{:<28} eager {:8.3f} ms/frame   lazy {:8.3f} ms/frame   saved {:5.1f}%"
+          .format(name, eager_time * 1e3, lazy_time * 1e3, 100 * (1 - lazy_time / eager_time)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Halite II lazy parsing benchmark")
+    parser.add_argument("--kit", help="bot directory whose hlt package is benchmarked", default=DEFAULT_KIT)
+    parser.add_argument("--replays", help="directory with recorded replays", default=DEFAULT_REPLAYS)
+    parser.add_argument("--games_limit", type=int, help="number of replays to load", default=5)
+    parser.add_argument("--repeat", type=int, help="timing repetitions", default=5)
+    args = parser.parse_args()
+
+    hlt = use_kit(args.kit)
+
+    games = recorded_frames(args.replays, args.games_limit)
+    benchmark(hlt, "recorded frames", [frame for _, _, frames in games for frame in frames], args.repeat)
+    for num_players, ships_per_player in ((2, 100), (4, 100), (4, 250)):
+        frame = synthetic_frame(num_players=num_players, ships_per_player=ships_per_player)
+        benchmark(hlt, "{} players x {} ships".format(num_players, ships_per_player), [frame], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
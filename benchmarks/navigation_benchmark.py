@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Time Ship.navigate, the obstacle avoidance every bot runs for each of its ships every turn: each undocked ship of
+player 0 navigates to the closest point of its nearest planet, as in the ML bots (max_corrections=180).
+
+The digest printed with every result covers all generated commands, so running the benchmark against an older
+checkout with --kit shows whether a change in the navigation code changes any move.
+"""
+import argparse
+import hashlib
+import timeit
+
+from frames import DEFAULT_KIT, DEFAULT_REPLAYS, recorded_frames, synthetic_frame, use_kit
+
+
+def navigate_all(hlt, game_map, max_corrections):
+    commands = []
+    planets = game_map.all_planets()
+    for ship in game_map.get_me().all_ships():
+        if ship.docking_status != ship.DockingStatus.UNDOCKED or not planets:
+            continue
+        planet = min(planets, key=ship.calculate_distance_between)
+        commands.append(ship.navigate(ship.closest_point_to(planet), game_map, speed=hlt.constants.MAX_SPEED,
+                                      max_corrections=max_corrections))
+    return commands
+
+
+def benchmark(hlt, name, games, max_corrections, repeat):
+    turns = [(hlt.game_map.Map(0, width, height), frame) for width, height, frames in games for frame in frames]
+
+    def parse():
+        for game_map, frame in turns:
+            game_map._parse(frame)
+
+    def run():
+        commands = []
+        for game_map, frame in turns:
+            game_map._parse(frame)  # per-frame caches and indexes are part of the turn's cost
+            commands += navigate_all(hlt, game_map, max_corrections)
+        return commands
+
+    digest = hashlib.sha1(repr(run()).encode()).hexdigest()[:12]
+    parse_time = min(timeit.repeat(parse, number=1, repeat=repeat)) / len(turns)
+    total_time = min(timeit.repeat(run, number=1, repeat=repeat)) / len(turns)
+    print("{:<28} navigate {:9.3f} ms/frame (parse {:6.3f} ms/frame excluded)   commands {}"
+          .format(name, (total_time - parse_time) * 1e3, parse_time * 1e3, digest))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Halite II navigation benchmark")
+    parser.add_argument("--kit", help="bot directory whose hlt package is benchmarked", default=DEFAULT_KIT)
+    parser.add_argument("--replays", help="directory with recorded replays", default=DEFAULT_REPLAYS)
+    parser.add_argument("--games_limit", type=int, help="number of replays to load", default=3)
+    parser.add_argument("--max_corrections", type=int, help="max_corrections passed to navigate", default=180)
+    parser.add_argument("--repeat", type=int, help="timing repetitions", default=3)
+    args = parser.parse_args()
+
+    hlt = use_kit(args.kit)
+
+    games = [(width, height, frames[::10]) for width, height, frames in recorded_frames(args.replays, args.games_limit)]
+    benchmark(hlt, "recorded frames", games, args.max_corrections, args.repeat)
+    for num_players, ships_per_player in ((2, 50), (4, 100)):
+        frame = synthetic_frame(num_players=num_players, ships_per_player=ships_per_player)
+        benchmark(hlt, "{} players x {} ships".format(num_players, ships_per_player), [(384, 256, [frame])],
+                  args.max_corrections, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Compare the index-based frame parser in hlt.game_map.Map._parse against the previous implementation, which peeled
+tokens off with `head, *remainder = tokens` and therefore copied the remaining token list once per entity.
+"""
+import argparse
+import timeit
+
+from frames import DEFAULT_KIT, DEFAULT_REPLAYS, recorded_frames, synthetic_frame, use_kit
+
+
+def legacy_parse(hlt, map_string):
+    """
+    The parser as it was before it walked the tokens with an index.
+
+    :return: (players, planets) dicts
+    """
+    entity = hlt.entity
+
+    def parse_ship(player_id, tokens):
+        (sid, x, y, hp, vel_x, vel_y,
+         docked, docked_planet, progress, cooldown, *remainder) = tokens
+        ship = entity.Ship(player_id, int(sid), float(x), float(y), int(hp), float(vel_x), float(vel_y),
+                           entity.Ship.DockingStatus(int(docked)), int(docked_planet), int(progress), int(cooldown))
+        return int(sid), ship, remainder
+
+    def parse_planet(tokens):
+        (plid, x, y, hp, r, docking, current, remaining,
+         owned, owner, num_docked_ships, *remainder) = tokens
+        docked_ships = []
+        for _ in range(int(num_docked_ships)):
+            ship_id, *remainder = remainder
+            docked_ships.append(int(ship_id))
+        planet = entity.Planet(int(plid), float(x), float(y), int(hp), float(r), int(docking), int(current),
+                               int(remaining), bool(int(owned)), int(owner), docked_ships)
+        return int(plid), planet, remainder
+
+    tokens = map_string.split()
+    num_players, *tokens = tokens
+    players = {}
+    for _ in range(int(num_players)):
+        player_id, num_ships, *tokens = tokens
+        ships = {}
+        for _ in range(int(num_ships)):
+            ship_id, ships[ship_id], tokens = parse_ship(int(player_id), tokens)
+        players[int(player_id)] = hlt.game_map.Player(int(player_id), ships)
+    num_planets, *tokens = tokens
+    planets = {}
+    for _ in range(int(num_planets)):
+        plid, planets[plid], tokens = parse_planet(tokens)
+    assert len(tokens) == 0
+    return players, planets
+
+
+def check_equivalent(hlt, map_string):
+    game_map = hlt.game_map.Map(0, 240, 160)
+    game_map._parse(map_string)
+    players, planets = legacy_parse(hlt, map_string)
+    assert sorted(players) == sorted(p.id for p in game_map.all_players())
+    for player in game_map.all_players():
+        expected = players[player.id]
+        for ship in player.all_ships():
+            old = expected.get_ship(ship.id)
+            assert (ship.x, ship.y, ship.health, ship.docking_status) == \
+                (old.x, old.y, old.health, old.docking_status)
+    for planet in game_map.all_planets():
+        old = planets[planet.id]
+        assert (planet.x, planet.y, planet.radius, planet.health, planet._docked_ship_ids) == \
+            (old.x, old.y, old.radius, old.health, old._docked_ship_ids)
+
+
+def benchmark(hlt, name, frames, repeat):
+    game_map = hlt.game_map.Map(0, 240, 160)
+
+    def run_new():
+        for frame in frames:
+            game_map._parse(frame)
+
+    def run_legacy():
+        for frame in frames:
+            legacy_parse(hlt, frame)
+
+    new = min(timeit.repeat(run_new, number=1, repeat=repeat)) / len(frames)
+    legacy = min(timeit.repeat(run_legacy, number=1, repeat=repeat)) / len(frames)
+    print("{:<28} legacy {:8.3f} ms/frame   indexed {:8.3f} ms/frame   speedup {:5.2f}x"
+          .format(name, legacy * 1e3, new * 1e3, legacy / new))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Halite II frame parser benchmark")
+    parser.add_argument("--kit", help="bot directory whose hlt package is benchmarked", default=DEFAULT_KIT)
+    parser.add_argument("--replays", help="directory with recorded replays", default=DEFAULT_REPLAYS)
+    parser.add_argument("--games_limit", type=int, help="number of replays to load", default=5)
+    parser.add_argument("--repeat", type=int, help="timing repetitions", default=5)
+    args = parser.parse_args()
+
+    hlt = use_kit(args.kit)
+
+    games = recorded_frames(args.replays, args.games_limit)
+    recorded = [frame for _, _, frames in games for frame in frames]
+    last_frames = [frames[-1] for _, _, frames in games]
+    for frame in recorded:
+        check_equivalent(hlt, frame)
+    benchmark(hlt, "recorded frames ({})".format(len(recorded)), recorded, args.repeat)
+    benchmark(hlt, "recorded final frames ({})".format(len(last_frames)), last_frames, args.repeat)
+
+    for ships_per_player in (25, 100, 250):
+        frame = synthetic_frame(ships_per_player=ships_per_player)
+        check_equivalent(hlt, frame)
+        benchmark(hlt, "4 players x {} ships".format(ships_per_player), [frame], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
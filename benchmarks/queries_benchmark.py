@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Compare the combat and docking queries of a whole turn (the nearest enemy, the enemies in weapon range of every ship
+and the ships in dock range of every planet) done by sorting nearby_entities_by_distance over all entities against
+the spatial index queries of Map.
+"""
+import argparse
+import timeit
+
+from frames import DEFAULT_KIT, synthetic_frame, use_kit
+
+
+def benchmark(hlt, name, frame, repeat):
+    constants = hlt.constants
+    game_map = hlt.game_map.Map(0, 384, 256)
+    game_map._parse(frame)
+    ships = game_map._all_ships()
+    planets = game_map.all_planets()
+
+    def scan():
+        result = []
+        for ship in ships:
+            nearby = game_map.nearby_entities_by_distance(ship)
+            by_distance = [entity for distance in sorted(nearby) for entity in nearby[distance]
+                           if isinstance(entity, hlt.entity.Ship) and entity.owner is not ship.owner]
+            in_range = [entity for entity in by_distance
+                        if ship.calculate_distance_between(entity) <= constants.WEAPON_RADIUS + 2 * ship.radius]
+            result.append((by_distance[:1], in_range))
+        for planet in planets:
+            result.append([ship for ship in ships if ship.can_dock(planet)])
+        return result
+
+    def queries():
+        game_map._cache.clear()  # as after parsing the next frame
+        result = []
+        for ship in ships:
+            nearest = game_map.nearest_ships(ship, enemy_of=ship.owner.id)
+            result.append((nearest, game_map.enemies_in_weapon_range(ship)))
+        for planet in planets:
+            result.append(game_map.ships_in_dock_range(planet))
+        return result
+
+    def best(function):
+        return min(timeit.repeat(function, number=1, repeat=repeat))
+
+    print("{:<24} scan {:9.2f} ms   queries {:7.2f} ms".format(name, best(scan) * 1e3, best(queries) * 1e3))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Halite II nearest and range query benchmark")
+    parser.add_argument("--kit", help="bot directory whose hlt package is benchmarked", default=DEFAULT_KIT)
+    parser.add_argument("--repeat", type=int, help="timing repetitions", default=5)
+    args = parser.parse_args()
+
+    hlt = use_kit(args.kit)
+    for num_players, ships_per_player in ((2, 20), (4, 50), (4, 150)):
+        frame = synthetic_frame(num_players=num_players, ships_per_player=ships_per_player)
+        benchmark(hlt, "{} players x {} ships".format(num_players, ships_per_player), frame, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
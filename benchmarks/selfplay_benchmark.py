@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Measure how many games per hour reinforcement_bot.selfplay plays for different batch sizes, with the weights of
+Non-ML/vector_field_v2/functions/weights.py on both sides.
+"""
+import argparse
+import os
+import timeit
+
+from frames import REPO_ROOT, use_kit
+
+VECTOR_FIELD_KIT = os.path.join(REPO_ROOT, "Non-ML", "vector_field_v2")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Halite II vectorized self-play benchmark")
+    parser.add_argument("--kit", help="bot directory with the reinforcement_bot package", default=VECTOR_FIELD_KIT)
+    parser.add_argument("--repeat", type=int, help="timing repetitions", default=1)
+    args = parser.parse_args()
+
+    use_kit(args.kit)
+    from functions.weights import DEFAULT_WEIGHTS
+    from reinforcement_bot.selfplay import SelfPlay
+
+    for num_games in (8, 32, 128):
+        env = SelfPlay(num_games, seed=1)
+        seconds = min(timeit.repeat(lambda: env.run([DEFAULT_WEIGHTS, DEFAULT_WEIGHTS]), number=1, repeat=args.repeat))
+        print("{:>3} games in lock-step {:7.2f} s   {:7.0f} games per hour".format(num_games, seconds,
+                                                                                  num_games / seconds * 3600))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Compare Map.snapshot() against copy.deepcopy(), which Game.__init__ used to take the initial map with, for eagerly
+parsed and incremental maps.
+"""
+import argparse
+import copy
+import timeit
+
+from frames import DEFAULT_KIT, synthetic_frame, use_kit
+
+
+def benchmark(hlt, name, frame, repeat):
+    eager = hlt.game_map.Map(0, 384, 256)
+    eager._parse(frame)
+    incremental = hlt.game_map.Map(0, 384, 256, incremental=True)
+    incremental._parse(frame)
+
+    def best(function):
+        return min(timeit.repeat(function, number=10, repeat=repeat)) / 10
+
+    deepcopy_time = best(lambda: copy.deepcopy(eager))
+    print("{:<24} deepcopy {:8.3f} ms   snapshot {:8.3f} ms   incremental snapshot {:8.3f} ms"
+          .format(name, deepcopy_time * 1e3, best(eager.snapshot) * 1e3, best(incremental.snapshot) * 1e3))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Halite II map snapshot benchmark")
+    parser.add_argument("--kit", help="bot directory whose hlt package is benchmarked", default=DEFAULT_KIT)
+    parser.add_argument("--repeat", type=int, help="timing repetitions", default=5)
+    args = parser.parse_args()
+
+    hlt = use_kit(args.kit)
+    for num_players, ships_per_player in ((2, 3), (4, 3), (4, 100), (4, 250)):
+        frame = synthetic_frame(num_players=num_players, ships_per_player=ships_per_player)
+        benchmark(hlt, "{} players x {} ships".format(num_players, ships_per_player), frame, args.repeat)
+
+
+if __name__ == "__main__":
+    main()